@@ -1,16 +1,16 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
-import json
-import threading
-import time
 from datetime import datetime
 import os
 
 from config import Config
 from utils.deriv_api import DerivAPI
+from utils.tick_archive import TickArchive
 from bots.bot_manager import BotManager
 from utils.logger import TradeLogger
+from utils.scanner_push import ScannerPush
+from utils.snapshot_store import SnapshotStore
 
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -18,13 +18,36 @@ CORS(app)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
 # Initialize components
-deriv_api = DerivAPI(app.config['DERIV_APP_ID'], app.config['DERIV_API_TOKEN'])
-bot_manager = BotManager(deriv_api, app.config)
-logger = TradeLogger()
+tick_archive = TickArchive(app.config['TICK_ARCHIVE_DIR']) if app.config['TICK_ARCHIVE_DIR'] else None
+deriv_api = DerivAPI(
+    app.config['DERIV_APP_ID'],
+    app.config['DERIV_API_TOKEN'],
+    parity_check=app.config['INDICATOR_PARITY_CHECK'],
+    endpoint=app.config['DERIV_WS_URL'],
+    archive=tick_archive,
+    markets=app.config['SCAN_MARKETS']
+)
+logger = TradeLogger(app.config['DATABASE_URL'])
+bot_manager = BotManager(deriv_api, Config, logger)
 
-# Connect to Deriv
+# Restore tick buffers and indicators from the archive, then connect
+# (the connection backfills the rest with ticks_history)
+deriv_api.warm_start()
 deriv_api.connect()
 
+# Scanner changes are pushed to dashboards as deltas
+scanner_push = ScannerPush(socketio, max_rate=app.config['SCANNER_PUSH_RATE'])
+bot_manager.add_scanner_listener(scanner_push.update_scores)
+
+def push_signal(event, signal):
+    """Signal listener - forward added/removed signals to the push pipeline"""
+    if event == 'added':
+        scanner_push.upsert_signal(signal.to_dict())
+    else:
+        scanner_push.remove_signal(signal.id)
+
+bot_manager.signals.add_listener(push_signal)
+
 # Start bot manager
 bot_manager.start()
 
@@ -37,16 +60,6 @@ MOCK_MARKETS = {
     'V10': {'price': 1234.56, 'change': 0.2, 'rsi_14': 45.8}
 }
 
-MOCK_SCANNER = {
-    1: {'V75': 72, 'V100': 45, 'V50': 68, 'V25': 55, 'V10': 82},
-    2: {'V75': 35, 'V100': 52, 'V50': 71, 'V25': 63, 'V10': 48},
-    3: {'V75': 85, 'V100': 62, 'V50': 58, 'V25': 41, 'V10': 73},
-    4: {'V75': 67, 'V100': 78, 'V50': 82, 'V25': 69, 'V10': 58},
-    5: {'V75': 42, 'V100': 55, 'V50': 63, 'V25': 77, 'V10': 91},
-    6: {'V75': 38, 'V100': 43, 'V50': 55, 'V25': 88, 'V10': 62},
-    7: {'V75': 71, 'V100': 59, 'V50': 64, 'V25': 52, 'V10': 79}
-}
-
 @app.route('/')
 def index():
     """Render main dashboard"""
@@ -62,31 +75,94 @@ def dashboard():
     """Render detailed dashboard"""
     return render_template('dashboard.html')
 
+def build_initial_data():
+    # The version lets the client subscribe to deltas from this point
+    version, scanner_data = scanner_push.matrix()
+    return {
+        'balance': deriv_api.get_balance(),
+        'markets': MOCK_MARKETS,
+        'scanner': scanner_data,
+        'scanner_version': version,
+        'signals': scanner_push.active_signals(),
+        'bots': [{'id': bot_id, 'name': bot.name} for bot_id, bot in sorted(bot_manager.bots.items())]
+    }
+
+# Responses are serialized once per change of their inputs
+snapshots = SnapshotStore()
+snapshots.register(
+    'initial-data',
+    lambda: (scanner_push.version, deriv_api.account.version, bot_manager.rules.version),
+    build_initial_data
+)
+snapshots.register(
+    'scanner',
+    lambda: scanner_push.version,
+    lambda: scanner_push.matrix()[1]
+)
+
+def snapshot_response(name):
+    """Cached bytes for a snapshot, or 304 if the client already has them"""
+    snapshot = snapshots.get(name)
+    if snapshot.etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(snapshot.body, mimetype='application/json')
+    response.set_etag(snapshot.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/api/initial-data')
 def get_initial_data():
     """Get initial data for dashboard"""
-    return jsonify({
-        'balance': 1234.56,  # Get from Deriv API
-        'markets': MOCK_MARKETS,
-        'scanner': MOCK_SCANNER,
-        'signals': get_active_signals()
-    })
+    return snapshot_response('initial-data')
 
 @app.route('/api/refresh')
 def refresh_data():
     """Refresh basic data"""
-    # Get updated balance from Deriv
-    balance = deriv_api.get_balance() if hasattr(deriv_api, 'get_balance') else 1234.56
+    # Cached account state kept current by the balance/contract streams
+    account = deriv_api.account.snapshot()
     
     return jsonify({
-        'balance': balance,
+        'balance': account['balance'],
+        'open_contracts': len(account['open_contracts']),
+        'settled_pnl': account['settled_pnl'],
         'timestamp': datetime.utcnow().isoformat()
     })
 
 @app.route('/api/scanner')
 def get_scanner_data():
     """Get latest scanner data"""
-    return jsonify(MOCK_SCANNER)
+    return snapshot_response('scanner')
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus text exposition: tick latency, tick rates and queue depths"""
+    orders = bot_manager.orders.metrics()
+    gauges = [
+        ('deriv_connected', 'gauge', 'WebSocket connection is up', int(deriv_api.connected)),
+        ('deriv_reconnects_total', 'counter', 'Reconnects since start', deriv_api.reconnects),
+        ('deriv_pending_requests', 'gauge', 'Requests awaiting a response', len(deriv_api.pending_requests)),
+        ('indicator_parity_failures_total', 'counter', 'Streaming/batch indicator mismatches',
+         deriv_api.indicator_engine.parity_failures),
+        ('scanner_pending_symbols', 'gauge', 'Symbols waiting to be scored', len(bot_manager.pending_scans)),
+        ('scanner_coalesced_ticks_total', 'counter', 'Ticks superseded before scoring',
+         bot_manager.coalesced_ticks),
+        ('scanner_push_clients', 'gauge', 'Dashboard clients receiving pushes', len(scanner_push.clients)),
+        ('order_queue_depth', 'gauge', 'Orders waiting for a worker', orders['queue_depth']),
+        ('orders_in_flight', 'gauge', 'Orders queued or executing', orders['in_flight']),
+        ('orders_submitted_total', 'counter', 'Orders accepted by the queue', orders['submitted']),
+        ('orders_rejected_total', 'counter', 'Orders refused by in-flight caps', orders['rejected']),
+        ('orders_failed_total', 'counter', 'Orders that raised', orders['failed']),
+        ('order_wait_p99_seconds', 'gauge', 'p99 wait from submit to start (recent orders)',
+         orders['wait_p99']),
+        ('trade_journal_queue_depth', 'gauge', 'Trade records waiting to be written', len(logger.queue))
+    ]
+    
+    lines = deriv_api.latency.prometheus()
+    for name, kind, help_text, value in gauges:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {value}']
+        
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
 
 @app.route('/api/execute-trade', methods=['POST'])
 def execute_trade():
@@ -101,17 +177,10 @@ def execute_trade():
     if not all([bot_id, market, stake]):
         return jsonify({'success': False, 'reason': 'Missing parameters'})
     
-    # Check trading hours
-    current_hour = datetime.utcnow().hour
-    if current_hour < 8 or current_hour >= 20:
+    # Check trading hours (Config.TRADING_START_HOUR/TRADING_END_HOUR)
+    if not bot_manager.is_trading_hours():
         return jsonify({'success': False, 'reason': 'Outside trading hours'})
     
-    # Check stake limits
-    balance = 1234.56  # Get from Deriv
-    max_stake = balance * 0.02
-    if stake > max_stake:
-        return jsonify({'success': False, 'reason': f'Stake exceeds 2% (${max_stake:.2f})'})
-    
     # Get bot from manager
     bot = bot_manager.bots.get(bot_id)
     if not bot:
@@ -119,24 +188,20 @@ def execute_trade():
     
     # Execute trade
     try:
-        # Get current market data
-        market_data = deriv_api.get_market_data(market) if hasattr(deriv_api, 'get_market_data') else {}
+        # Latest indicator snapshot, which the bot's conditions are checked on
+        market_data = deriv_api.get_indicators(market)
+        if market_data is None:
+            return jsonify({'success': False, 'reason': f'No market data for {market}'})
         
-        # Execute through bot
-        result = bot.execute(market, stake, market_data)
+        # Through the order queue (rate limits, in-flight caps), which also
+        # runs the risk checks and logs the trade
+        result = bot_manager.submit_trade(bot, market, stake, market_data).result(
+            timeout=app.config['ORDER_TIMEOUT'] * 2
+        )
         
         if result.get('success'):
-            # Log the trade
-            logger.log_trade({
-                'bot_id': bot_id,
-                'market': market,
-                'stake': stake,
-                'result': result,
-                'time': datetime.utcnow().isoformat()
-            })
-            
-            # Update balance
-            new_balance = balance - stake + result.get('payout', 0)
+            # Balance reported with the buy confirmation
+            new_balance = result.get('contract', {}).get('balance_after', deriv_api.get_balance())
             
             # Emit via WebSocket
             socketio.emit('trade_result', {
@@ -162,56 +227,54 @@ def execute_signal():
     data = request.json
     signal_id = data.get('signal_id')
     
-    # Find and execute the signal
-    # This would come from your signal database
-    
-    return jsonify({'success': True, 'new_balance': 1250.00})
+    # O(1) lookup; a signal can only be taken once
+    try:
+        result = bot_manager.execute_signal(signal_id).result(
+            timeout=app.config['ORDER_TIMEOUT'] * 2
+        )
+    except Exception as e:
+        return jsonify({'success': False, 'reason': str(e)})
+        
+    if not result.get('success'):
+        return jsonify({'success': False, 'reason': result.get('reason', 'Trade failed')})
+        
+    return jsonify({
+        'success': True,
+        'contract_id': result.get('contract_id'),
+        'new_balance': result.get('contract', {}).get('balance_after', deriv_api.get_balance())
+    })
+
+def push_account_update(event, payload):
+    """Account listener - push balance and contract changes to clients"""
+    if event == 'balance':
+        socketio.emit('balance_update', {'balance': payload})
+    else:
+        socketio.emit('contract_update', {
+            'contract_id': payload.get('contract_id'),
+            'status': payload.get('status', 'open' if event == 'contract' else 'sold'),
+            'profit': payload.get('profit'),
+            'is_sold': event == 'settled'
+        })
+
+deriv_api.account.add_listener(push_account_update)
 
 @socketio.on('connect')
 def handle_connect():
     """Handle WebSocket connection"""
     emit('connected', {'message': 'Connected to Deriv Pro Suite'})
 
-def get_active_signals():
-    """Get active trading signals"""
-    # This would come from your signal detection logic
-    return [
-        {
-            'id': '1',
-            'bot': 'Bot #3 - Berlin X9',
-            'market': 'V75',
-            'direction': 'RISE',
-            'score': 85,
-            'reason': 'RSI(4) below 33 with EMA confirmation'
-        },
-        {
-            'id': '2',
-            'bot': 'Bot #4 - BeastO7',
-            'market': 'V100',
-            'direction': 'FALL',
-            'score': 78,
-            'reason': 'Strong EMA separation with RSI above 62'
-        }
-    ]
+@socketio.on('scanner_subscribe')
+def handle_scanner_subscribe(data=None):
+    """Start delta pushes from the scanner version the client already has"""
+    data = data or {}
+    scanner_push.add_client(request.sid, data.get('version', 0), data.get('max_rate'))
 
-def background_scanner():
-    """Background thread for scanner updates"""
-    while True:
-        # Get latest scanner data
-        scanner_data = MOCK_SCANNER  # Replace with real data
-        
-        # Emit to all connected clients
-        socketio.emit('scanner_update', {'scanner': scanner_data})
-        
-        # Check for new signals
-        signals = get_active_signals()
-        if signals:
-            socketio.emit('signal_update', {'signals': signals})
-        
-        time.sleep(5)  # Update every 5 seconds
+@socketio.on('disconnect')
+def handle_disconnect():
+    scanner_push.remove_client(request.sid)
 
-# Start background thread
-threading.Thread(target=background_scanner, daemon=True).start()
+# Start pushing scanner and signal changes
+scanner_push.start()
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
@@ -1,84 +1,236 @@
+from concurrent.futures import Future
 from datetime import datetime
 import threading
 import time
-from .bot1_even_odd import Bot1EvenOdd
-from .bot3_berlin_x9 import Bot3BerlinX9
-from .bot4_beast_o7 import Bot4BeastO7
-from .bot5_gas_hunter import Bot5GasHunter
-from .bot6_hawk_under5 import Bot6HawkUnder5
-from .bot7_even_streak import Bot7EvenStreak
+from .rule_bot import RuleBot
+from strategies.rule_engine import RuleBook
 from strategies.score_calculator import ScoreCalculator
+from strategies.score_matrix import ScoreMatrix
+from strategies.signal_engine import SignalEngine
+from strategies.thresholds import load_thresholds
 from utils.logger import TradeLogger
+from utils.order_queue import OrderQueue
+from utils.risk_engine import RiskEngine
 
 class BotManager:
-    def __init__(self, deriv_api, config):
+    def __init__(self, deriv_api, config, trade_logger=None):
         self.api = deriv_api
         self.config = config
-        self.logger = TradeLogger()
-        self.score_calculator = ScoreCalculator()
+        self.logger = trade_logger or TradeLogger(self.config.DATABASE_URL)
+        self.risk = RiskEngine(self.config, daily_pnl=self.logger.today_pnl())
+        
+        # Orders run on a worker pool so the scanner never waits on Deriv
+        self.orders = OrderQueue(
+            workers=self.config.ORDER_WORKERS,
+            rate=self.config.ORDER_RATE_LIMIT,
+            burst=self.config.ORDER_BURST,
+            max_per_bot=self.config.MAX_IN_FLIGHT_PER_BOT,
+            max_per_symbol=self.config.MAX_IN_FLIGHT_PER_SYMBOL,
+            max_queued=self.config.ORDER_QUEUE_SIZE
+        )
+        self.thresholds = load_thresholds(self.config.THRESHOLDS_FILE)
+        
+        # Every bot is defined in the rules file, recompiled when it changes
+        self.rules = RuleBook(self.config.BOT_RULES_FILE, self.config.BOT_RULES_CHECK_INTERVAL)
+        self.score_calculator = ScoreCalculator(self.thresholds, rules=self.rules)
+        
+        # Indicators of every symbol in one matrix, each batch of ticks
+        # scored in one vectorized pass (None scores symbol by symbol)
+        if self.config.VECTOR_SCORING:
+            self.score_matrix = ScoreMatrix(self.thresholds, rules=self.rules)
+        else:
+            self.score_matrix = None
+        self.signals = SignalEngine(
+            ttl=self.config.SIGNAL_TTL,
+            cooldown=self.config.SIGNAL_COOLDOWN,
+            min_score=self.thresholds['min_score']
+        )
         
         # Initialize bots
-        self.bots = {
-            1: Bot1EvenOdd(self.api, self.config),
-            3: Bot3BerlinX9(self.api, self.config),
-            4: Bot4BeastO7(self.api, self.config),
-            5: Bot5GasHunter(self.api, self.config),
-            6: Bot6HawkUnder5(self.api, self.config),
-            7: Bot7EvenStreak(self.api, self.config)
-        }
+        self.bots = {}
+        self.build_bots()
         
         self.active_trades = []
         self.is_running = False
+        self.scanner_listeners = []
+        
+        # Event-driven scanning: latest snapshot per symbol waiting to be
+        # scored. A newer tick overwrites an unprocessed one (coalescing).
+        self.scan_mode = self.config.SCAN_MODE
+        self.pending_scans = {}
+        self.scan_condition = threading.Condition()
+        self.coalesced_ticks = 0
+        
+    def build_bots(self):
+        """One RuleBot per bot of the current rules"""
+        self.bots = {
+            bot_id: self.bots.get(bot_id) or RuleBot(self.api, self.config, self.rules,
+                                                     bot_id, self.thresholds)
+            for bot_id in self.rules.rules.bots
+        }
         
+    def reload_rules(self):
+        """Pick up an edited rules file (checked at most every few seconds)"""
+        if self.rules.refresh():
+            self.build_bots()
+            self.score_calculator.score_cache.clear()
+            
     def start(self):
         """Start the bot manager"""
         self.is_running = True
-        self.scanner_thread = threading.Thread(target=self.scanner_loop)
+        
+        # Account streams keep the risk engine current
+        if self.api.account.balance is not None:
+            self.risk.update_balance(self.api.account.balance)
+        self.api.account.add_listener(self.on_account_event)
+        
+        if self.scan_mode == 'event':
+            self.api.add_indicator_listener(self.on_indicators)
+            target = self.event_loop
+        else:
+            target = self.scanner_loop
+            
+        self.scanner_thread = threading.Thread(target=target)
         self.scanner_thread.daemon = True
         self.scanner_thread.start()
         
+    def stop(self):
+        """Stop the scanner thread"""
+        self.is_running = False
+        with self.scan_condition:
+            self.scan_condition.notify()
+            
+    def on_account_event(self, event, payload):
+        """Feed balance and settlement updates to the risk engine and journal"""
+        if event == 'balance':
+            self.risk.update_balance(payload)
+        elif event == 'settled':
+            if self.risk.settle(payload['contract_id'], float(payload['profit'])):
+                self.logger.settle_trade(payload['contract_id'], float(payload['profit']))
+                
+    def on_indicators(self, symbol, indicators):
+        """Indicator listener - queue a scan for this symbol (tick thread)"""
+        with self.scan_condition:
+            if symbol in self.pending_scans:
+                self.coalesced_ticks += 1
+            self.pending_scans[symbol] = indicators
+            self.scan_condition.notify()
+            
+    def event_loop(self):
+        """Tick-triggered scanner - scores only symbols that got a new tick"""
+        while self.is_running:
+            with self.scan_condition:
+                while self.is_running and not self.pending_scans:
+                    self.scan_condition.wait()
+                    
+                pending = self.pending_scans
+                self.pending_scans = {}
+                
+            try:
+                self.signals.expire_now()
+                self.reload_rules()
+                
+                # Always scored (scanner and signals stay live); the trading
+                # hours and risk limits only gate orders
+                self.scan_batch(pending)
+                
+            except Exception as e:
+                print(f"Scanner error: {e}")
+                
     def scanner_loop(self):
-        """Main scanner loop - checks for signals every second"""
+        """Polling scanner loop - checks for signals every second"""
         while self.is_running:
             try:
-                # Check if within trading hours
-                if not self.is_trading_hours():
-                    time.sleep(60)  # Check every minute
-                    continue
-                    
-                # Check daily limits
-                if self.daily_limits_reached():
-                    time.sleep(300)  # Check every 5 minutes
-                    continue
-                    
-                # Scan all markets
-                for symbol in ['V75', 'V100', 'V50', 'V25', 'V10']:
-                    if symbol in self.api.tick_data:
-                        scores = self.score_calculator.calculate_all_scores(
-                            symbol, 
-                            self.api.tick_data[symbol]
-                        )
-                        
-                        # Update scanner data
-                        self.update_scanner(symbol, scores)
-                        
-                        # Check if we should trade
-                        self.evaluate_trades(symbol, scores)
-                        
+                # Scan all markets (the API's symbol list, from active_symbols)
+                self.signals.expire_now()
+                self.reload_rules()
+                batch = {}
+                for symbol in self.api.symbols:
+                    indicators = self.api.get_indicators(symbol)
+                    if indicators is not None:
+                        batch[symbol] = indicators
+                self.scan_batch(batch)
+                
                 time.sleep(1)  # Check every second
                 
             except Exception as e:
                 print(f"Scanner error: {e}")
                 time.sleep(5)
                 
-    def evaluate_trades(self, symbol, scores):
+    def scan_batch(self, batch):
+        """Score {symbol: snapshot} and act on the results"""
+        # Small batches are cheaper symbol by symbol than one vector pass
+        if self.score_matrix is None or len(batch) < self.config.VECTOR_MIN_BATCH:
+            for symbol, indicators in batch.items():
+                self.scan_symbol(symbol, indicators)
+            return
+            
+        # Every symbol's bot scores in one vectorized pass
+        results, candidates = self.score_matrix.score(batch)
+        acting = set(candidates)
+        for symbol, scores in results.items():
+            received = batch[symbol].get('received_ns')
+            self.api.latency.record('scoring', received)
+            self.update_scanner(symbol, scores)
+            if symbol not in acting:
+                # No bot reached min_score: nothing to signal or trade
+                self.api.latency.record('decision', received)
+                
+        for symbol in candidates:
+            self.act_on_scores(symbol, results[symbol], batch[symbol])
+            
+    def scan_symbol(self, symbol, indicators):
+        """Score one symbol and act on the result"""
+        received = indicators.get('received_ns')
+        scores = self.score_calculator.calculate_all_scores(
+            symbol, 
+            self.api.tick_data[symbol],
+            indicators
+        )
+        self.api.latency.record('scoring', received)
+        
+        # Update scanner data
+        self.update_scanner(symbol, scores)
+        self.act_on_scores(symbol, scores, indicators)
+        
+    def act_on_scores(self, symbol, scores, indicators):
+        """Raise signals and trade on one symbol's scores"""
+        received = indicators.get('received_ns')
+        
+        # Raise signals for the dashboard
+        self.detect_signals(symbol, scores, indicators.get('epoch'))
+        
+        # Check if we should trade
+        self.evaluate_trades(symbol, scores, received)
+        self.api.latency.record('decision', received)
+        
+    def detect_signals(self, symbol, scores, epoch):
+        """Turn qualifying bot scores into signals (deduped by the engine)"""
+        for bot_id, score in scores.items():
+            if not isinstance(bot_id, int) or score < self.signals.min_score:
+                continue
+            bot = self.bots.get(bot_id)
+            if bot is None:
+                continue
+            condition_met, direction = bot.check_conditions(symbol, scores)
+            if condition_met:
+                self.signals.process(bot, symbol, score, direction, scores, epoch)
+                
+
+    def evaluate_trades(self, symbol, scores, received=None):
         """Evaluate if we should trade based on scores"""
-        # Find best bot
-        best_bot = max(scores.items(), key=lambda x: x[1])
-        bot_id, bot_score = best_bot
+        if self.trading_blocked():
+            return
+            
+        # Find best bot (integer keys are bot scores, the rest are indicators)
+        bot_scores = [(k, v) for k, v in scores.items() if isinstance(k, int)]
+        if not bot_scores:
+            return
+            
+        bot_id, bot_score = max(bot_scores, key=lambda x: x[1])
         
         # Check minimum score
-        if bot_score < 65:
+        if bot_score < self.thresholds['min_score']:
             return
             
         # Check dead zone
@@ -92,12 +244,17 @@ class BotManager:
             return
             
         # Check bot-specific conditions
-        if bot.check_conditions(symbol, scores):
+        condition_met, _ = bot.check_conditions(symbol, scores)
+        if condition_met:
             # Calculate stake
             stake = self.calculate_stake(bot_score)
             
-            # Execute trade
-            self.execute_trade(bot, symbol, stake, scores)
+            # Lock-free pre-trade risk check
+            if self.risk.check_trade(bot_id, symbol, stake):
+                return
+                
+            # Queue the order; the scanner moves on immediately
+            self.submit_trade(bot, symbol, stake, scores, received)
             
     def calculate_stake(self, score):
         """Calculate stake based on entry score"""
@@ -112,29 +269,109 @@ class BotManager:
         else:
             return 0
             
-    def execute_trade(self, bot, symbol, stake, scores):
-        """Execute a trade"""
+    def trading_blocked(self):
+        """Why no order can be placed right now, or None"""
+        if not self.is_trading_hours():
+            return 'Outside trading hours'
+        if self.daily_limits_reached():
+            return self.risk.halted
+        return None
+        
+    def submit_trade(self, bot, symbol, stake, scores, received=None):
+        """Queue execute_trade on the order workers; returns a Future of its result"""
+        reason = self.trading_blocked()
+        if reason:
+            future = Future()
+            future.set_result({'success': False, 'reason': reason})
+            return future
+            
+        return self.orders.submit(self.execute_trade, bot.bot_id, symbol,
+                                  bot, symbol, stake, scores, received)
+        
+    def execute_signal(self, signal_id):
+        """Trade an active signal once; returns a Future of the bot's result
+        
+        The signal is claimed while its order runs and only taken when the
+        order succeeds; a rejected or failed order leaves it active.
+        """
+        signal = self.signals.claim(signal_id)
+        if signal is None:
+            reason = 'Signal expired or not found'
+            if self.signals.get(signal_id) is not None:
+                reason = 'Signal is already being executed'
+            future = Future()
+            future.set_result({'success': False, 'reason': reason})
+            return future
+            
+        bot = self.bots.get(signal.bot_id)
+        if bot is None:
+            reason = 'Bot no longer defined'
+        elif self.risk.balance is None:
+            reason = 'Balance unknown, cannot size the stake'
+        else:
+            reason = None
+        if reason:
+            self.signals.release(signal.id)
+            future = Future()
+            future.set_result({'success': False, 'reason': reason})
+            return future
+            
+        stake = self.calculate_stake(signal.score)
+        future = self.submit_trade(bot, signal.symbol, stake, signal.scores)
+        future.add_done_callback(lambda f: self.settle_signal(signal, f))
+        return future
+        
+    def settle_signal(self, signal, future):
+        """Take the signal if its order went through, otherwise release it"""
+        try:
+            success = future.result().get('success')
+        except Exception:
+            success = False
+        if success:
+            self.signals.take(signal.id)
+        else:
+            self.signals.release(signal.id)
+            
+    def execute_trade(self, bot, symbol, stake, scores, received=None):
+        """Execute a trade and return the bot's result
+        
+        `received` is the arrival stamp of the tick that triggered it, if any.
+        """
         if stake <= 0:
-            return
+            if self.risk.balance is None:
+                return {'success': False, 'reason': 'Balance unknown, cannot size the stake'}
+            return {'success': False, 'reason': 'Score too low to stake'}
+            
+        # Book the exposure before the order goes out
+        ticket, reason = self.risk.reserve(bot.bot_id, symbol, stake)
+        if reason:
+            return {'success': False, 'reason': reason}
             
         trade = {
             'bot_id': bot.bot_id,
             'symbol': symbol,
             'stake': stake,
             'scores': scores,
-            'time': datetime.now(),
+            'time': datetime.utcnow(),
             'status': 'pending'
         }
         
         # Execute through bot
+        self.api.latency.record('order_send', received)
         result = bot.execute(symbol, stake, scores)
         
+        if result.get('success'):
+            self.risk.confirm(ticket, result['contract_id'])
+        else:
+            self.risk.release(ticket)
+            
         trade['result'] = result
         trade['status'] = 'completed'
         
-        # Log the trade
+        # Queue the trade for the journal's writer thread
         self.logger.log_trade(trade)
         self.active_trades.append(trade)
+        return result
         
     def is_trading_hours(self):
         """Check if current time is within trading hours"""
@@ -144,33 +381,20 @@ class BotManager:
         
     def daily_limits_reached(self):
         """Check if daily limits are reached"""
-        today_trades = self.logger.get_today_trades()
+        return self.risk.limits_reached()
         
-        total_pnl = sum(t.get('pnl', 0) for t in today_trades)
-        balance = self.get_current_balance()
-        
-        # Check stop loss
-        if total_pnl <= -balance * self.config.DAILY_STOP_LOSS:
-            return True
-            
-        # Check profit target
-        if total_pnl >= balance * self.config.DAILY_PROFIT_TARGET:
-            return True
-            
-        return False
+    def add_scanner_listener(self, listener):
+        """Register listener(symbol, scores), called after each scan"""
+        self.scanner_listeners.append(listener)
         
     def update_scanner(self, symbol, scores):
         """Update scanner data for frontend"""
-        # This would be sent via WebSocket to connected clients
-        scanner_data = {
-            'symbol': symbol,
-            'scores': scores,
-            'timestamp': datetime.now().isoformat()
-        }
-        # Emit via WebSocket
-        pass
+        for listener in self.scanner_listeners:
+            try:
+                listener(symbol, scores)
+            except Exception as e:
+                print(f"Scanner listener error: {e}")
         
     def get_current_balance(self):
-        """Get current account balance"""
-        # This would fetch from Deriv API
-        return 1000  # Placeholder
+        """Get current account balance (as last reported by Deriv)"""
+        return self.risk.balance or 0
@@ -0,0 +1,80 @@
+from strategies.thresholds import OVER_BARRIER, UNDER_BARRIER
+
+# Digit the DIGITOVER/DIGITUNDER contracts are priced against, as backtested
+BARRIERS = {
+    'DIGITOVER': OVER_BARRIER,
+    'DIGITUNDER': UNDER_BARRIER
+}
+
+class RuleBot:
+    """A bot defined in the rules file
+    
+    Entry conditions, contract and duration come from the bot's compiled
+    rules in the RuleBook, read on every call, so a reloaded rules file
+    takes effect without rebuilding the bot.
+    """
+    def __init__(self, api, config, book, bot_id, thresholds=None):
+        self.bot_id = bot_id
+        self.api = api
+        self.config = config
+        self.book = book
+        self.thresholds = thresholds or {}
+        self.params = None
+        self.params_version = None
+        
+    @property
+    def rule(self):
+        return self.book.rules.bots.get(self.bot_id)
+        
+    @property
+    def name(self):
+        rule = self.rule
+        return rule.name if rule is not None else f"Bot {self.bot_id}"
+        
+    def bound_params(self):
+        """Rule params with the thresholds applied, rebound after a reload"""
+        if self.params_version != self.book.version:
+            self.params = self.book.rules.bind(self.thresholds)
+            self.params_version = self.book.version
+        return self.params
+        
+    def check_conditions(self, symbol, scores):
+        """Check if bot conditions are met"""
+        rules = self.book.rules
+        direction = rules.entry(self.bot_id, rules.view(scores), self.bound_params())
+        if direction is None:
+            return False, None
+        return True, direction
+        
+    def execute(self, symbol, stake, scores):
+        """Execute the trade"""
+        rule = self.rule
+        condition_met, direction = self.check_conditions(symbol, scores)
+        
+        if rule is None or not condition_met:
+            return {'success': False, 'reason': 'Conditions not met'}
+        
+        # Place trade through API and wait for the buy confirmation
+        try:
+            response = self.api.buy_contract(
+                symbol=symbol,
+                amount=stake,
+                contract_type=direction,
+                duration=rule.duration,
+                duration_unit=rule.duration_unit,
+                barrier=BARRIERS.get(direction)
+            ).result(timeout=self.config.ORDER_TIMEOUT)
+        except Exception as e:
+            return {'success': False, 'reason': f'Buy failed: {e}'}
+        
+        contract = response['buy']
+        
+        return {
+            'success': True,
+            'contract': contract,
+            'contract_id': contract['contract_id'],
+            'buy_price': contract['buy_price'],
+            'payout': contract['payout'],
+            'direction': direction,
+            'stake': stake
+        }
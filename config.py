@@ -7,16 +7,68 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
     DERIV_APP_ID = os.getenv('DERIV_APP_ID', '1089')  # Your Deriv app ID
     DERIV_API_TOKEN = os.getenv('DERIV_API_TOKEN', '')
+    # Point at a local simulator (python -m utils.deriv_simulator) for offline runs
+    DERIV_WS_URL = os.getenv('DERIV_WS_URL', 'wss://ws.derivws.com/websockets/v3')
     
     # Trading Parameters
     MAX_STAKE_PERCENT = 0.02  # 2% max per trade
     DAILY_STOP_LOSS = 0.10  # 10% daily stop loss
     DAILY_PROFIT_TARGET = 0.08  # 8% daily target
+    MAX_SYMBOL_EXPOSURE = 0.05  # Open stakes per symbol, share of balance
+    MAX_BOT_EXPOSURE = 0.05  # Open stakes per bot, share of balance
+    ORDER_TIMEOUT = 10  # Seconds to wait for a proposal/buy round trip
+    
+    # Order execution queue: worker threads, Deriv requests per second
+    # (each order is a proposal + buy) and in-flight caps
+    ORDER_WORKERS = int(os.getenv('ORDER_WORKERS', '4'))
+    ORDER_RATE_LIMIT = float(os.getenv('ORDER_RATE_LIMIT', '5'))
+    ORDER_BURST = int(os.getenv('ORDER_BURST', '10'))
+    ORDER_QUEUE_SIZE = 100
+    MAX_IN_FLIGHT_PER_BOT = 2
+    MAX_IN_FLIGHT_PER_SYMBOL = 1
+    
+    # Score thresholds written by python -m strategies.optimizer (defaults if missing)
+    THRESHOLDS_FILE = os.getenv('THRESHOLDS_FILE', 'thresholds.json')
+    
+    # Bot definitions (JSON, or YAML with PyYAML), reloaded when the file changes;
+    # unset uses the bundled strategies/bot_rules.json
+    BOT_RULES_FILE = os.getenv('BOT_RULES_FILE')
+    BOT_RULES_CHECK_INTERVAL = float(os.getenv('BOT_RULES_CHECK_INTERVAL', '1'))
+    
+    # Check streaming indicators against the batch implementation on every tick
+    INDICATOR_PARITY_CHECK = os.getenv('INDICATOR_PARITY_CHECK', '0') == '1'
     
     # Trading Hours UTC
     TRADING_START_HOUR = 8
     TRADING_END_HOUR = 20
     
+    # Scanner mode: 'event' scores a symbol on each new tick, 'poll' rescans
+    # every symbol once a second
+    SCAN_MODE = os.getenv('SCAN_MODE', 'event')
+    
+    # Markets scanned, as listed by active_symbols on every connect
+    # (synthetic_index covers volatility, 1s, crash/boom, jump and step
+    # indices); empty scans the fixed default symbol list
+    SCAN_MARKETS = [m for m in os.getenv('SCAN_MARKETS', 'synthetic_index').split(',') if m]
+    
+    # Score each batch of ticks for all symbols in one vectorized pass. A
+    # pass has a fixed cost of a few hundred microseconds, so batches of
+    # fewer than VECTOR_MIN_BATCH symbols (every event-mode tick, usually)
+    # are scored one snapshot at a time (see the matrix stages of utils.benchmark)
+    VECTOR_SCORING = os.getenv('VECTOR_SCORING', '1') == '1'
+    VECTOR_MIN_BATCH = int(os.getenv('VECTOR_MIN_BATCH', '48'))
+    
+    # Signals expire after SIGNAL_TTL seconds; a bot raises at most one
+    # signal per symbol every SIGNAL_COOLDOWN seconds
+    SIGNAL_TTL = int(os.getenv('SIGNAL_TTL', '30'))
+    SIGNAL_COOLDOWN = int(os.getenv('SIGNAL_COOLDOWN', '60'))
+    
+    # Max scanner/signal pushes per second to each dashboard client
+    SCANNER_PUSH_RATE = float(os.getenv('SCANNER_PUSH_RATE', '2'))
+    
+    # On-disk tick archive, one file per symbol per day (empty disables it)
+    TICK_ARCHIVE_DIR = os.getenv('TICK_ARCHIVE_DIR', 'data/ticks')
+    
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///trading.db')
     
@@ -4,69 +4,98 @@ let appState = {
     balance: 0,
     markets: {},
     scanner: {},
+    scannerVersion: 0,
+    signals: {},
+    bots: [],
     trades: []
 };
 
-// WebSocket connection for real-time updates
+// Highest scanner push rate this page wants (updates per second)
+const SCANNER_MAX_RATE = 2;
+
+// Socket.IO connection for real-time updates
 let socket = null;
 
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', () => {
-    initializeWebSocket();
-    fetchInitialData();
+    // Subscribe after the snapshot so pushes start from its version
+    fetchInitialData().finally(initializeSocket);
     updateDateTime();
     setInterval(updateDateTime, 1000);
-    setInterval(refreshData, 5000);
 });
 
-function initializeWebSocket() {
-    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-    const wsUrl = `${protocol}//${window.location.host}/ws`;
-    
-    socket = new WebSocket(wsUrl);
+function initializeSocket() {
+    // Socket.IO reconnects on its own; 'connect' fires again each time
+    socket = io();
     
-    socket.onopen = () => {
-        console.log('WebSocket connected');
+    socket.on('connect', () => {
+        console.log('Socket connected');
         appState.connected = true;
         updateConnectionStatus();
-    };
-    
-    socket.onmessage = (event) => {
-        const data = JSON.parse(event.data);
-        handleWebSocketMessage(data);
-    };
+        socket.emit('scanner_subscribe', {
+            version: appState.scannerVersion,
+            max_rate: SCANNER_MAX_RATE
+        });
+    });
     
-    socket.onclose = () => {
-        console.log('WebSocket disconnected');
+    socket.on('disconnect', () => {
+        console.log('Socket disconnected');
         appState.connected = false;
         updateConnectionStatus();
-        // Attempt to reconnect after 5 seconds
-        setTimeout(initializeWebSocket, 5000);
-    };
+    });
+    
+    // Pre-serialized on the server, shared by every client on the same version
+    socket.on('scanner_delta', (payload) => {
+        applyScannerDelta(JSON.parse(payload));
+    });
+    
+    socket.on('balance_update', (data) => {
+        appState.balance = data.balance;
+        updateBalance();
+    });
+    
+    socket.on('trade_result', handleTradeResult);
 }
 
-function handleWebSocketMessage(data) {
-    switch(data.type) {
-        case 'scanner_update':
-            updateScannerTable(data.scanner);
-            break;
-        case 'market_update':
-            updateMarketCards(data.markets);
-            break;
-        case 'signal_update':
-            updateSignals(data.signals);
-            break;
-        case 'trade_result':
-            handleTradeResult(data.trade);
-            break;
+function applyScannerDelta(delta) {
+    // Ignore pushes older than what we already have
+    if (delta.version <= appState.scannerVersion) return;
+    
+    if (delta.full) {
+        appState.scanner = {};
+        appState.signals = {};
+    }
+    
+    for (const [botId, cells] of Object.entries(delta.scanner)) {
+        appState.scanner[botId] = Object.assign(appState.scanner[botId] || {}, cells);
+    }
+    for (const signal of delta.signals) {
+        appState.signals[signal.id] = signal;
+    }
+    for (const signalId of delta.removed) {
+        delete appState.signals[signalId];
+    }
+    appState.scannerVersion = delta.version;
+    
+    updateScannerTable(appState.scanner);
+    if (delta.full || delta.signals.length || delta.removed.length) {
+        updateSignals(Object.values(appState.signals));
     }
 }
 
 function fetchInitialData() {
-    fetch('/api/initial-data')
+    return fetch('/api/initial-data')
         .then(response => response.json())
         .then(data => {
-            appState.balance = data.balance;
+            appState.balance = data.balance || 0;
+            appState.scanner = data.scanner;
+            appState.scannerVersion = data.scanner_version;
+            appState.bots = data.bots || [];
+            updateBotOptions(appState.bots);
+            appState.signals = {};
+            for (const signal of data.signals) {
+                appState.signals[signal.id] = signal;
+            }
             updateBalance();
             updateMarketCards(data.markets);
             updateScannerTable(data.scanner);
@@ -75,20 +104,6 @@ function fetchInitialData() {
         .catch(error => console.error('Error fetching initial data:', error));
 }
 
-function refreshData() {
-    if (!appState.connected) return;
-    
-    fetch('/api/refresh')
-        .then(response => response.json())
-        .then(data => {
-            if (data.balance) {
-                appState.balance = data.balance;
-                updateBalance();
-            }
-        })
-        .catch(error => console.error('Error refreshing data:', error));
-}
-
 function refreshScanner() {
     const refreshBtn = document.querySelector('.btn-refresh');
     refreshBtn.classList.add('loading');
@@ -158,31 +173,35 @@ function updateMarketCards(markets) {
     grid.innerHTML = html;
 }
 
+function scannerSymbols(scannerData) {
+    // Every symbol any bot has a score for (the scanner covers all active symbols)
+    const symbols = new Set();
+    for (const cells of Object.values(scannerData)) {
+        Object.keys(cells).forEach(symbol => symbols.add(symbol));
+    }
+    return Array.from(symbols).sort();
+}
+
 function updateScannerTable(scannerData) {
     const tableBody = document.querySelector('#scanner-table tbody');
+    const headerRow = document.querySelector('#scanner-table thead tr');
     if (!tableBody) return;
     
-    let html = '';
-    const bots = [
-        { id: 1, name: 'Bot #1 - Even/Odd' },
-        { id: 2, name: 'Bot #2 - Over/Under' },
-        { id: 3, name: 'Bot #3 - Berlin X9' },
-        { id: 4, name: 'Bot #4 - BeastO7' },
-        { id: 5, name: 'Bot #5 - Gas Hunter' },
-        { id: 6, name: 'Bot #6 - Hawk Under5' },
-        { id: 7, name: 'Bot #7 - Even Streak' }
-    ];
+    const symbols = scannerSymbols(scannerData);
+    if (headerRow) {
+        headerRow.innerHTML = '<th>Bot</th>' +
+            symbols.map(symbol => `<th>${symbol}</th>`).join('') +
+            '<th>Action</th>';
+    }
+    updateMarketOptions(symbols);
     
-    for (const bot of bots) {
+    let html = '';
+    for (const bot of scannerBots(scannerData)) {
         const scores = scannerData[bot.id] || {};
         
         html += `<tr>
             <td><strong>${bot.name}</strong></td>
-            <td>${getScoreBadge(scores.V75)}</td>
-            <td>${getScoreBadge(scores.V100)}</td>
-            <td>${getScoreBadge(scores.V50)}</td>
-            <td>${getScoreBadge(scores.V25)}</td>
-            <td>${getScoreBadge(scores.V10)}</td>
+            ${symbols.map(symbol => `<td>${getScoreBadge(scores[symbol])}</td>`).join('')}
             <td>
                 <button class="btn-trade-now" 
                         onclick="quickTrade(${bot.id})"
@@ -196,6 +215,37 @@ function updateScannerTable(scannerData) {
     tableBody.innerHTML = html;
 }
 
+function scannerBots(scannerData) {
+    // Bots from the server's rules file, plus any bot scored since
+    const bots = appState.bots.map(bot => ({ id: bot.id, name: `Bot #${bot.id} - ${bot.name}` }));
+    const known = new Set(bots.map(bot => String(bot.id)));
+    for (const id of Object.keys(scannerData)) {
+        if (!known.has(id)) bots.push({ id: parseInt(id), name: `Bot #${id}` });
+    }
+    return bots;
+}
+
+function updateBotOptions(bots) {
+    // Offer every bot of the rules file in the manual trade form
+    const select = document.getElementById('trade-bot');
+    if (!select || !bots.length) return;
+    
+    select.innerHTML = bots.map(bot => `<option value="${bot.id}">Bot #${bot.id} - ${bot.name}</option>`).join('');
+}
+
+function updateMarketOptions(symbols) {
+    // Offer every scanned symbol in the manual trade form
+    const select = document.getElementById('trade-market');
+    if (!select || !symbols.length) return;
+    
+    const current = Array.from(select.options).map(option => option.value);
+    if (current.join() === symbols.join()) return;
+    
+    const selected = select.value;
+    select.innerHTML = symbols.map(symbol => `<option value="${symbol}">${symbol}</option>`).join('');
+    if (symbols.includes(selected)) select.value = selected;
+}
+
 function getScoreBadge(score) {
     if (!score) return '<span class="score-badge score-poor">-</span>';
     
@@ -332,7 +382,7 @@ function handleTradeResult(trade) {
     if (trade.result === 'win') {
         showTradeInfo(`Trade won! Profit: $${trade.profit.toFixed(2)}`, 'success');
     } else {
-        showTradeInfo(`Trade lost. Loss: $${trade.loss.toFixed(2)}`, 'error');
+        showTradeInfo(`Trade lost. Loss: $${Math.abs(trade.profit).toFixed(2)}`, 'error');
     }
     
     appState.balance = trade.new_balance;
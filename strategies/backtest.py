@@ -0,0 +1,376 @@
+"""Vectorized backtester over recorded ticks
+
+Computes every indicator over the whole tick series at once, scores all
+bots per tick with the same compiled rules as ScoreCalculator/BotManager,
+and settles rise/fall and digit contracts over N-tick durations.
+
+    python -m strategies.backtest ticks.csv --symbol V75 --duration 5
+"""
+import argparse
+import csv
+import os
+import time
+import numpy as np
+import pandas as pd
+from utils.digit_stats import last_digits, infer_pip_size
+from utils.tick_archive import TickArchive
+from strategies.thresholds import DEFAULT_THRESHOLDS, OVER_BARRIER, UNDER_BARRIER, load_thresholds
+from strategies.rule_engine import default_rules, load_rules
+from utils.candle_aggregator import TIMEFRAMES, TREND_WARMUP
+
+# Contract codes used in the per-tick signal arrays
+NO_TRADE, RISE, FALL, DIGITOVER, DIGITUNDER, DIGITEVEN, DIGITODD = 0, 1, 2, 3, 4, 5, 6
+CONTRACT_NAMES = {RISE: 'RISE', FALL: 'FALL', DIGITOVER: 'DIGITOVER', DIGITUNDER: 'DIGITUNDER',
+                  DIGITEVEN: 'DIGITEVEN', DIGITODD: 'DIGITODD'}
+CONTRACT_CODES = {name: code for code, name in CONTRACT_NAMES.items()}
+
+# Profit per unit stake on a winning contract
+DEFAULT_PAYOUTS = {RISE: 0.95, FALL: 0.95, DIGITOVER: 0.95, DIGITUNDER: 0.95,
+                   DIGITEVEN: 0.95, DIGITODD: 0.95}
+
+# Ticks per block when evaluating scores, sized to stay in CPU cache
+CHUNK_SIZE = 65536
+
+
+def load_ticks(path, symbol=None):
+    """Load (epochs, prices) from a tick archive, a .npy array or a CSV
+
+    A directory is read as a TickArchive (memory-mapped, `symbol` required).
+    CSV rows are `symbol,epoch,quote` (as replayed by the simulator) or
+    `epoch,quote`; `symbol` filters the three-column form.
+    """
+    if os.path.isdir(path):
+        return TickArchive(path, writable=False).load(symbol)
+
+    if path.endswith('.npy'):
+        data = np.load(path)
+        return data[:, 0].astype(np.int64), data[:, 1].astype(np.float64)
+
+    epochs, prices = [], []
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if not row or row[0] in ('symbol', 'epoch') or row[0].startswith('#'):
+                continue
+            if len(row) >= 3:
+                if symbol and row[0] != symbol:
+                    continue
+                row = row[1:]
+            epochs.append(int(row[0]))
+            prices.append(float(row[1]))
+
+    return np.array(epochs, dtype=np.int64), np.array(prices, dtype=np.float64)
+
+
+def ema_series(prices, period):
+    """EMA seeded with the first price; raw price for the first period-1 ticks"""
+    ema = pd.Series(prices).ewm(span=period, adjust=False).mean().to_numpy(copy=True)
+    ema[:period - 1] = prices[:period - 1]
+    return ema
+
+
+def rsi_series(prices, periods=(4, 14)):
+    """Simple-average RSI over the last `period` changes at every tick
+
+    Returns {period: rsi array}; the cumulative sums are shared by all periods.
+    """
+    n = len(prices)
+    deltas = np.diff(prices)
+    gain = np.maximum(deltas, 0.0)
+    loss = np.maximum(-deltas, 0.0)
+    gains = np.concatenate(([0.0], np.cumsum(gain)))
+    losses = np.concatenate(([0.0], np.cumsum(loss)))
+
+    # Counts of non-zero gains/losses tell exact zeros apart from cumsum residue
+    gain_hits = np.concatenate(([0], np.cumsum(gain > 0, dtype=np.int32)))
+    loss_hits = np.concatenate(([0], np.cumsum(loss > 0, dtype=np.int32)))
+
+    result = {}
+    for period in periods:
+        rsi = np.full(n, 50.0)
+        if n >= period + 1:
+            # Window sums of the `period` deltas ending at tick t (t >= period)
+            gain_sum = gains[period:] - gains[:-period]
+            loss_sum = losses[period:] - losses[:-period]
+            has_gain = gain_hits[period:] > gain_hits[:-period]
+            has_loss = loss_hits[period:] > loss_hits[:-period]
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                value = 100 - 100 / (1 + gain_sum / loss_sum)
+            rsi[period:] = np.where(has_loss, value, np.where(has_gain, 100.0, 50.0))
+        result[period] = rsi
+
+    return result
+
+
+def bollinger_position_series(prices, period=20):
+    """Position of each price inside its 20-tick Bollinger Bands (0..1)"""
+    rolling = pd.Series(prices).rolling(period)
+    sma = rolling.mean().to_numpy(copy=True)
+    std = rolling.std(ddof=0).to_numpy()
+    width = 4 * std
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        position = (prices - (sma - 2 * std)) / width
+    position = np.where(width > 0, position, 0.5)
+    position[:period - 1] = 0.5
+    return position
+
+
+def digit_series(digits, window=50, streak_window=10):
+    """Rolling high-digit and even-digit dominance, and capped same-parity streak"""
+    n = len(digits)
+    idx = np.arange(n)
+    seen = np.minimum(idx + 1, window)
+    high = np.cumsum(digits >= 5)
+    counts = high.astype(np.float64)
+    counts[window:] -= high[:-window]
+    dominance = counts / seen * 100
+
+    even = np.cumsum(digits % 2 == 0)
+    counts = even.astype(np.float64)
+    counts[window:] -= even[:-window]
+    even_dominance = counts / seen * 100
+
+    # Index where the current parity run started, carried forward
+    parity = digits % 2
+    run_start = np.zeros(n, dtype=np.int64)
+    changes = np.flatnonzero(parity[1:] != parity[:-1]) + 1
+    run_start[changes] = changes
+    run_start = np.maximum.accumulate(run_start)
+    streak = np.minimum(idx - run_start + 1, streak_window)
+
+    return dominance, even_dominance, streak
+
+
+def trend_series(prices, epochs, seconds):
+    """Closed-candle EMA(5)/EMA(20) trend of one timeframe at every tick
+
+    Matches CandleSeries.trend: a tick sees only the candles closed before
+    its own bucket, and buckets without ticks are skipped.
+    """
+    trend = np.zeros(len(prices), dtype=np.int8)
+    if epochs is None or not len(prices):
+        return trend
+
+    buckets = np.asarray(epochs, dtype=np.int64) // seconds
+    opens = np.flatnonzero(np.diff(buckets)) + 1
+    if not len(opens):
+        return trend
+
+    # Close of every candle that a later bucket closed, in order
+    closes = prices[opens - 1]
+    fast = ema_series(closes, 5)
+    slow = ema_series(closes, 20)
+    closed_trend = np.sign(fast - slow).astype(np.int8)
+    closed_trend[:TREND_WARMUP - 1] = 0
+
+    # Candles closed before each tick's bucket: 0 in the first bucket
+    new_bucket = np.zeros(len(prices), dtype=np.int64)
+    new_bucket[opens] = 1
+    closed = np.cumsum(new_bucket)
+    trend[closed > 0] = closed_trend[closed[closed > 0] - 1]
+    return trend
+
+
+def indicator_series(prices, pip_size=None, epochs=None):
+    """Every indicator ScoreCalculator uses, for every tick of the series
+
+    Without epochs the candle trends are 0 (unknown) throughout.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if pip_size is None:
+        pip_size = infer_pip_size(prices[-1000:])
+
+    digits = last_digits(prices, pip_size)
+    dominance, even_dominance, streak = digit_series(digits)
+
+    momentum = np.zeros(len(prices))
+    momentum[4:] = prices[4:] - prices[:-4]
+
+    rsi = rsi_series(prices, (4, 14))
+    trends = {f'trend_{name}': trend_series(prices, epochs, seconds)
+              for name, seconds in TIMEFRAMES.items()}
+
+    return {
+        'prices': prices,
+        'digits': digits,
+        'rsi_14': rsi[14],
+        'rsi_4': rsi[4],
+        'ema_5': ema_series(prices, 5),
+        'ema_10': ema_series(prices, 10),
+        'ema_20': ema_series(prices, 20),
+        'digit_dominance': dominance,
+        'digit_streak': streak,
+        'momentum': momentum,
+        'bollinger': bollinger_position_series(prices),
+        'even_dominance': even_dominance,
+        'last_digit': digits,
+        **trends
+    }
+
+
+def entry_signals(ind, scores, conditions, min_score=65, dead_zone=(40, 60), warmup=20):
+    """Contract per tick after BotManager's score and RSI dead-zone gates"""
+    rsi_14 = ind['rsi_14']
+    outside_dead_zone = (rsi_14 < dead_zone[0]) | (rsi_14 > dead_zone[1])
+
+    signals = {}
+    for bot_id, score in scores.items():
+        allowed = (score >= min_score) & outside_dead_zone
+        if warmup:
+            allowed[:warmup - 1] = False
+        signals[bot_id] = np.where(allowed, conditions[bot_id], NO_TRADE).astype(np.int8)
+    return signals
+
+
+def select_entries(signal, duration, allow_overlap=False):
+    """Tick indices where a trade is opened (one open contract at a time by default)"""
+    candidates = np.flatnonzero(signal)
+    if allow_overlap or not len(candidates):
+        return candidates
+
+    # Jump over candidates that fire while the previous contract is open
+    entries = []
+    i = 0
+    hold = duration + 1
+    while i < len(candidates):
+        entries.append(candidates[i])
+        i = np.searchsorted(candidates, candidates[i] + hold, side='left')
+    return np.array(entries, dtype=np.int64)
+
+
+def settle(ind, entries, contracts, duration, stake=1.0, payouts=None):
+    """PnL of each contract: entry spot is the next tick, exit is `duration` ticks later"""
+    payouts = payouts or DEFAULT_PAYOUTS
+    prices, digits = ind['prices'], ind['digits']
+
+    exit_idx = entries + 1 + duration
+    valid = exit_idx < len(prices)
+    entries, contracts, exit_idx = entries[valid], contracts[valid], exit_idx[valid]
+
+    entry_spot = prices[entries + 1]
+    exit_spot = prices[exit_idx]
+    exit_digit = digits[exit_idx]
+
+    won = np.select(
+        [contracts == RISE, contracts == FALL, contracts == DIGITOVER, contracts == DIGITUNDER,
+         contracts == DIGITEVEN, contracts == DIGITODD],
+        [exit_spot > entry_spot, exit_spot < entry_spot,
+         exit_digit > OVER_BARRIER, exit_digit < UNDER_BARRIER,
+         exit_digit % 2 == 0, exit_digit % 2 == 1],
+        False
+    )
+    payout = np.select([contracts == c for c in payouts], list(payouts.values()), 0.0)
+    pnl = np.where(won, stake * payout, -stake)
+    return entries, won, pnl
+
+
+def summarize(pnl, won):
+    """PnL, hit rate and max drawdown of a trade sequence"""
+    if not len(pnl):
+        return {'trades': 0, 'pnl': 0.0, 'hit_rate': 0.0, 'max_drawdown': 0.0}
+
+    equity = np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+    return {
+        'trades': int(len(pnl)),
+        'pnl': float(equity[-1]),
+        'hit_rate': float(np.mean(won) * 100),
+        'max_drawdown': float(np.max(peak - equity))
+    }
+
+
+class Backtester:
+    """Run every bot of a rule set over one symbol's tick series"""
+    def __init__(self, prices, epochs=None, pip_size=None, duration=5, stake=1.0,
+                 thresholds=None, payouts=None, allow_overlap=False, indicators=None,
+                 rules=None):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.epochs = epochs
+        self.pip_size = pip_size
+        self.duration = duration
+        self.stake = stake
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        self.payouts = payouts or DEFAULT_PAYOUTS
+        self.allow_overlap = allow_overlap
+        self.indicators = indicators  # Precomputed indicator_series() output
+        self.rules = rules or default_rules()  # Compiled RuleSet
+        self.params = self.rules.bind(self.thresholds)
+
+    def signals(self, ind, offset=0):
+        """Entry signals per bot, evaluated in cache-sized chunks
+
+        `offset` is the absolute index of ind's first tick (for the warm-up).
+        """
+        n = len(ind['prices'])
+        signals = {bot_id: np.zeros(n, dtype=np.int8) for bot_id in self.rules.bots}
+
+        for start in range(0, n, CHUNK_SIZE):
+            chunk = {key: values[start:start + CHUNK_SIZE] for key, values in ind.items()}
+            warmup = max(0, 20 - offset - start)
+            scores = self.rules.scores_vector(chunk, self.params)
+            conditions = self.rules.entries_vector(chunk, self.params, CONTRACT_CODES)
+            chunk_signals = entry_signals(chunk, scores, conditions,
+                                          self.thresholds['min_score'], warmup=warmup)
+            for bot_id, signal in chunk_signals.items():
+                signals[bot_id][start:start + CHUNK_SIZE] = signal
+
+        return signals
+
+    def run(self, start=0, end=None):
+        """Backtest all bots over ticks [start, end), returns {bot_id: stats}
+
+        Indicators are computed over the full series, so a window starts with
+        warmed-up values; contracts still open at `end` are not settled.
+        """
+        started = time.perf_counter()
+
+        if self.indicators is None:
+            self.indicators = indicator_series(self.prices, self.pip_size, self.epochs)
+        ind = self.indicators
+        if start or end is not None:
+            ind = {key: values[start:end] for key, values in ind.items()}
+
+        signals = self.signals(ind, start)
+
+        results = {}
+        for bot_id, signal in signals.items():
+            entries = select_entries(signal, self.duration, self.allow_overlap)
+            entries, won, pnl = settle(ind, entries, signal[entries], self.duration,
+                                       self.stake, self.payouts)
+            results[bot_id] = summarize(pnl, won)
+
+        elapsed = time.perf_counter() - started
+        ticks = len(ind['prices'])
+        self.ticks_per_second = ticks / elapsed if elapsed > 0 else float('inf')
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest all bots over recorded ticks')
+    parser.add_argument('ticks', help='CSV (symbol,epoch,quote or epoch,quote) or .npy file')
+    parser.add_argument('--symbol')
+    parser.add_argument('--pip-size', type=int)
+    parser.add_argument('--duration', type=int, default=5, help='contract length in ticks')
+    parser.add_argument('--stake', type=float, default=1.0)
+    parser.add_argument('--thresholds', help='JSON thresholds file (defaults if omitted)')
+    parser.add_argument('--rules', help='bot rules file (the bundled rules if omitted)')
+    parser.add_argument('--overlap', action='store_true', help='allow overlapping contracts')
+    args = parser.parse_args()
+
+    epochs, prices = load_ticks(args.ticks, args.symbol)
+    rules = load_rules(args.rules)
+    backtester = Backtester(prices, epochs, args.pip_size, args.duration, args.stake,
+                            load_thresholds(args.thresholds), allow_overlap=args.overlap,
+                            rules=rules)
+    results = backtester.run()
+
+    print(f"{len(prices)} ticks at {backtester.ticks_per_second:,.0f} ticks/sec")
+    print(f"{'Bot':<20}{'Trades':>8}{'PnL':>12}{'Hit %':>8}{'Max DD':>10}")
+    for bot_id, stats in results.items():
+        name = f"#{bot_id} {rules.bots[bot_id].name}"
+        print(f"{name:<20}{stats['trades']:>8}{stats['pnl']:>12.2f}"
+              f"{stats['hit_rate']:>8.1f}{stats['max_drawdown']:>10.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+"""Parallel walk-forward optimizer for the score thresholds
+
+Indicator series are computed once per symbol and placed in a shared-memory
+block; a process pool then backtests every threshold combination from the
+grid on every walk-forward fold without copying or recomputing them.
+
+For each fold i > 0 the combination with the best PnL on folds 0..i-1
+(among those with min_trades on each of them) is picked and its PnL on
+fold i is recorded; the sum over these steps is the out-of-sample PnL of
+the selection procedure. The same selection over all folds gives the
+combination written as the thresholds file the live bots load via
+Config.THRESHOLDS_FILE. The report's ranking of every combination is in
+hindsight, for comparison only.
+
+    python -m strategies.optimizer V75.csv V100.npy --folds 5 --workers 4
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from strategies.backtest import Backtester, indicator_series, load_ticks
+from strategies.thresholds import DEFAULT_THRESHOLDS
+from utils.candle_aggregator import TREND_FIELDS
+
+DEFAULT_GRID = {
+    'rsi14_extreme': [25, 30, 35],
+    'rsi4_extreme': [25, 30, 33, 38],
+    'ema_separation': [0.005, 0.01, 0.02],
+    'digit_dominance': [55, 60, 65],
+    'min_score': [55, 65, 75]
+}
+
+# Order of the indicator rows in the shared block
+SERIES_KEYS = ['prices', 'digits', 'rsi_14', 'rsi_4', 'ema_5', 'ema_10', 'ema_20',
+               'digit_dominance', 'digit_streak', 'momentum', 'bollinger',
+               'even_dominance', 'last_digit'] + TREND_FIELDS
+
+# Per-worker views onto the shared block, set by attach_worker()
+_shared = {}
+
+
+def attach_worker(shm_name, shape, layout, duration, min_trades):
+    """Pool initializer: map the shared indicator block into this process"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+    _shared['shm'] = shm  # Keep the mapping alive
+    _shared['duration'] = duration
+    _shared['min_trades'] = min_trades
+    _shared['symbols'] = {
+        symbol: {key: block[row, offset:offset + length] for row, key in enumerate(SERIES_KEYS)}
+        for symbol, offset, length in layout
+    }
+
+
+def train_pnl(results, folds):
+    """Summed PnL of the first `folds` folds, -inf unless all are eligible"""
+    results = results[:folds]
+    if not all(r['eligible'] for r in results):
+        return float('-inf')
+    return sum(r['pnl'] for r in results)
+
+
+def fold_bounds(length, folds):
+    """[start, end) tick ranges of consecutive equal folds"""
+    edges = np.linspace(0, length, folds + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def evaluate_combo(params, folds):
+    """PnL, trades and worst drawdown of one combination on every fold"""
+    results = []
+    for fold in range(folds):
+        pnl = trades = wins = drawdown = 0.0
+        for ind in _shared['symbols'].values():
+            start, end = fold_bounds(len(ind['prices']), folds)[fold]
+            backtester = Backtester(ind['prices'], duration=_shared['duration'],
+                                    thresholds=params, indicators=ind)
+            for stats in backtester.run(start, end).values():
+                pnl += stats['pnl']
+                trades += stats['trades']
+                wins += stats['trades'] * stats['hit_rate'] / 100
+                drawdown = max(drawdown, stats['max_drawdown'])
+
+        results.append({
+            'pnl': pnl,
+            'trades': int(trades),
+            'hit_rate': wins / trades * 100 if trades else 0.0,
+            'max_drawdown': drawdown,
+            # Too few trades to trust: never selected on this fold
+            'eligible': trades >= _shared['min_trades']
+        })
+    return params, results
+
+
+class WalkForwardOptimizer:
+    """Grid search with walk-forward validation over shared indicator series"""
+    def __init__(self, tick_sets, grid=None, folds=5, workers=None, duration=5,
+                 min_trades=20):
+        self.tick_sets = tick_sets  # {symbol: (prices, pip_size[, epochs])}
+        self.grid = grid or DEFAULT_GRID
+        self.folds = folds
+        self.workers = workers or os.cpu_count() or 1
+        self.duration = duration
+        self.min_trades = min_trades
+
+    def combinations(self):
+        keys = list(self.grid)
+        for values in itertools.product(*(self.grid[k] for k in keys)):
+            yield dict(DEFAULT_THRESHOLDS, **dict(zip(keys, values)))
+
+    def build_shared_block(self):
+        """Compute indicators once per symbol and copy them into shared memory"""
+        series = {symbol: indicator_series(*ticks) for symbol, ticks in self.tick_sets.items()}
+
+        total = sum(len(ind['prices']) for ind in series.values())
+        shape = (len(SERIES_KEYS), total)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * shape[0] * shape[1]))
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+        layout = []
+        offset = 0
+        for symbol, ind in series.items():
+            length = len(ind['prices'])
+            for row, key in enumerate(SERIES_KEYS):
+                block[row, offset:offset + length] = ind[key]
+            layout.append((symbol, offset, length))
+            offset += length
+
+        return shm, shape, layout
+
+    def run(self):
+        """Evaluate the grid and return the ranked report"""
+        started = time.perf_counter()
+        shm, shape, layout = self.build_shared_block()
+        combos = list(self.combinations())
+
+        try:
+            initargs = (shm.name, shape, layout, self.duration, self.min_trades)
+            with ProcessPoolExecutor(self.workers, initializer=attach_worker,
+                                     initargs=initargs) as pool:
+                futures = [pool.submit(evaluate_combo, params, self.folds) for params in combos]
+                evaluated = [f.result() for f in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        report = self.walk_forward(evaluated)
+        report['elapsed_seconds'] = time.perf_counter() - started
+        return report
+
+    def select(self, evaluated, folds):
+        """Combination with the best eligible PnL on the first `folds` folds
+
+        Returns (params, results, pnl), or None if no combination had
+        min_trades on each of those folds.
+        """
+        params, results = max(evaluated, key=lambda item: train_pnl(item[1], folds))
+        pnl = train_pnl(results, folds)
+        if pnl == float('-inf'):
+            return None
+        return params, results, pnl
+
+    def walk_forward(self, evaluated):
+        """Select on past folds, score on the next one, then select on all folds"""
+        steps = []
+        for fold in range(1, self.folds):
+            selected = self.select(evaluated, fold)
+            if selected is None:
+                continue
+            params, results, pnl = selected
+            steps.append({
+                'fold': fold,
+                'selected': params,
+                'train_pnl': pnl,
+                'test': results[fold]
+            })
+
+        # What goes live: selected the same way, on every fold
+        selected = self.select(evaluated, self.folds)
+        final = None
+        if selected is not None:
+            final = {'thresholds': selected[0], 'train_pnl': selected[2]}
+
+        # Every combination over folds 1..n-1, in hindsight (not out-of-sample)
+        ranking = []
+        for params, results in evaluated:
+            scored = results[1:]
+            ranking.append({
+                'thresholds': params,
+                'eligible': all(r['eligible'] for r in results),
+                'pnl': sum(r['pnl'] for r in scored),
+                'trades': sum(r['trades'] for r in scored),
+                'worst_drawdown': max((r['max_drawdown'] for r in scored), default=0.0),
+                'folds': results
+            })
+        ranking.sort(key=lambda r: (r['eligible'], r['pnl']), reverse=True)
+
+        return {
+            'folds': self.folds,
+            'combinations': len(evaluated),
+            'walk_forward': steps,
+            'walk_forward_pnl': sum(step['test']['pnl'] for step in steps),
+            'selected': final,
+            'ranking': ranking
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Walk-forward threshold optimizer')
+    parser.add_argument('ticks', nargs='+', help='tick files (CSV or .npy), one per symbol')
+    parser.add_argument('--symbol', help='symbol to read from multi-symbol CSVs')
+    parser.add_argument('--pip-size', type=int)
+    parser.add_argument('--grid', help='JSON file mapping threshold names to value lists')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--duration', type=int, default=5)
+    parser.add_argument('--min-trades', type=int, default=20)
+    parser.add_argument('--report', default='optimizer_report.json')
+    parser.add_argument('--output', default='thresholds.json',
+                        help='thresholds file for the live bots')
+    args = parser.parse_args()
+
+    grid = None
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+
+    tick_sets = {}
+    for path in args.ticks:
+        epochs, prices = load_ticks(path, args.symbol)
+        tick_sets[os.path.basename(path)] = (prices, args.pip_size, epochs)
+
+    optimizer = WalkForwardOptimizer(tick_sets, grid, args.folds, args.workers,
+                                     args.duration, args.min_trades)
+    report = optimizer.run()
+
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{report['combinations']} combinations x {report['folds']} folds "
+          f"in {report['elapsed_seconds']:.1f}s")
+    print(f"Walk-forward out-of-sample PnL: {report['walk_forward_pnl']:.2f} "
+          f"over {len(report['walk_forward'])} steps")
+    print("Ranking in hindsight (folds 1..n-1, not out-of-sample):")
+    for rank, row in enumerate(report['ranking'][:10], 1):
+        flag = '' if row['eligible'] else ' (too few trades)'
+        print(f"{rank:>3}. pnl={row['pnl']:>10.2f} trades={row['trades']:>6} "
+              f"{json.dumps(row['thresholds'])}{flag}")
+
+    selected = report['selected']
+    if selected is None:
+        print(f"No combination had {args.min_trades} trades on every fold; "
+              f"wrote {args.report}, {args.output} left unchanged")
+        return
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'thresholds': selected['thresholds'],
+            'train_pnl': selected['train_pnl'],
+            'walk_forward_pnl': report['walk_forward_pnl'],
+            'generated': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }, f, indent=2)
+    print(f"Wrote {args.report} and {args.output}")
+
+if __name__ == '__main__':
+    main()
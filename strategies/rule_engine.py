@@ -0,0 +1,403 @@
+"""Declarative bot rules compiled to NumPy predicates
+
+A rules file (JSON, or YAML when PyYAML is installed) defines every bot:
+
+    {
+      "params": {"hawk_rsi": 42},
+      "bots": [
+        {
+          "id": 6,
+          "name": "Hawk Under5",
+          "score": [
+            {"when": "digit_dominance < 40", "points": 25},
+            {"tiers": [{"when": "rsi_14 < hawk_rsi", "points": 25},
+                       {"when": "rsi_14 < 45", "points": 15}]}
+          ],
+          "entries": [{"when": "digit_dominance < 40", "contract": "DIGITUNDER"}],
+          "duration": 5
+        }
+      ]
+    }
+
+A bot's score is the sum of its terms, capped at max_score (100): a term
+adds its points when its condition holds, or the points of the first
+matching tier. The first matching entry gives the contract to trade.
+
+Conditions are Python-style expressions over the indicators (FIELDS) and
+the params, which are the threshold names plus the file's own "params".
+A bare name is an indicator if there is one of that name, else a param;
+params.<name> always means the param (e.g. params.digit_dominance, the
+threshold, next to digit_dominance, the indicator). Only comparisons,
+and/or/not, arithmetic, abs/min/max and the even/odd parity predicates are
+allowed, and a condition as a whole must be a comparison, a parity
+predicate, or and/or/not of those.
+Each one is compiled twice: a vector form evaluated over arrays (one
+value per tick or per symbol, used by the backtester and ScoreMatrix) and
+a scalar form for one snapshot.
+"""
+import ast
+import json
+import os
+import threading
+import time
+import numpy as np
+from strategies.thresholds import DEFAULT_THRESHOLDS
+from utils.candle_aggregator import TREND_FIELDS
+
+# Indicators a rule can read (bollinger is the price's band position,
+# even_dominance the even-digit percentage, last_digit the latest quote's
+# digit, trend_<timeframe> the +1/-1/0 closed-candle trend of that timeframe)
+FIELDS = ['rsi_14', 'rsi_4', 'ema_5', 'ema_10', 'ema_20', 'digit_dominance',
+          'digit_streak', 'momentum', 'bollinger', 'even_dominance', 'last_digit'] + TREND_FIELDS
+
+# Contracts a rule can open
+CONTRACTS = ['RISE', 'FALL', 'DIGITOVER', 'DIGITUNDER', 'DIGITEVEN', 'DIGITODD']
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bot_rules.json')
+
+# Functions allowed in expressions: (scalar, vector) implementations
+FUNCTIONS = {
+    'abs': ('abs', 'np.abs'),
+    'min': ('min', 'np.minimum'),
+    'max': ('max', 'np.maximum')
+}
+
+# Parity predicates (e.g. even(last_digit)): name -> remainder mod 2
+PARITY = {'even': 0, 'odd': 1}
+
+OPERATORS = {
+    ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/', ast.Mod: '%',
+    ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=', ast.Eq: '==', ast.NotEq: '!='
+}
+
+
+class RuleError(ValueError):
+    """Invalid rules file or expression"""
+
+
+class ExpressionCompiler:
+    """Translates a validated expression AST into Python source
+
+    Names become ind['...'] or p['...'] lookups. In vector form and/or/not
+    and chained comparisons become np.logical_* calls, so they work
+    element-wise on arrays.
+    """
+    def __init__(self, params, vector):
+        self.params = params
+        self.vector = vector
+
+    def source(self, node):
+        method = getattr(self, f'visit_{type(node).__name__}', None)
+        if method is None:
+            raise RuleError(f"{type(node).__name__} is not allowed in rules")
+        return method(node)
+
+    def visit_Expression(self, node):
+        return self.source(node.body)
+
+    def visit_BoolOp(self, node):
+        values = [self.source(value) for value in node.values]
+        if not self.vector:
+            op = ' and ' if isinstance(node.op, ast.And) else ' or '
+            return f"({op.join(values)})"
+        return self.fold('np.logical_and' if isinstance(node.op, ast.And) else 'np.logical_or', values)
+
+    def visit_UnaryOp(self, node):
+        operand = self.source(node.operand)
+        if isinstance(node.op, ast.Not):
+            return f"np.logical_not({operand})" if self.vector else f"(not {operand})"
+        if isinstance(node.op, ast.USub):
+            return f"(-{operand})"
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        raise RuleError(f"Operator {type(node.op).__name__} is not allowed in rules")
+
+    def visit_BinOp(self, node):
+        return f"({self.source(node.left)} {self.operator(node.op)} {self.source(node.right)})"
+
+    def visit_Compare(self, node):
+        operands = [self.source(node.left)] + [self.source(c) for c in node.comparators]
+        parts = [f"({operands[i]} {self.operator(op)} {operands[i + 1]})"
+                 for i, op in enumerate(node.ops)]
+        if len(parts) == 1:
+            return parts[0]
+        return self.fold('np.logical_and', parts) if self.vector else f"({' and '.join(parts)})"
+
+    def visit_Call(self, node):
+        name = node.func.id if isinstance(node.func, ast.Name) else None
+        if name not in FUNCTIONS and name not in PARITY or node.keywords:
+            raise RuleError(f"Only {', '.join([*FUNCTIONS, *PARITY])} can be called in rules")
+        if name in PARITY:
+            if len(node.args) != 1:
+                raise RuleError(f"Wrong number of arguments to {name}()")
+            return f"(({self.source(node.args[0])}) % 2 == {PARITY[name]})"
+        if name == 'abs' and len(node.args) != 1 or name != 'abs' and len(node.args) != 2:
+            raise RuleError(f"Wrong number of arguments to {name}()")
+        function = FUNCTIONS[name][1 if self.vector else 0]
+        return f"{function}({', '.join(self.source(arg) for arg in node.args)})"
+
+    def visit_Name(self, node):
+        if node.id in FIELDS:
+            return f"ind[{node.id!r}]"
+        if node.id in self.params:
+            return f"p[{node.id!r}]"
+        raise RuleError(f"Unknown name '{node.id}'")
+
+    def visit_Attribute(self, node):
+        if not isinstance(node.value, ast.Name) or node.value.id != 'params':
+            raise RuleError("Only params.<name> attributes are allowed in rules")
+        if node.attr not in self.params:
+            raise RuleError(f"Unknown param '{node.attr}'")
+        return f"p[{node.attr!r}]"
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, (bool, int, float)):
+            return repr(node.value)
+        raise RuleError(f"Constant {node.value!r} is not allowed in rules")
+
+    def operator(self, op):
+        if type(op) not in OPERATORS:
+            raise RuleError(f"Operator {type(op).__name__} is not allowed in rules")
+        return OPERATORS[type(op)]
+
+    def fold(self, function, values):
+        source = values[0]
+        for value in values[1:]:
+            source = f"{function}({source}, {value})"
+        return source
+
+
+def is_boolean(node):
+    """True for expressions that always give a boolean (or boolean array)"""
+    if isinstance(node, ast.Compare):
+        return True
+    if isinstance(node, ast.BoolOp):
+        return all(is_boolean(value) for value in node.values)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return is_boolean(node.operand)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        return node.func.id in PARITY
+    return isinstance(node, ast.Constant) and isinstance(node.value, bool)
+
+
+def compile_expression(expression, params, vector):
+    """Compile an expression into fn(ind, p)"""
+    if not isinstance(expression, str):
+        raise RuleError(f"Rule condition must be a string, got {expression!r}")
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise RuleError(f"Invalid rule {expression!r}: {e.msg}")
+    if not is_boolean(tree.body):
+        # A number would be added as points in score_vector, not masked
+        raise RuleError(f"Invalid rule {expression!r}: a condition must be a comparison, "
+                        f"even()/odd(), and/or/not of those, or True/False")
+
+    try:
+        source = ExpressionCompiler(params, vector).source(tree)
+    except RuleError as e:
+        raise RuleError(f"Invalid rule {expression!r}: {e}")
+
+    code = compile(f"lambda ind, p: {source}", '<rule>', 'eval')
+    return eval(code, {'np': np, '__builtins__': {'abs': abs, 'min': min, 'max': max}})
+
+
+class Condition:
+    """One compiled rule condition"""
+    __slots__ = ('expression', 'vector', 'scalar')
+
+    def __init__(self, expression, params):
+        self.expression = expression
+        self.vector = compile_expression(expression, params, vector=True)
+        self.scalar = compile_expression(expression, params, vector=False)
+
+
+class CompiledBot:
+    """Score terms and entries of one bot"""
+    def __init__(self, spec, params):
+        try:
+            self.bot_id = int(spec['id'])
+            self.name = spec.get('name', f"Bot {self.bot_id}")
+            self.max_score = spec.get('max_score', 100)
+            self.duration = int(spec.get('duration', 5))
+            self.duration_unit = spec.get('duration_unit', 't')
+
+            # Each term is a list of (condition, points); the first match counts
+            self.terms = []
+            for term in spec.get('score', []):
+                tiers = term['tiers'] if 'tiers' in term else [term]
+                self.terms.append([(Condition(tier['when'], params), tier['points']) for tier in tiers])
+
+            self.entries = []
+            for entry in spec.get('entries', []):
+                if entry['contract'] not in CONTRACTS:
+                    raise RuleError(f"Unknown contract {entry['contract']!r}")
+                self.entries.append((Condition(entry['when'], params), entry['contract']))
+
+            # Whole-number scores unless some points (or the cap) are fractional
+            self.integer_scores = isinstance(self.max_score, int) and all(
+                isinstance(points, int) for tiers in self.terms for _, points in tiers
+            )
+        except (KeyError, TypeError) as e:
+            raise RuleError(f"Invalid bot rule {spec!r}: missing or bad {e}")
+
+    def score(self, ind, p):
+        """Score of one snapshot"""
+        score = 0
+        for tiers in self.terms:
+            for condition, points in tiers:
+                if condition.scalar(ind, p):
+                    score += points
+                    break
+        return min(self.max_score, score)
+
+    def score_vector(self, ind, p, n):
+        """Scores over arrays of n values"""
+        score = np.zeros(n)
+        for tiers in self.terms:
+            taken = np.zeros(n, dtype=bool)
+            for condition, points in tiers:
+                hit = np.broadcast_to(condition.vector(ind, p), (n,))
+                score += points * (hit & ~taken)
+                taken |= hit
+        return np.minimum(self.max_score, score)
+
+    def entry(self, ind, p):
+        """Contract of the first matching entry for one snapshot, or None"""
+        for condition, contract in self.entries:
+            if condition.scalar(ind, p):
+                return contract
+        return None
+
+    def entry_vector(self, ind, p, n, codes):
+        """Contract code of the first matching entry over arrays (0 = none)"""
+        if not self.entries:
+            return np.zeros(n, dtype=np.int8)
+        conditions = [np.broadcast_to(c.vector(ind, p), (n,)) for c, _ in self.entries]
+        return np.select(conditions, [codes[contract] for _, contract in self.entries], 0)
+
+
+class RuleSet:
+    """Compiled bots of one rules file"""
+    def __init__(self, spec, source=None):
+        if not isinstance(spec, dict) or not isinstance(spec.get('bots'), list):
+            raise RuleError("A rules file needs a list of 'bots'")
+        self.source = source
+        self.params = dict(DEFAULT_THRESHOLDS, **spec.get('params', {}))
+
+        self.bots = {}
+        for bot_spec in spec['bots']:
+            bot = CompiledBot(bot_spec, self.params)
+            if bot.bot_id in self.bots:
+                raise RuleError(f"Bot {bot.bot_id} is defined twice")
+            self.bots[bot.bot_id] = bot
+        self.integer_scores = all(bot.integer_scores for bot in self.bots.values())
+
+    def bind(self, thresholds=None):
+        """Params for evaluation: the file's defaults overridden by thresholds"""
+        return dict(self.params, **(thresholds or {}))
+
+    def view(self, snapshot):
+        """Rule inputs from an indicator snapshot (or a scores dict)"""
+        ind = {field: snapshot[field] for field in FIELDS if field in snapshot}
+        for field in TREND_FIELDS:
+            ind.setdefault(field, 0)  # Unknown in snapshots built without candles
+        bollinger = ind.get('bollinger')
+        if isinstance(bollinger, dict):
+            ind['bollinger'] = bollinger['position']
+        return ind
+
+    def scores(self, ind, p):
+        """{bot_id: score} for one view()"""
+        return {bot_id: bot.score(ind, p) for bot_id, bot in self.bots.items()}
+
+    def scores_vector(self, ind, p):
+        """{bot_id: score array} over arrays of indicators"""
+        n = len(ind['rsi_14'])
+        return {bot_id: bot.score_vector(ind, p, n) for bot_id, bot in self.bots.items()}
+
+    def entry(self, bot_id, ind, p):
+        bot = self.bots.get(bot_id)
+        return bot.entry(ind, p) if bot is not None else None
+
+    def entries_vector(self, ind, p, codes):
+        """{bot_id: contract code array} using `codes` {contract: int}"""
+        n = len(ind['rsi_14'])
+        return {bot_id: bot.entry_vector(ind, p, n, codes) for bot_id, bot in self.bots.items()}
+
+
+def read_rules_file(path):
+    """Parse a JSON or YAML rules file"""
+    with open(path) as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise RuleError(f"PyYAML is needed to read {path}")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def load_rules(path=None):
+    """Compile a rules file (the bundled bot_rules.json by default)"""
+    path = path or DEFAULT_RULES_FILE
+    try:
+        spec = read_rules_file(path)
+    except ValueError as e:
+        raise RuleError(f"Could not parse {path}: {e}")
+    return RuleSet(spec, path)
+
+
+_default_rules = None
+
+
+def default_rules():
+    """The bundled rules, compiled once per process"""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = load_rules()
+    return _default_rules
+
+
+class RuleBook:
+    """The current RuleSet of a rules file, recompiled when the file changes
+
+    refresh() is cheap to call often: it looks at the file's mtime at most
+    every check_interval seconds. A file that fails to compile is reported
+    and the previous rules stay in effect. Without a path the bundled
+    rules are used; a path that does not exist is an error.
+    """
+    def __init__(self, path=None, check_interval=1.0):
+        if path and not os.path.exists(path):
+            raise RuleError(f"Bot rules file {path} not found")
+        self.path = path or DEFAULT_RULES_FILE
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.mtime = os.path.getmtime(self.path)
+        self.rules = load_rules(self.path)
+        self.version = 1
+        self.checked = time.monotonic()
+
+    def refresh(self):
+        """Reload the rules if the file changed; True when they were replaced"""
+        now = time.monotonic()
+        if now - self.checked < self.check_interval:
+            return False
+
+        with self.lock:
+            self.checked = now
+            try:
+                mtime = os.path.getmtime(self.path)
+                if mtime == self.mtime:
+                    return False
+                self.mtime = mtime
+                rules = load_rules(self.path)
+            except (OSError, RuleError) as e:
+                print(f"Bot rules reload failed, keeping version {self.version}: {e}")
+                return False
+
+            self.rules = rules
+            self.version += 1
+            print(f"Reloaded bot rules from {self.path} (version {self.version}, "
+                  f"{len(rules.bots)} bots)")
+            return True
@@ -1,8 +1,16 @@
 import numpy as np
-from datetime import datetime
+from utils.digit_stats import last_digits, infer_pip_size
+from strategies.rule_engine import RuleBook
+from strategies.thresholds import DEFAULT_THRESHOLDS
 
 class ScoreCalculator:
-    def __init__(self):
+    def __init__(self, thresholds=None, rules=None):
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        
+        # Bot scores come from the compiled rules file (hot-reloadable)
+        self.rules = rules or RuleBook()
+        self.params = None
+        self.params_version = None
         self.weights = {
             'rsi_14': 15,
             'rsi_4': 15,
@@ -14,38 +22,45 @@ class ScoreCalculator:
             'digit_streak': 10
         }
         
-    def calculate_all_scores(self, symbol, tick_data):
-        """Calculate scores for all bots"""
-        if len(tick_data) < 20:
-            return {}
+        # Last scores per symbol, keyed by the snapshot epoch they came from
+        self.score_cache = {}
+        
+    def calculate_all_scores(self, symbol, tick_data, indicators=None):
+        """Calculate scores for all bots
+        
+        `indicators` is the per-tick snapshot published by DerivAPI. When its
+        epoch matches the last one scored for this symbol the cached scores
+        are returned. Without a snapshot indicators are computed from ticks.
+        """
+        if indicators is None:
+            if len(tick_data) < 20:
+                return {}
+                
+            indicators = self.calculate_indicators(tick_data)
             
-        # Get indicator values
-        indicators = self.calculate_indicators(tick_data)
-        
-        # Calculate individual bot scores
-        scores = {
-            1: self.calculate_bot1_score(indicators),
-            2: self.calculate_bot2_score(indicators),
-            3: self.calculate_bot3_score(indicators),
-            4: self.calculate_bot4_score(indicators),
-            5: self.calculate_bot5_score(indicators),
-            6: self.calculate_bot6_score(indicators),
-            7: self.calculate_bot7_score(indicators),
-            # Add all indicators for reference
-            'rsi_14': indicators['rsi_14'],
-            'rsi_4': indicators['rsi_4'],
-            'ema_5': indicators['ema_5'],
-            'ema_10': indicators['ema_10'],
-            'ema_20': indicators['ema_20'],
-            'digit_dominance': indicators['digit_dominance'],
-            'digit_streak': indicators['digit_streak']
-        }
+        epoch = indicators.get('epoch')
+        if epoch is not None:
+            cached = self.score_cache.get(symbol)
+            if cached is not None and cached[0] == epoch:
+                return cached[1]
+                
+        # Score every bot of the rules file, then add the indicators for reference
+        rules = self.rules.rules
+        view = rules.view(indicators)
+        scores = rules.scores(view, self.bound_params())
+        scores.update(view)
         
+        if epoch is not None:
+            self.score_cache[symbol] = (epoch, scores)
+            
         return scores
         
     def calculate_indicators(self, tick_data):
         """Calculate all technical indicators"""
-        prices = [t['price'] for t in tick_data]
+        prices = tick_data.prices()
+        pip_size = tick_data.pip_size
+        if pip_size is None:
+            pip_size = infer_pip_size(prices)
         
         return {
             'rsi_14': self.calculate_rsi(prices, 14),
@@ -53,112 +68,20 @@ class ScoreCalculator:
             'ema_5': self.calculate_ema(prices, 5),
             'ema_10': self.calculate_ema(prices, 10),
             'ema_20': self.calculate_ema(prices, 20),
-            'digit_dominance': self.calculate_digit_dominance(prices),
-            'digit_streak': self.calculate_digit_streak(prices),
+            'digit_dominance': self.calculate_digit_dominance(prices, pip_size),
+            'digit_streak': self.calculate_digit_streak(prices, pip_size),
+            'even_dominance': self.calculate_even_dominance(prices, pip_size),
+            'last_digit': int(last_digits(prices[-1:], pip_size)[0]),
             'momentum': self.calculate_momentum(prices),
             'bollinger': self.calculate_bollinger(prices)
         }
         
-    def calculate_bot3_score(self, indicators):
-        """Calculate score for Bot #3 - Berlin X9"""
-        score = 0
-        rsi_14 = indicators['rsi_14']
-        rsi_4 = indicators['rsi_4']
-        
-        # RSI(14) conditions
-        if rsi_14 < 30 or rsi_14 > 70:
-            score += 15
-        elif rsi_14 < 35 or rsi_14 > 65:
-            score += 10
-            
-        # RSI(4) conditions
-        if rsi_4 < 33 or rsi_4 > 67:
-            score += 15
-        elif rsi_4 < 35 or rsi_4 > 65:
-            score += 10
-            
-        # EMA alignment check
-        if indicators['ema_5'] < indicators['ema_10'] and rsi_4 < 33:
-            score += 15
-        elif indicators['ema_5'] > indicators['ema_10'] and rsi_4 > 67:
-            score += 15
-            
-        return min(100, score)
-        
-    def calculate_bot4_score(self, indicators):
-        """Calculate score for Bot #4 - BeastO7"""
-        score = 0
-        ema_separation = abs(indicators['ema_5'] - indicators['ema_10'])
-        
-        # EMA separation strength
-        if ema_separation > 0.05:
-            score += 30
-        elif ema_separation > 0.03:
-            score += 25
-        elif ema_separation > 0.02:
-            score += 20
-        elif ema_separation > 0.01:
-            score += 15
-            
-        # EMA stack check
-        if (indicators['ema_5'] > indicators['ema_10'] > indicators['ema_20']):
-            score += 15  # Bullish stack
-        elif (indicators['ema_5'] < indicators['ema_10'] < indicators['ema_20']):
-            score += 15  # Bearish stack
-            
-        # RSI filter
-        rsi_14 = indicators['rsi_14']
-        if rsi_14 < 38 or rsi_14 > 62:
-            score += 15
-            
-        return min(100, score)
-        
-    def calculate_bot5_score(self, indicators):
-        """Calculate score for Bot #5 - Gas Hunter"""
-        score = 0
-        digit_dom = indicators['digit_dominance']
-        
-        # Digit dominance
-        if digit_dom > 75:
-            score += 30
-        elif digit_dom > 65:
-            score += 25
-        elif digit_dom > 60:
-            score += 15
-            
-        # RSI confirmation
-        rsi_14 = indicators['rsi_14']
-        if digit_dom > 60 and rsi_14 > 55:  # Over signal
-            score += 20
-        elif digit_dom < 40 and rsi_14 < 45:  # Under signal
-            score += 20
-            
-        return min(100, score)
-        
-    def calculate_bot6_score(self, indicators):
-        """Calculate score for Bot #6 - Hawk Under5"""
-        score = 0
-        digit_dom = indicators['digit_dominance']
-        rsi_14 = indicators['rsi_14']
-        
-        # Low digit dominance
-        if digit_dom < 40:  # Low digits dominating (Under 5)
-            score += 25
-        elif digit_dom < 35:
-            score += 30
-            
-        # RSI below 42
-        if rsi_14 < 42:
-            score += 25
-        elif rsi_14 < 45:
-            score += 15
-            
-        # Price near lower Bollinger
-        bollinger = indicators['bollinger']
-        if bollinger['position'] < 0.2:  # Near lower band
-            score += 20
-            
-        return min(100, score)
+    def bound_params(self):
+        """Rule params with the thresholds applied, rebound after a reload"""
+        if self.params_version != self.rules.version:
+            self.params = self.rules.rules.bind(self.thresholds)
+            self.params_version = self.rules.version
+        return self.params
         
     def calculate_rsi(self, prices, period):
         """Calculate RSI"""
@@ -181,7 +104,7 @@ class ScoreCalculator:
     def calculate_ema(self, prices, period):
         """Calculate EMA"""
         if len(prices) < period:
-            return prices[-1] if prices else 0
+            return prices[-1] if len(prices) else 0
             
         multiplier = 2 / (period + 1)
         ema = prices[0]
@@ -191,29 +114,39 @@ class ScoreCalculator:
             
         return ema
         
-    def calculate_digit_dominance(self, prices):
+    def calculate_digit_dominance(self, prices, pip_size=None):
         """Calculate high digit (5-9) percentage"""
-        last_50 = prices[-50:] if len(prices) >= 50 else prices
-        digits = [int(str(p)[-1]) for p in last_50]
-        high_digits = sum(1 for d in digits if d >= 5)
+        last_50 = prices[-50:]
+        if pip_size is None:
+            pip_size = infer_pip_size(last_50)
+            
+        digits = last_digits(last_50, pip_size)
+        high_digits = np.count_nonzero(digits >= 5)
         return (high_digits / len(last_50)) * 100
         
-    def calculate_digit_streak(self, prices):
+    def calculate_even_dominance(self, prices, pip_size=None):
+        """Calculate even digit percentage"""
+        last_50 = prices[-50:]
+        if pip_size is None:
+            pip_size = infer_pip_size(last_50)
+            
+        digits = last_digits(last_50, pip_size)
+        return (np.count_nonzero(digits % 2 == 0) / len(last_50)) * 100
+        
+    def calculate_digit_streak(self, prices, pip_size=None):
         """Calculate consecutive same parity digits"""
         if len(prices) < 2:
             return 0
             
-        digits = [int(str(p)[-1]) for p in prices[-10:]]
-        streak = 1
-        last_parity = digits[-1] % 2
-        
-        for digit in reversed(digits[:-1]):
-            if digit % 2 == last_parity:
-                streak += 1
-            else:
-                break
-                
-        return streak
+        last_10 = prices[-10:]
+        if pip_size is None:
+            pip_size = infer_pip_size(last_10)
+            
+        parity = last_digits(last_10, pip_size) % 2
+        breaks = np.flatnonzero(parity != parity[-1])
+        if not len(breaks):
+            return len(parity)
+        return len(parity) - 1 - int(breaks[-1])
         
     def calculate_momentum(self, prices):
         """Calculate 5-tick momentum"""
@@ -0,0 +1,123 @@
+import numpy as np
+from strategies.rule_engine import FIELDS, RuleBook
+from strategies.thresholds import DEFAULT_THRESHOLDS
+from utils.candle_aggregator import TREND_FIELDS
+
+
+class ScoreMatrix:
+    """Latest indicators of every symbol in one 2-D array, scored in one pass
+
+    Column j of `values` is symbol j's latest snapshot, one row per
+    indicator; columns are added as symbols appear. score() writes a batch
+    of snapshots into their columns and runs the vector form of the
+    compiled bot rules over those columns at once, so scoring hundreds of
+    symbols costs a few NumPy calls instead of a Python pass per symbol.
+    The rules are the same ones ScoreCalculator evaluates per snapshot, so
+    the scores match calculate_all_scores.
+
+    Scoring returns ({symbol: scores}, candidates), candidates being the
+    symbols where some bot reached min_score (the only ones worth
+    checking for signals and trades).
+    """
+    def __init__(self, thresholds=None, capacity=64, rules=None):
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        self.min_score = self.thresholds['min_score']
+        self.rules = rules or RuleBook()
+        self.params = None
+        self.params_version = None
+        self.columns = {}  # symbol -> column
+        self.symbols = []  # column -> symbol
+        self.snapshots = []  # column -> latest snapshot
+        self.values = np.zeros((len(FIELDS), capacity))
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def column(self, symbol):
+        """Column of a symbol, added (growing the matrix) on first use"""
+        j = self.columns.get(symbol)
+        if j is None:
+            j = self.columns[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.snapshots.append(None)
+            if j == self.values.shape[1]:
+                values = np.zeros((len(FIELDS), 2 * j))
+                values[:, :j] = self.values
+                self.values = values
+        return j
+
+    def update(self, symbol, snapshot):
+        """Store a symbol's latest snapshot; returns its column"""
+        j = self.column(symbol)
+        self.values[:, j] = self.row(snapshot)
+        self.snapshots[j] = snapshot
+        return j
+
+    def row(self, snapshot):
+        """Matrix values of a snapshot, in FIELDS order"""
+        return (
+            snapshot['rsi_14'], snapshot['rsi_4'], snapshot['ema_5'], snapshot['ema_10'],
+            snapshot['ema_20'], snapshot['digit_dominance'], snapshot['digit_streak'],
+            snapshot['momentum'], snapshot['bollinger']['position'],
+            snapshot['even_dominance'], snapshot['last_digit'],
+            # Candle trends, 0 (unknown) in snapshots built without candles
+            *(snapshot.get(field, 0) for field in TREND_FIELDS)
+        )
+
+    def score(self, batch):
+        """Scores (and candidates) for a batch of {symbol: snapshot}"""
+        if not batch:
+            return {}, []
+
+        # All columns of the batch are written with one assignment
+        columns = [self.column(symbol) for symbol in batch]
+        snapshots = self.snapshots
+        for j, snapshot in zip(columns, batch.values()):
+            snapshots[j] = snapshot
+        self.values[:, columns] = np.array([self.row(snapshot) for snapshot in batch.values()]).T
+        return self.score_columns(columns)
+
+    def score_all(self):
+        """Scores of every symbol from its latest snapshot"""
+        return self.score_columns(range(len(self.symbols)))
+
+    def bound_params(self):
+        """Rule params with the thresholds applied, rebound after a reload"""
+        if self.params_version != self.rules.version:
+            self.params = self.rules.rules.bind(self.thresholds)
+            self.params_version = self.rules.version
+        return self.params
+
+    def score_columns(self, columns):
+        columns = list(columns)
+        if not columns:
+            return {}, []
+
+        rules = self.rules.rules
+        params = self.bound_params()
+        block = self.values[:, columns]
+        vector = rules.scores_vector(dict(zip(FIELDS, block)), params)
+
+        # One row of scores per symbol, in the rules' bot order; integers
+        # like the scalar path unless the rules award fractional points
+        bot_ids = list(vector)
+        dtype = np.int64 if rules.integer_scores else np.float64
+        table = np.zeros((len(columns), len(bot_ids)), dtype=dtype)
+        for i, bot_id in enumerate(bot_ids):
+            table[:, i] = vector[bot_id]
+        if bot_ids:
+            hits = (table.max(axis=1) >= self.min_score).tolist()
+        else:
+            hits = [False] * len(columns)
+        table = table.tolist()
+        fields = block.T.tolist()
+
+        results = {}
+        candidates = []
+        keys = bot_ids + FIELDS
+        for j, row, values, hit in zip(columns, table, fields, hits):
+            symbol = self.symbols[j]
+            if hit:
+                candidates.append(symbol)
+            results[symbol] = dict(zip(keys, row + values))
+        return results, candidates
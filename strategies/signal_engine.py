@@ -0,0 +1,179 @@
+import heapq
+import threading
+import time
+
+
+class Signal:
+    """One trade opportunity raised by a bot on a symbol"""
+    __slots__ = ('id', 'bot_id', 'bot_name', 'symbol', 'direction', 'score',
+                 'reason', 'scores', 'epoch', 'created', 'expires')
+
+    def __init__(self, bot_id, bot_name, symbol, direction, score, reason, scores,
+                 epoch, created, expires):
+        # Derived from the triggering tick, so the same signal always has
+        # the same id (across pushes, page loads and restarts)
+        self.id = f"{bot_id}-{symbol}-{direction}-{epoch}"
+        self.bot_id = bot_id
+        self.bot_name = bot_name
+        self.symbol = symbol
+        self.direction = direction
+        self.score = score
+        self.reason = reason
+        self.scores = scores
+        self.epoch = epoch
+        self.created = created
+        self.expires = expires
+
+    def to_dict(self):
+        """Dashboard representation"""
+        return {
+            'id': self.id,
+            'bot_id': self.bot_id,
+            'bot': f"Bot #{self.bot_id} - {self.bot_name}",
+            'market': self.symbol,
+            'direction': self.direction,
+            'score': self.score,
+            'reason': self.reason,
+            'expires': self.expires
+        }
+
+
+class SignalEngine:
+    """Turns per-tick bot scores into expiring, deduplicated signals
+
+    Active signals are indexed by id and by (bot, symbol, direction), so
+    raising, looking up and taking a signal are O(1); expiry pops a heap
+    ordered by expiry time. A condition that is still active only
+    refreshes its signal's score, and after a signal on a bot/symbol pair
+    no new one is raised there for `cooldown` seconds.
+
+    listeners(event, signal) are told about 'added' and 'removed' signals
+    (removed covers expired and taken ones). A signal being executed is
+    claimed: it stays listed but cannot be claimed again until the order
+    succeeds (take) or fails (release).
+    """
+    def __init__(self, ttl=30, cooldown=60, min_score=65):
+        self.ttl = ttl
+        self.cooldown = cooldown
+        self.min_score = min_score
+        self.lock = threading.Lock()
+        self.signals = {}  # id -> Signal
+        self.by_condition = {}  # (bot_id, symbol, direction) -> Signal
+        self.cooldown_until = {}  # (bot_id, symbol) -> time
+        self.expiry_heap = []  # (expires, id)
+        self.claimed = set()  # ids of signals with an order in flight
+        self.listeners = []
+        self.raised = 0
+        self.suppressed = 0
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def notify(self, events):
+        for event, signal in events:
+            for listener in self.listeners:
+                try:
+                    listener(event, signal)
+                except Exception as e:
+                    print(f"Signal listener error: {e}")
+
+    def process(self, bot, symbol, score, direction, scores, epoch, reason=None):
+        """Raise (or refresh) a signal for a bot whose conditions are met"""
+        if score < self.min_score or direction is None:
+            return None
+
+        now = time.time()
+        events = []
+        with self.lock:
+            self.expire(now, events)
+
+            condition = (bot.bot_id, symbol, direction)
+            active = self.by_condition.get(condition)
+            if active is not None:
+                # Same condition still open: keep the id, track the best score
+                self.suppressed += 1
+                if score > active.score:
+                    active.score = score
+                    active.scores = scores
+                    events.append(('added', active))
+                signal = active
+            elif now < self.cooldown_until.get((bot.bot_id, symbol), 0):
+                self.suppressed += 1
+                signal = None
+            else:
+                signal = Signal(
+                    bot.bot_id, bot.name, symbol, direction, score,
+                    reason or f"{bot.name}: {direction} on {symbol} scored {score}",
+                    scores, epoch, now, now + self.ttl
+                )
+                self.signals[signal.id] = signal
+                self.by_condition[condition] = signal
+                self.cooldown_until[(bot.bot_id, symbol)] = now + self.cooldown
+                heapq.heappush(self.expiry_heap, (signal.expires, signal.id))
+                self.raised += 1
+                events.append(('added', signal))
+
+        self.notify(events)
+        return signal
+
+    def expire(self, now, events):
+        """Drop signals past their expiry (caller holds the lock)"""
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            _, signal_id = heapq.heappop(heap)
+            signal = self.signals.get(signal_id)
+            if signal is not None:
+                self.discard(signal)
+                events.append(('removed', signal))
+
+    def discard(self, signal):
+        del self.signals[signal.id]
+        self.claimed.discard(signal.id)
+        condition = (signal.bot_id, signal.symbol, signal.direction)
+        if self.by_condition.get(condition) is signal:
+            del self.by_condition[condition]
+
+    def expire_now(self):
+        """Expire due signals (e.g. from a timer when no ticks arrive)"""
+        events = []
+        with self.lock:
+            self.expire(time.time(), events)
+        self.notify(events)
+
+    def get(self, signal_id):
+        """Active signal by id, or None"""
+        signal = self.signals.get(signal_id)
+        if signal is None or signal.expires <= time.time():
+            return None
+        return signal
+
+    def claim(self, signal_id):
+        """Reserve an active signal for execution; None if gone or already claimed"""
+        with self.lock:
+            signal = self.signals.get(signal_id)
+            if signal is None or signal.expires <= time.time() or signal_id in self.claimed:
+                return None
+            self.claimed.add(signal_id)
+        return signal
+
+    def release(self, signal_id):
+        """Make a claimed signal executable again (its order did not go through)"""
+        with self.lock:
+            self.claimed.discard(signal_id)
+
+    def take(self, signal_id):
+        """Remove and return an active signal so it is executed only once"""
+        with self.lock:
+            signal = self.signals.get(signal_id)
+            if signal is None or signal.expires <= time.time():
+                return None
+            self.discard(signal)
+        self.notify([('removed', signal)])
+        return signal
+
+    def active(self):
+        """Unexpired signals, best score first"""
+        now = time.time()
+        signals = [s for s in list(self.signals.values()) if s.expires > now]
+        signals.sort(key=lambda s: s.score, reverse=True)
+        return signals
@@ -0,0 +1,35 @@
+import json
+import os
+
+# Tunable entry thresholds. RSI levels are symmetric around 50 (a low level
+# of 30 also means a high level of 70).
+DEFAULT_THRESHOLDS = {
+    'rsi14_extreme': 30,     # Bot #3: RSI(14) below this or above 100 - this
+    'rsi4_extreme': 33,      # Bot #3: RSI(4) entry level (RISE below, FALL above 100 - this)
+    'ema_separation': 0.01,  # Bot #4: first EMA(5/10) separation tier, tiers at 1x/2x/3x/5x
+    'digit_dominance': 60,   # Bot #5: first high-digit tier, tiers at +0/+5/+15
+    'min_score': 65          # BotManager: minimum bot score to trade
+}
+
+# Digit contract barriers, shared by the backtester and the live bots:
+# over 4 wins on 5-9, under 5 wins on 0-4
+OVER_BARRIER = 4
+UNDER_BARRIER = 5
+
+def load_thresholds(path=None):
+    """Defaults overridden by a JSON thresholds file (e.g. from the optimizer)"""
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    if not path or not os.path.exists(path):
+        return thresholds
+
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not load thresholds from {path}: {e}")
+        return thresholds
+
+    # The optimizer writes {"thresholds": {...}, ...}; a flat dict also works
+    data = data.get('thresholds', data)
+    thresholds.update({k: v for k, v in data.items() if k in DEFAULT_THRESHOLDS})
+    return thresholds
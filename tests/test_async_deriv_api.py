@@ -0,0 +1,167 @@
+"""AsyncDerivAPI against utils.deriv_simulator as a local Deriv stand-in"""
+import asyncio
+import threading
+import time
+import pytest
+from utils.async_deriv_api import AsyncDerivAPI
+from utils.deriv_api import DerivAPIError
+from utils.deriv_simulator import DerivSimulator
+
+SYMBOLS = ['V75', 'V100', 'V50']
+
+
+def wait_until(predicate, timeout=10):
+    """Poll predicate until true; fails the test on timeout"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.02)
+    pytest.fail("Timed out waiting for condition")
+
+
+class SimulatorThread:
+    """DerivSimulator on its own loop and an ephemeral port"""
+    def __init__(self):
+        self.simulator = DerivSimulator(port=0, rate=60, seed=7,
+                                        symbols={symbol: 0.5 for symbol in SYMBOLS})
+        self.loop = None
+        self.task = None
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=lambda: asyncio.run(self.main()), daemon=True)
+
+    async def main(self):
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.create_task(self.simulator.serve())
+        while self.simulator.server is None:
+            await asyncio.sleep(0.01)
+        self.ready.set()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+    def start(self):
+        self.thread.start()
+        assert self.ready.wait(5)
+        return self
+
+    @property
+    def url(self):
+        port = self.simulator.server.sockets[0].getsockname()[1]
+        return f"ws://localhost:{port}"
+
+    def drop_clients(self):
+        """Close every client connection from the server side"""
+        async def close_all():
+            # Every client subscribes to ticks, so this finds each connection
+            connections = set().union(*self.simulator.subscribers.values())
+            for ws in connections:
+                await ws.close()
+        asyncio.run_coroutine_threadsafe(close_all(), self.loop).result(5)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.task.cancel)
+        self.thread.join(5)
+
+
+@pytest.fixture
+def simulator():
+    sim = SimulatorThread().start()
+    yield sim
+    sim.stop()
+
+
+@pytest.fixture
+def client(simulator):
+    api = AsyncDerivAPI('1', endpoint=simulator.url, symbols=SYMBOLS, tick_capacity=200)
+    api.reconnect_min_delay = api.reconnect_delay = 0.05
+    api.connect()
+    wait_until(lambda: api.connected)
+    yield api
+    api.disconnect()
+
+
+def call(api, coroutine, timeout=10):
+    """Run a coroutine on the client's loop from the test thread"""
+    return asyncio.run_coroutine_threadsafe(coroutine, api.loop).result(timeout)
+
+
+def test_responses_are_matched_to_requests_by_req_id(client):
+    wait_until(lambda: all(len(client.tick_data.get(s, ())) >= 5 for s in SYMBOLS))
+
+    # Pipelined requests, answered out of order or not, each get their own response
+    futures = {symbol: client.send_request({'ticks_history': symbol, 'end': 'latest',
+                                            'count': 3, 'style': 'ticks'})
+               for symbol in SYMBOLS * 3}
+    for symbol, future in futures.items():
+        response = future.result(5)
+        assert response['echo_req']['ticks_history'] == symbol
+        assert len(response['history']['prices']) == 3
+    assert not client.pending_requests
+
+
+def test_error_response_fails_only_its_request(client):
+    bad = client.send_request({'ticks_history': 'NOPE', 'end': 'latest', 'count': 1})
+    good = client.send_request({'ticks_history': 'V75', 'end': 'latest', 'count': 1})
+
+    with pytest.raises(DerivAPIError) as error:
+        bad.result(5)
+    assert error.value.code == 'InvalidSymbol'
+    assert good.result(5)['echo_req']['ticks_history'] == 'V75'
+
+
+def test_request_async_awaits_the_response(client):
+    response = call(client, client.request_async({'active_symbols': 'brief'}))
+    assert sorted(s['symbol'] for s in response['active_symbols']) == sorted(SYMBOLS)
+
+
+def test_subscriptions_stream_ticks_to_buffers_and_subscribers(client):
+    received = []
+
+    async def subscriber(data):
+        if 'tick' in data:
+            received.append(data['tick']['symbol'])
+
+    client.add_subscriber(subscriber)
+    start = {symbol: len(client.tick_data.get(symbol, ())) for symbol in SYMBOLS}
+    wait_until(lambda: set(received) == set(SYMBOLS))
+    wait_until(lambda: all(len(client.tick_data[s]) > start[s] for s in SYMBOLS))
+
+    for symbol in SYMBOLS:
+        epochs = client.tick_data[symbol].epochs()
+        assert (epochs[1:] > epochs[:-1]).all()
+
+
+def test_slow_subscriber_does_not_stall_tick_intake(client):
+    def slow(data):
+        time.sleep(0.5)
+
+    wait_until(lambda: len(client.tick_data.get('V75', ())) >= 1)
+    client.add_subscriber(slow)
+    before = len(client.tick_data['V75'])
+    # At 20 ticks/sec per symbol a stalled processor would add at most ~2
+    wait_until(lambda: len(client.tick_data['V75']) >= before + 10, timeout=3)
+
+
+def test_reconnects_and_resumes_ticks_without_duplicates(simulator, client):
+    wait_until(lambda: len(client.tick_data.get('V75', ())) >= 5)
+
+    simulator.drop_clients()
+    wait_until(lambda: client.reconnects >= 1 and client.connected)
+
+    last_epoch = client.tick_data['V75'].last_epoch
+    wait_until(lambda: client.tick_data['V75'].last_epoch > last_epoch)
+    epochs = client.tick_data['V75'].epochs()
+    assert (epochs[1:] > epochs[:-1]).all()
+
+
+
+def test_account_streams_start_after_authorize(simulator):
+    api = AsyncDerivAPI('1', api_token='token', endpoint=simulator.url, symbols=SYMBOLS)
+    api.connect()
+    try:
+        wait_until(lambda: api.account.balance is not None)
+        assert api.account.balance == simulator.simulator.balance
+    finally:
+        api.disconnect()
@@ -0,0 +1,32 @@
+"""Daily totals of the trade journal"""
+from utils.logger import TradeLogger
+
+
+def trade(success, stake=10.0, contract_id=None):
+    result = {'success': success}
+    if contract_id:
+        result.update(contract_id=contract_id, buy_price=stake, payout=stake * 1.95)
+    else:
+        result['reason'] = 'Buy failed: InsufficientBalance'
+    return {'bot_id': 3, 'symbol': 'V75', 'stake': stake, 'status': 'completed', 'result': result}
+
+
+def test_failed_orders_are_journaled_but_not_counted(tmp_path):
+    url = f"sqlite:///{tmp_path / 'trades.db'}"
+    journal = TradeLogger(url)
+    journal.log_trade(trade(True, 10.0, contract_id=1))
+    journal.log_trade(trade(False, 25.0))
+    journal.settle_trade(1, -10.0)
+
+    stats = journal.today_stats()
+    assert stats['trades'] == 1
+    assert stats['staked'] == 10.0
+    assert journal.today_pnl() == -10.0
+    assert [t['status'] for t in journal.get_today_trades()] == ['settled', 'failed']
+    journal.close()
+
+    # A restart seeds the same totals from the database
+    reopened = TradeLogger(url)
+    stats = reopened.today_stats()
+    assert (stats['trades'], stats['staked'], stats['pnl']) == (1, 10.0, -10.0)
+    reopened.close()
@@ -0,0 +1,85 @@
+"""Rate limiting, in-flight caps and result delivery of the order queue"""
+import threading
+import time
+import pytest
+from utils.order_queue import OrderQueue, TokenBucket
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.005)
+    pytest.fail("Timed out waiting for condition")
+
+
+def test_token_bucket_waits_when_empty():
+    bucket = TokenBucket(rate=50, capacity=2)
+    assert bucket.acquire(2) == 0.0
+    started = time.monotonic()
+    waited = bucket.acquire(2)
+    assert waited > 0
+    assert time.monotonic() - started >= 0.03
+
+
+def test_token_bucket_rejects_requests_above_capacity():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=5, capacity=1).acquire(2)
+
+
+def test_burst_below_request_cost_is_rejected():
+    with pytest.raises(ValueError):
+        OrderQueue(workers=0, burst=1, request_cost=2)
+
+
+def test_queue_full_while_the_bucket_is_empty():
+    # One worker and a bucket that refills every ~100 s: after the first
+    # order the worker is stuck throttling and later orders pile up
+    orders = OrderQueue(workers=1, rate=0.02, burst=2, max_per_bot=10, max_per_symbol=10,
+                        max_queued=1)
+    first = orders.submit(lambda: 'first', 1, 'V75')
+    assert first.result(timeout=5) == 'first'
+
+    throttled = orders.submit(lambda: 'throttled', 1, 'V75')
+    wait_until(lambda: orders.queue.empty())  # Taken by the worker, waiting for tokens
+    queued = orders.submit(lambda: 'queued', 1, 'V75')
+    rejected = orders.submit(lambda: 'rejected', 1, 'V75')
+
+    assert rejected.result(timeout=1) == {'success': False, 'reason': 'Order queue is full'}
+    assert not throttled.done() and not queued.done()
+    assert orders.rejected == 1
+
+
+def test_in_flight_caps_reject_per_bot_and_symbol():
+    release = threading.Event()
+    orders = OrderQueue(workers=2, rate=1000, burst=100, max_per_bot=1, max_per_symbol=1)
+    running = orders.submit(release.wait, 1, 'V75')
+
+    same_bot = orders.submit(lambda: None, 1, 'V100').result(timeout=1)
+    same_symbol = orders.submit(lambda: None, 2, 'V75').result(timeout=1)
+    assert same_bot == {'success': False, 'reason': 'Bot 1 already has 1 orders in flight'}
+    assert same_symbol == {'success': False, 'reason': 'V75 already has 1 orders in flight'}
+
+    release.set()
+    assert running.result(timeout=5) is True
+    wait_until(lambda: orders.in_flight == 0)
+    assert orders.submit(lambda: 'ok', 1, 'V75').result(timeout=5) == 'ok'
+    orders.stop()
+
+
+def test_worker_exception_fails_the_future_and_frees_the_slot():
+    orders = OrderQueue(workers=1, rate=1000, burst=100)
+
+    def buy():
+        raise RuntimeError('connection lost')
+
+    future = orders.submit(buy, 1, 'V75')
+    with pytest.raises(RuntimeError, match='connection lost'):
+        future.result(timeout=5)
+
+    wait_until(lambda: orders.in_flight == 0)
+    assert orders.failed == 1
+    assert orders.in_flight_bot[1] == 0 and orders.in_flight_symbol['V75'] == 0
+    assert orders.submit(lambda: 'next', 1, 'V75').result(timeout=5) == 'next'
+    orders.stop()
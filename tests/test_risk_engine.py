@@ -0,0 +1,102 @@
+"""Exposure bookkeeping and daily limits of the risk engine"""
+from config import Config
+from utils.risk_engine import RiskEngine
+
+# Config: 2% max stake, 5% open exposure per symbol/bot, 10% stop loss, 8% target
+
+
+def engine(balance=1000.0, daily_pnl=0.0):
+    return RiskEngine(Config, balance=balance, daily_pnl=daily_pnl)
+
+
+def test_unknown_balance_halts_trading():
+    risk = RiskEngine(Config)
+    assert risk.check_trade(3, 'V75', 1.0) == 'Balance unknown'
+    assert risk.reserve(3, 'V75', 1.0) == (None, 'Balance unknown')
+    assert risk.limits_reached()
+
+    risk.update_balance(1000)
+    assert risk.check_trade(3, 'V75', 1.0) is None
+
+
+def test_reserve_then_release_on_a_failed_buy():
+    risk = engine()
+    ticket, reason = risk.reserve(3, 'V75', 20.0)
+    assert reason is None
+    assert risk.open_exposure == 20.0
+    assert risk.symbol_exposure['V75'] == 20.0
+    assert risk.bot_exposure[3] == 20.0
+
+    risk.release(ticket)
+    assert risk.open_exposure == 0.0
+    assert risk.symbol_exposure['V75'] == 0.0
+    assert risk.bot_exposure[3] == 0.0
+    assert not risk.positions
+
+    # Releasing again is harmless
+    risk.release(ticket)
+    assert risk.open_exposure == 0.0
+
+
+def test_reserve_confirm_settle_frees_the_exposure():
+    risk = engine()
+    ticket, _ = risk.reserve(3, 'V75', 20.0)
+    risk.confirm(ticket, 1234)
+    assert '1234' in risk.positions
+
+    assert risk.settle(1234, 19.0)
+    assert risk.open_exposure == 0.0
+    assert risk.daily_pnl == 19.0
+    # A repeated settlement (stream replay) is ignored
+    assert not risk.settle('1234', 19.0)
+    assert risk.daily_pnl == 19.0
+
+
+def test_settling_a_contract_never_reserved():
+    risk = engine()
+    ticket, _ = risk.reserve(3, 'V75', 20.0)
+
+    # E.g. bought from another session: its PnL counts, exposure is untouched
+    assert risk.settle(999, -5.0)
+    assert risk.daily_pnl == -5.0
+    assert risk.open_exposure == 20.0
+    assert ticket in risk.positions
+
+
+def test_exposure_limits_reject_reservations():
+    risk = engine()
+    assert risk.check_trade(3, 'V75', 25.0).startswith('Stake exceeds')
+    assert risk.reserve(3, 'V75', 20.0)[1] is None
+    assert risk.reserve(4, 'V75', 20.0)[1] is None
+    # 40 open on V75, the limit is 50
+    assert risk.reserve(5, 'V75', 20.0)[1] == 'Open exposure limit reached for V75'
+    assert risk.reserve(3, 'V100', 20.0)[1] is None
+    assert risk.reserve(3, 'V50', 20.0)[1] == 'Open exposure limit reached for bot 3'
+
+
+def test_halts_when_the_loss_floor_is_crossed():
+    risk = engine()
+    assert risk.loss_floor == -100.0
+
+    risk.settle(1, -60.0)
+    assert risk.halted is None
+    risk.settle(2, -40.0)
+    assert risk.halted == 'Daily stop loss reached'
+    assert risk.limits_reached()
+    assert risk.check_trade(3, 'V75', 1.0) == 'Daily stop loss reached'
+    assert risk.reserve(3, 'V75', 1.0) == (None, 'Daily stop loss reached')
+
+
+def test_open_stakes_count_against_the_stop_loss():
+    risk = engine(daily_pnl=-85.0)
+    assert risk.reserve(3, 'V75', 10.0)[1] is None
+    # -85 - 10 open - 10 new would pass the -100 floor
+    assert risk.check_trade(4, 'V100', 10.0) == 'Trade could breach the daily stop loss'
+
+
+def test_seeded_pnl_and_profit_target_halt():
+    assert engine(daily_pnl=-100.0).halted == 'Daily stop loss reached'
+    risk = engine(daily_pnl=70.0)
+    assert risk.halted is None
+    risk.settle(1, 10.0)
+    assert risk.halted == 'Daily profit target reached'
@@ -0,0 +1,158 @@
+"""Rule compilation, validation, hot reload and scalar/vector parity"""
+import json
+import os
+import numpy as np
+import pytest
+from strategies.backtest import indicator_series
+from strategies.rule_engine import (FIELDS, RuleBook, RuleError, RuleSet, compile_expression,
+                                    default_rules)
+from strategies.thresholds import DEFAULT_THRESHOLDS
+
+PARAMS = dict(DEFAULT_THRESHOLDS, streak_min=4)
+
+CONTRACT_CODES = {'RISE': 1, 'FALL': 2, 'DIGITOVER': 3, 'DIGITUNDER': 4,
+                  'DIGITEVEN': 5, 'DIGITODD': 6}
+
+
+def bot(bot_id=1, when='rsi_14 < 30', points=50, contract='RISE'):
+    return {'id': bot_id, 'score': [{'when': when, 'points': points}],
+            'entries': [{'when': when, 'contract': contract}]}
+
+
+def write_rules(path, *bots):
+    with open(path, 'w') as f:
+        json.dump({'bots': list(bots)}, f)
+
+
+@pytest.mark.parametrize('expression', [
+    "__import__('os').system('true')",     # calls outside the whitelist
+    "rsi_14.__class__ is int",             # attribute access other than params.<name>
+    "ind['rsi_14'] < 30",                  # subscripts
+    "[x for x in (1, 2)]",                 # comprehensions
+    "(lambda: True)()",                    # lambdas
+    "rsi_14 < 30 if True else False",      # conditional expressions
+    "rsi_14 in (1, 2)",                    # membership operators
+    "rsi_14 ** 2 > 900",                   # operators not in OPERATORS
+    "'a' < 'b'",                           # string constants
+    "abs(rsi_14, 1) > 3",                  # wrong arity
+    "even(last_digit, 2)",
+    "abs(x=rsi_14) > 3",                   # keyword arguments
+])
+def test_disallowed_syntax_is_rejected(expression):
+    with pytest.raises(RuleError):
+        compile_expression(expression, PARAMS, vector=False)
+
+
+@pytest.mark.parametrize('expression', [
+    'unknown < 3',           # neither an indicator nor a param
+    'params.rsi_14 < 3',     # params.<name> must be a param
+    'os.sep == 1',           # attributes of anything but params
+])
+def test_unknown_names_are_rejected(expression):
+    with pytest.raises(RuleError):
+        compile_expression(expression, PARAMS, vector=True)
+
+
+@pytest.mark.parametrize('expression', [
+    'rsi_14', 'rsi_14 + 1', '1', 'not rsi_14', 'rsi_14 < 30 and momentum', 'abs(momentum)'
+])
+def test_non_boolean_conditions_are_rejected(expression):
+    with pytest.raises(RuleError, match='condition must be'):
+        compile_expression(expression, PARAMS, vector=False)
+
+
+@pytest.mark.parametrize('expression', [
+    'True', 'rsi_14 < 30', '20 < rsi_14 < 30', 'not rsi_14 > 50',
+    'even(last_digit)', 'odd(last_digit) or rsi_14 > params.rsi14_extreme'
+])
+def test_boolean_conditions_compile(expression):
+    compile_expression(expression, PARAMS, vector=False)
+    compile_expression(expression, PARAMS, vector=True)
+
+
+def test_compiled_code_has_no_builtins():
+    fn = compile_expression('rsi_14 < 30', PARAMS, vector=False)
+    assert set(fn.__globals__['__builtins__']) == {'abs', 'min', 'max'}
+
+
+def test_invalid_rules_files_are_rejected():
+    with pytest.raises(RuleError):
+        RuleSet({'bots': [bot(contract='DIGITMATCH')]})
+    with pytest.raises(RuleError):
+        RuleSet({'bots': [bot(1), bot(1)]})
+    with pytest.raises(RuleError):
+        RuleSet({'bots': [{'score': []}]})
+    with pytest.raises(RuleError):
+        RuleSet({})
+
+
+def test_missing_rules_file_raises(tmp_path):
+    with pytest.raises(RuleError):
+        RuleBook(str(tmp_path / 'missing.json'))
+
+
+def test_rulebook_reloads_when_the_file_changes(tmp_path):
+    path = str(tmp_path / 'rules.json')
+    write_rules(path, bot(1))
+    book = RuleBook(path, check_interval=0)
+    assert list(book.rules.bots) == [1]
+
+    # Unchanged file: nothing to do
+    assert not book.refresh()
+
+    write_rules(path, bot(1), bot(2, when='rsi_14 > 70', contract='FALL'))
+    os.utime(path, (book.mtime + 5, book.mtime + 5))
+    assert book.refresh()
+    assert sorted(book.rules.bots) == [1, 2]
+    assert book.version == 2
+
+
+def test_rulebook_keeps_the_previous_rules_on_a_bad_file(tmp_path):
+    path = str(tmp_path / 'rules.json')
+    write_rules(path, bot(1))
+    book = RuleBook(path, check_interval=0)
+
+    write_rules(path, bot(1, when='rsi_14 + 1'))
+    os.utime(path, (book.mtime + 5, book.mtime + 5))
+    assert not book.refresh()
+    assert list(book.rules.bots) == [1]
+    assert book.version == 1
+
+
+def test_rulebook_checks_at_most_every_interval(tmp_path):
+    path = str(tmp_path / 'rules.json')
+    write_rules(path, bot(1))
+    book = RuleBook(path, check_interval=3600)
+
+    write_rules(path, bot(2))
+    os.utime(path, (book.mtime + 5, book.mtime + 5))
+    assert not book.refresh()
+    assert list(book.rules.bots) == [1]
+
+
+def test_scalar_and_vector_forms_agree_on_the_bundled_rules():
+    rng = np.random.default_rng(7)
+    prices = np.round(1000 + np.cumsum(rng.normal(0, 0.5, 5000)), 2)
+    ind = {field: series for field, series in indicator_series(prices, 2).items()
+           if field in FIELDS}
+    rules = default_rules()
+    params = rules.bind()
+
+    scores = rules.scores_vector(ind, params)
+    entries = rules.entries_vector(ind, params, CONTRACT_CODES)
+    for i in range(20, len(prices), 7):
+        view = {field: ind[field][i].item() for field in FIELDS}
+        for bot_id, score in rules.scores(view, params).items():
+            assert score == scores[bot_id][i]
+            contract = rules.entry(bot_id, view, params)
+            assert CONTRACT_CODES.get(contract, 0) == entries[bot_id][i]
+
+
+def test_fractional_points_are_kept_in_both_forms():
+    rules = RuleSet({'bots': [{'id': 1, 'score': [{'when': 'rsi_14 < 30', 'points': 12.5},
+                                                  {'when': 'True', 'points': 0.25}]}]})
+    assert not rules.integer_scores
+    params = rules.bind()
+    ind = {'rsi_14': np.array([20.0, 40.0])}
+    assert rules.scores({'rsi_14': 20.0}, params)[1] == 12.75
+    assert rules.scores_vector(ind, params)[1].tolist() == [12.75, 0.25]
@@ -0,0 +1,108 @@
+"""Signal lifecycle when a signal is executed from the dashboard"""
+import time
+from concurrent.futures import Future
+from bots.bot_manager import BotManager
+from strategies.signal_engine import SignalEngine
+from utils.risk_engine import RiskEngine
+from config import Config
+
+
+class Bot:
+    bot_id = 3
+    name = 'Berlin X9'
+
+
+class Manager(BotManager):
+    """BotManager around a SignalEngine, with submit_trade under test control"""
+    def __init__(self, ttl=30):
+        self.signals = SignalEngine(ttl=ttl, cooldown=0, min_score=65)
+        self.bots = {3: Bot()}
+        self.risk = RiskEngine(Config, balance=1000.0)
+        self.orders = []
+
+    def submit_trade(self, bot, symbol, stake, scores, received=None):
+        future = Future()
+        self.orders.append((symbol, stake, future))
+        return future
+
+
+def raise_signal(manager):
+    return manager.signals.process(Bot(), 'V75', 80, 'RISE', {3: 80}, epoch=1)
+
+
+def test_successful_order_takes_the_signal():
+    manager = Manager()
+    signal = raise_signal(manager)
+    removed = []
+    manager.signals.add_listener(lambda event, s: removed.append(s.id) if event == 'removed' else None)
+
+    future = manager.execute_signal(signal.id)
+    assert manager.signals.get(signal.id) is signal  # Still listed while in flight
+
+    manager.orders[0][2].set_result({'success': True, 'contract_id': 1})
+    assert future.result() == {'success': True, 'contract_id': 1}
+    assert manager.signals.get(signal.id) is None
+    assert removed == [signal.id]
+
+
+def test_failed_order_keeps_the_signal():
+    manager = Manager()
+    signal = raise_signal(manager)
+
+    future = manager.execute_signal(signal.id)
+    manager.orders[0][2].set_result({'success': False, 'reason': 'Order queue is full'})
+    assert future.result()['reason'] == 'Order queue is full'
+    assert manager.signals.get(signal.id) is signal
+
+    # ... and it can be executed again
+    manager.execute_signal(signal.id)
+    assert len(manager.orders) == 2
+
+
+def test_order_exception_keeps_the_signal():
+    manager = Manager()
+    signal = raise_signal(manager)
+
+    manager.execute_signal(signal.id)
+    manager.orders[0][2].set_exception(RuntimeError('Buy failed'))
+    assert manager.signals.get(signal.id) is signal
+    assert signal.id not in manager.signals.claimed
+
+
+def test_double_click_is_rejected_while_the_order_runs():
+    manager = Manager()
+    signal = raise_signal(manager)
+
+    manager.execute_signal(signal.id)
+    second = manager.execute_signal(signal.id).result()
+    assert second == {'success': False, 'reason': 'Signal is already being executed'}
+    assert len(manager.orders) == 1
+
+
+def test_unknown_balance_is_reported_and_releases_the_claim():
+    manager = Manager()
+    manager.risk = RiskEngine(Config)
+    signal = raise_signal(manager)
+
+    result = manager.execute_signal(signal.id).result()
+    assert result == {'success': False, 'reason': 'Balance unknown, cannot size the stake'}
+    assert not manager.orders
+    assert signal.id not in manager.signals.claimed
+
+
+def test_claimed_signal_still_expires():
+    manager = Manager(ttl=0.05)
+    signal = raise_signal(manager)
+    manager.execute_signal(signal.id)
+    assert signal.id in manager.signals.claimed
+
+    time.sleep(0.06)
+    manager.signals.expire_now()
+    assert manager.signals.get(signal.id) is None
+    assert signal.id not in manager.signals.claimed
+
+    # The order finishing afterwards neither revives nor breaks anything
+    manager.orders[0][2].set_result({'success': False, 'reason': 'Buy failed'})
+    assert manager.signals.get(signal.id) is None
+    result = manager.execute_signal(signal.id).result()
+    assert result == {'success': False, 'reason': 'Signal expired or not found'}
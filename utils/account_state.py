@@ -0,0 +1,112 @@
+import threading
+
+
+class AccountState:
+    """Cached account state kept current by Deriv's streams
+
+    DerivAPI feeds it the authorize, balance, buy and
+    proposal_open_contract messages. Readers get the latest values
+    without a network call; listeners(event, payload) are told about each
+    change, with event one of 'balance', 'contract' (opened or updated)
+    and 'settled'.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.listeners = []
+        self.balance = None
+        self.currency = None
+        self.loginid = None
+        self.open_contracts = {}  # contract_id -> latest contract update
+        self.settled_ids = set()
+        self.settled_pnl = 0.0
+        self.settled_count = 0
+        self.version = 0
+
+    def add_listener(self, listener):
+        """Register listener(event, payload), called on the reader thread"""
+        self.listeners.append(listener)
+
+    def notify(self, event, payload):
+        for listener in self.listeners:
+            try:
+                listener(event, payload)
+            except Exception as e:
+                print(f"Account listener error: {e}")
+
+    def update(self, data):
+        """Apply one API message; returns True if it changed the state"""
+        if 'error' in data:
+            return False
+
+        msg_type = data.get('msg_type')
+        if msg_type == 'authorize':
+            info = data['authorize']
+            self.loginid = info.get('loginid')
+            return self.set_balance(info['balance'], info.get('currency'))
+        if msg_type == 'balance':
+            info = data['balance']
+            return self.set_balance(info['balance'], info.get('currency'))
+        if msg_type == 'buy':
+            buy = data['buy']
+            self.set_balance(buy['balance_after'])
+            return self.update_contract({
+                'contract_id': buy['contract_id'],
+                'buy_price': buy['buy_price'],
+                'payout': buy['payout'],
+                'purchase_time': buy.get('start_time'),
+                'longcode': buy.get('longcode'),
+                'is_sold': 0
+            })
+        if msg_type == 'proposal_open_contract':
+            contract = data['proposal_open_contract']
+            # An empty update acknowledges a subscription with nothing open
+            if contract.get('contract_id') is None:
+                return False
+            return self.update_contract(contract)
+        return False
+
+    def set_balance(self, balance, currency=None):
+        balance = float(balance)
+        with self.lock:
+            if currency:
+                self.currency = currency
+            if balance == self.balance:
+                return False
+            self.balance = balance
+            self.version += 1
+        self.notify('balance', balance)
+        return True
+
+    def update_contract(self, contract):
+        contract_id = str(contract['contract_id'])
+        with self.lock:
+            if contract_id in self.settled_ids:
+                return False
+
+            if contract.get('is_sold'):
+                self.open_contracts.pop(contract_id, None)
+                self.settled_ids.add(contract_id)
+                self.settled_pnl += float(contract.get('profit', 0))
+                self.settled_count += 1
+                event = 'settled'
+            else:
+                previous = self.open_contracts.get(contract_id, {})
+                contract = self.open_contracts[contract_id] = dict(previous, **contract)
+                event = 'contract'
+            self.version += 1
+
+        self.notify(event, contract)
+        return True
+
+    def snapshot(self):
+        """Consistent copy of the cached state"""
+        with self.lock:
+            return {
+                'balance': self.balance,
+                'currency': self.currency,
+                'loginid': self.loginid,
+                'open_contracts': list(self.open_contracts.values()),
+                'settled_pnl': self.settled_pnl,
+                'settled_count': self.settled_count,
+                'version': self.version
+            }
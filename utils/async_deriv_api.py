@@ -0,0 +1,173 @@
+import asyncio
+import inspect
+import json
+import threading
+import time
+import websockets
+from utils.deriv_api import DerivAPI, DerivAPIError
+
+class AsyncDerivAPI(DerivAPI):
+    """asyncio Deriv client with the same public surface as DerivAPI
+
+    The reader task only parses messages and puts them on the inbox. A
+    single processor task updates tick buffers/indicators and resolves
+    requests, then hands each message to every subscriber through its own
+    bounded queue, so a slow subscriber only delays itself. When a
+    subscriber's queue is full the oldest message is dropped.
+
+    Plain-function subscribers run in the default executor; coroutine
+    functions are awaited on the loop.
+    """
+    def __init__(self, app_id, api_token=None, queue_size=1000, **kwargs):
+        super().__init__(app_id, api_token, **kwargs)
+        self.queue_size = queue_size
+        self.loop = None
+        self.inbox = None
+        self.outbox = None
+        self.subscriber_queues = {}
+        self.subscriber_tasks = []
+        self.dropped_messages = {}
+        self.thread = None
+
+    def connect(self):
+        """Run the client on its own event loop in a daemon thread"""
+        self.thread = threading.Thread(target=lambda: asyncio.run(self.run()))
+        self.thread.daemon = True
+        self.thread.start()
+
+    async def run(self):
+        """Keep a connection open until disconnect(), with backoff and heartbeat"""
+        self.loop = asyncio.get_running_loop()
+        self.inbox = asyncio.Queue(self.queue_size)
+        self.outbox = asyncio.Queue()
+        self.should_run = True
+
+        for subscriber in self.subscribers:
+            self.start_dispatcher(subscriber)
+        processor = asyncio.create_task(self.processor())
+        heartbeat = asyncio.create_task(self.heartbeat())
+
+        try:
+            while self.should_run:
+                await self.run_connection()
+                if self.should_run:
+                    await self.loop.run_in_executor(None, self.wait_before_reconnect)
+        finally:
+            processor.cancel()
+            heartbeat.cancel()
+            for task in self.subscriber_tasks:
+                task.cancel()
+
+    async def run_connection(self):
+        """Serve one connection until its socket closes"""
+        try:
+            async with websockets.connect(self.url) as ws:
+                self.ws = ws
+                self.on_open(ws)
+
+                writer = asyncio.create_task(self.writer(ws))
+                try:
+                    # The reader finishes when the socket closes
+                    await self.reader(ws)
+                finally:
+                    writer.cancel()
+        except Exception as e:
+            self.on_error(self.ws, e)
+        finally:
+            # Messages queued for the dead socket are answered by failures
+            while not self.outbox.empty():
+                self.outbox.get_nowait()
+            self.on_close(self.ws, None, None)
+
+    async def heartbeat(self):
+        """Ping when the socket goes quiet and drop it if the ping times out"""
+        while True:
+            await asyncio.sleep(self.ping_interval / 2)
+            if not self.connected:
+                continue
+            if time.monotonic() - self.last_message_time < self.ping_interval:
+                continue
+
+            try:
+                await self.request_async({"ping": 1}, self.ping_timeout)
+            except Exception as e:
+                print(f"Heartbeat failed ({e!r}), dropping connection")
+                self.drop_connection()
+
+    def drop_connection(self):
+        """Close the socket from any thread"""
+        if self.ws is not None and self.loop is not None and not self.loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self.ws.close(), self.loop)
+
+    async def reader(self, ws):
+        """Parse incoming messages and enqueue them, nothing else"""
+        async for message in ws:
+            received = time.perf_counter_ns()
+            await self.inbox.put((json.loads(message), received))
+
+    async def writer(self, ws):
+        """Send queued outbound messages"""
+        while True:
+            message = await self.outbox.get()
+            await ws.send(message)
+
+    async def processor(self):
+        """Apply queued messages to tick state and fan them out"""
+        while True:
+            data, received = await self.inbox.get()
+            try:
+                self.handle_message(data, received)
+            except Exception as e:
+                print(f"Message handling error: {e}")
+
+    def send_message(self, message):
+        """Queue one message for the writer task (safe from any thread)"""
+        if self.loop is None or self.loop.is_closed():
+            raise DerivAPIError("Not connected")
+        self.loop.call_soon_threadsafe(self.outbox.put_nowait, json.dumps(message))
+
+    async def request_async(self, request, timeout=10):
+        """Send a request and await its response"""
+        future = asyncio.wrap_future(self.send_request(request))
+        return await asyncio.wait_for(future, timeout)
+
+    async def buy_contract_async(self, symbol, amount, contract_type, duration,
+                                 duration_unit='t', timeout=10, barrier=None):
+        """Pipelined proposal -> buy, awaited with a timeout"""
+        future = asyncio.wrap_future(
+            self.buy_contract(symbol, amount, contract_type, duration, duration_unit, barrier)
+        )
+        return await asyncio.wait_for(future, timeout)
+
+    def add_subscriber(self, subscriber):
+        """Register subscriber(data) with its own bounded queue"""
+        super().add_subscriber(subscriber)
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.start_dispatcher, subscriber)
+
+    def start_dispatcher(self, subscriber):
+        queue = asyncio.Queue(self.queue_size)
+        self.subscriber_queues[subscriber] = queue
+        self.dropped_messages[subscriber] = 0
+        self.subscriber_tasks.append(asyncio.create_task(self.dispatch(subscriber, queue)))
+
+    def notify_subscribers(self, data):
+        """Put a message on every subscriber queue, dropping the oldest if full"""
+        for subscriber, queue in self.subscriber_queues.items():
+            if queue.full():
+                queue.get_nowait()
+                self.dropped_messages[subscriber] += 1
+            queue.put_nowait(data)
+
+    async def dispatch(self, subscriber, queue):
+        """Deliver queued messages to one subscriber"""
+        is_coroutine = inspect.iscoroutinefunction(subscriber)
+        while True:
+            data = await queue.get()
+            try:
+                if is_coroutine:
+                    await subscriber(data)
+                else:
+                    await self.loop.run_in_executor(None, subscriber, data)
+            except Exception as e:
+                print(f"Subscriber error: {e}")
@@ -0,0 +1,421 @@
+"""Benchmarks for the tick hot path
+
+Feeds synthetic Deriv tick streams through each stage of the pipeline and
+reports throughput, p50/p99 latency and allocations per tick:
+
+    json          json.loads of the raw message (on_message's parsing)
+    process_tick  DerivAPI.process_tick: buffer, digit stats, indicators
+    indicators    DerivAPI.calculate_indicators for the updated symbol
+    scoring       ScoreCalculator.calculate_all_scores on a fresh snapshot
+    matrix        ScoreMatrix.score on a one-symbol batch per tick (what
+                  event-mode scanning would cost through the vector path)
+    matrix_batch  ScoreMatrix.score on a batch of one snapshot per symbol;
+                  figures are per batch, not per tick
+    on_message    the whole message path, from raw JSON to the snapshot
+    paced         on_message + scoring with ticks arriving at the target
+                  rate; latency is measured from each tick's scheduled
+                  arrival, so it includes queueing once the rate exceeds
+                  what the pipeline sustains (reported, but only its
+                  throughput is compared against a baseline)
+
+Every scenario is a (rate, symbols) pair. Results can be saved as a
+baseline; later runs are compared against it and exit non-zero when a
+stage got slower (or allocates more) than the tolerance allows.
+
+    python -m utils.benchmark --save-baseline
+    python -m utils.benchmark --rates 1000 100000 --symbols 5 100
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from utils.deriv_api import DerivAPI
+from strategies.score_calculator import ScoreCalculator
+from strategies.score_matrix import ScoreMatrix
+
+DEFAULT_RATES = [1000, 10000, 100000]
+DEFAULT_SYMBOL_COUNTS = [5, 20, 100]
+
+# Names of the first synthetic symbols, so the pip size table applies
+KNOWN_SYMBOLS = ['V75', 'V100', 'V50', 'V25', 'V10']
+
+# Per-stage figures compared against the baseline: higher is worse for
+# all but throughput
+REGRESSION_KEYS = ['p50_us', 'p99_us', 'alloc_bytes_per_tick']
+
+# Stages whose latency is reported but never gated: paced latency mostly
+# measures how the OS scheduled one busy-waiting run, and flaps between
+# identical runs (only its throughput is compared)
+UNGATED_LATENCY_STAGES = {'paced'}
+
+
+def symbol_names(count):
+    return KNOWN_SYMBOLS[:count] + [f'SYN{i}' for i in range(len(KNOWN_SYMBOLS), count)]
+
+
+class TickStream:
+    """Pre-generated tick messages for a set of symbols
+
+    Prices are seeded random walks rounded to each symbol's pip size.
+    Ticks are interleaved across symbols in random order, and every symbol
+    gets one epoch per tick (a synthetic timeline), so no tick is dropped
+    as a duplicate however high the rate.
+    """
+    def __init__(self, symbols, ticks, history=200, capacity=1000, pip_size=2, seed=1):
+        rng = np.random.default_rng(seed)
+        self.symbols = symbols
+        self.pip_size = pip_size
+        self.capacity = capacity
+        self.start_epoch = 1_700_000_000
+
+        # History first (for warm up), then the measured ticks
+        order = rng.integers(0, len(symbols), ticks)
+        counts = np.bincount(order, minlength=len(symbols)) + history
+        self.history = {}
+        walks = {}
+        for i, symbol in enumerate(symbols):
+            steps = rng.normal(0, 0.5, counts[i])
+            prices = np.round(1000 + np.cumsum(steps), pip_size)
+            epochs = self.start_epoch + np.arange(counts[i], dtype=np.int64)
+            self.history[symbol] = (epochs[:history], prices[:history])
+            walks[symbol] = (epochs[history:].tolist(), prices[history:].tolist())
+
+        self.ticks = []
+        self.messages = []
+        positions = dict.fromkeys(symbols, 0)
+        for i in order.tolist():
+            symbol = symbols[i]
+            n = positions[symbol]
+            positions[symbol] = n + 1
+            epochs, prices = walks[symbol]
+            tick = {
+                'ask': prices[n],
+                'bid': prices[n],
+                'epoch': epochs[n],
+                'id': f'{symbol}-stream',
+                'pip_size': pip_size,
+                'quote': prices[n],
+                'symbol': symbol
+            }
+            self.ticks.append(tick)
+            self.messages.append(json.dumps({
+                'echo_req': {'ticks': symbol, 'subscribe': 1},
+                'msg_type': 'tick',
+                'subscription': {'id': f'{symbol}-stream'},
+                'tick': tick
+            }))
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def api(self):
+        """DerivAPI (never connected) with every symbol's buffer warmed up"""
+        api = DerivAPI('1', symbols=self.symbols, tick_capacity=self.capacity)
+        for symbol, (epochs, prices) in self.history.items():
+            api.load_history(symbol, epochs, prices, self.pip_size, archive=False)
+        return api
+
+
+def summarize(latencies_ns, elapsed, alloc_bytes):
+    """Throughput and latency percentiles of one stage run"""
+    latencies = np.sort(np.asarray(latencies_ns, dtype=np.float64)) / 1000
+    n = len(latencies)
+    return {
+        'ticks': n,
+        'throughput': n / elapsed if elapsed > 0 else 0.0,
+        'mean_us': float(latencies.mean()) if n else 0.0,
+        'p50_us': float(latencies[int(0.5 * (n - 1))]) if n else 0.0,
+        'p99_us': float(latencies[int(0.99 * (n - 1))]) if n else 0.0,
+        'max_us': float(latencies[-1]) if n else 0.0,
+        'alloc_bytes_per_tick': alloc_bytes
+    }
+
+
+def timed(fn, items):
+    """Call fn(item) for every item; returns (per-call ns, elapsed seconds)
+
+    The garbage collector is off while timing (as in timeit), so its pauses
+    don't land on whichever tick happened to trigger them.
+    """
+    clock = time.perf_counter_ns
+    latencies = []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = clock()
+        for item in items:
+            t0 = clock()
+            fn(item)
+            latencies.append(clock() - t0)
+        elapsed = (clock() - started) / 1e9
+    finally:
+        if enabled:
+            gc.enable()
+    return latencies, elapsed
+
+
+def allocations(fn, items):
+    """Mean bytes allocated per call (peak over the call, as traced)
+
+    Runs separately from the timed pass because tracing slows every
+    allocation down.
+    """
+    tracemalloc.start()
+    try:
+        total = 0
+        for item in items:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fn(item)
+            total += tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return total / len(items) if items else 0.0
+
+
+class Benchmark:
+    """Runs every stage for every (rate, symbols) scenario"""
+    def __init__(self, rates=None, symbol_counts=None, duration=1.0, max_ticks=20000,
+                 alloc_ticks=1000, repeat=3, seed=1):
+        self.rates = rates or DEFAULT_RATES
+        self.symbol_counts = symbol_counts or DEFAULT_SYMBOL_COUNTS
+        self.duration = duration
+        self.max_ticks = max_ticks
+        self.alloc_ticks = alloc_ticks
+        self.repeat = repeat
+        self.seed = seed
+
+    def run(self, progress=None):
+        results = {}
+        for count in self.symbol_counts:
+            for rate in self.rates:
+                ticks = max(1, min(int(rate * self.duration), self.max_ticks))
+                name = f'{rate}tps-{count}sym'
+                results[name] = self.run_scenario(rate, count, ticks)
+                if progress:
+                    progress(name, results[name])
+
+        return {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'scenarios': results
+        }
+
+    def run_scenario(self, rate, symbol_count, ticks):
+        stream = TickStream(symbol_names(symbol_count), ticks, seed=self.seed)
+        snapshots = self.snapshots(stream)
+        stages = {}
+
+        # Parsing only
+        stages['json'] = self.measure(lambda: json.loads, stream.messages)
+
+        # process_tick on already parsed ticks
+        stages['process_tick'] = self.measure(lambda: stream.api().process_tick, stream.ticks)
+
+        # Snapshot building alone, for the symbol each tick updated
+        api = stream.api()
+        symbols = [tick['symbol'] for tick in stream.ticks]
+        stages['indicators'] = self.measure(lambda: api.calculate_indicators, symbols)
+
+        # Scoring of per-tick snapshots (each with a new epoch, so never cached)
+        def scorer():
+            calculator = ScoreCalculator()
+
+            def score(item):
+                symbol, snapshot = item
+                calculator.calculate_all_scores(symbol, api.tick_data[symbol], snapshot)
+            return score
+
+        stages['scoring'] = self.measure(scorer, snapshots)
+
+        # The same snapshots through the vector path, one symbol per batch
+        def matrix():
+            scores = ScoreMatrix()
+            return lambda item: scores.score({item[0]: item[1]})
+
+        stages['matrix'] = self.measure(matrix, snapshots)
+
+        # ... and a batch per tick of every symbol's snapshot
+        batches = [dict(snapshots[i:i + symbol_count])
+                   for i in range(0, len(snapshots) - symbol_count + 1, symbol_count)]
+        stages['matrix_batch'] = self.measure(lambda: ScoreMatrix().score, batches)
+
+        # Whole message path
+        def handler():
+            fresh = stream.api()
+            return lambda message: fresh.on_message(None, message)
+
+        stages['on_message'] = self.measure(handler, stream.messages)
+
+        # Best of `repeat` paced runs, as for the other stages
+        stages['paced'] = min((self.paced(stream, rate) for _ in range(self.repeat)),
+                              key=lambda stats: stats['p99_us'])
+        return {'rate': rate, 'symbols': symbol_count, 'ticks': len(stream), 'stages': stages}
+
+    def measure(self, make_fn, items):
+        """Best of `repeat` timed passes, plus traced allocations
+
+        make_fn() returns the function to call per item, built from fresh
+        state for each pass (so stateful stages see new ticks every time).
+        """
+        best = None
+        for _ in range(self.repeat):
+            latencies, elapsed = timed(make_fn(), items)
+            if best is None or elapsed < best[1]:
+                best = (latencies, elapsed)
+        return summarize(best[0], best[1], allocations(make_fn(), items[:self.alloc_ticks]))
+
+    def snapshots(self, stream):
+        """(symbol, snapshot) for every tick of the stream, as published live"""
+        api = stream.api()
+        snapshots = []
+        api.add_indicator_listener(lambda symbol, snapshot: snapshots.append((symbol, snapshot)))
+        for tick in stream.ticks:
+            api.process_tick(tick)
+        return snapshots
+
+    def paced(self, stream, rate):
+        """on_message + scoring with ticks arriving every 1/rate seconds"""
+        api = stream.api()
+        calculator = ScoreCalculator()
+        clock = time.perf_counter_ns
+        interval = 1e9 / rate
+        latencies = []
+
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            started = clock()
+            for i, message in enumerate(stream.messages):
+                due = started + int(i * interval)
+                while clock() < due:
+                    pass
+                api.on_message(None, message)
+                symbol = stream.ticks[i]['symbol']
+                calculator.calculate_all_scores(symbol, api.tick_data[symbol], api.indicators[symbol])
+                latencies.append(clock() - due)
+            elapsed = (clock() - started) / 1e9
+        finally:
+            if enabled:
+                gc.enable()
+
+        result = summarize(latencies, elapsed, None)
+        # Whether the pipeline kept up with the offered rate
+        result['offered_rate'] = rate
+        result['saturated'] = result['throughput'] < 0.95 * rate
+        return result
+
+
+def compare(results, baseline, tolerance):
+    """Stages that regressed against the baseline, as readable lines"""
+    regressions = []
+    for name, scenario in results['scenarios'].items():
+        base_scenario = baseline.get('scenarios', {}).get(name)
+        if base_scenario is None:
+            continue
+        for stage, stats in scenario['stages'].items():
+            base = base_scenario['stages'].get(stage)
+            if base is None:
+                continue
+
+            # A saturated run's latency only says how long the backlog grew
+            if stats.get('saturated') or base.get('saturated'):
+                keys = []
+            elif stage in UNGATED_LATENCY_STAGES:
+                keys = []
+            else:
+                keys = REGRESSION_KEYS
+            for key in keys:
+                now, before = stats.get(key), base.get(key)
+                if now is None or before is None:
+                    continue
+                # Small absolute slack, so near-zero figures don't flap
+                if now > before * (1 + tolerance) + 1.0:
+                    regressions.append(f'{name} {stage} {key}: {before:.1f} -> {now:.1f}')
+
+            # Paced throughput is the offered rate while it keeps up
+            if stats['throughput'] < base['throughput'] / (1 + tolerance):
+                regressions.append(f"{name} {stage} throughput: {base['throughput']:,.0f} -> "
+                                   f"{stats['throughput']:,.0f} ticks/sec")
+    return regressions
+
+
+def format_report(results):
+    lines = [f"Python {results['python']} on {results['machine']}, {results['created']}"]
+    header = f"{'Stage':<14}{'Ticks/sec':>12}{'p50 us':>10}{'p99 us':>10}{'Max us':>10}{'Bytes/tick':>12}"
+    for name, scenario in results['scenarios'].items():
+        lines.append('')
+        lines.append(f"{name}: {scenario['ticks']} ticks over {scenario['symbols']} symbols")
+        lines.append(header)
+        for stage, stats in scenario['stages'].items():
+            alloc = stats['alloc_bytes_per_tick']
+            line = (f"{stage:<14}{stats['throughput']:>12,.0f}{stats['p50_us']:>10.1f}"
+                    f"{stats['p99_us']:>10.1f}{stats['max_us']:>10.1f}"
+                    f"{'-' if alloc is None else f'{alloc:,.0f}':>12}")
+            if stats.get('saturated'):
+                line += '  (saturated)'
+            lines.append(line)
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the tick hot path')
+    parser.add_argument('--rates', type=int, nargs='+', default=DEFAULT_RATES,
+                        help='offered ticks per second')
+    parser.add_argument('--symbols', type=int, nargs='+', default=DEFAULT_SYMBOL_COUNTS,
+                        help='numbers of symbols')
+    parser.add_argument('--duration', type=float, default=1.0,
+                        help='seconds of ticks per scenario at its rate')
+    parser.add_argument('--max-ticks', type=int, default=20000, help='cap on ticks per scenario')
+    parser.add_argument('--alloc-ticks', type=int, default=1000,
+                        help='ticks traced for allocation counts')
+    parser.add_argument('--repeat', type=int, default=3, help='timed passes per stage (best kept)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', default='bench_baseline.json')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='write this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown/growth before a regression')
+    parser.add_argument('--output', default='bench_output.txt', help='report file')
+    args = parser.parse_args()
+
+    benchmark = Benchmark(args.rates, args.symbols, args.duration, args.max_ticks,
+                          args.alloc_ticks, args.repeat, args.seed)
+    results = benchmark.run(progress=lambda name, _: print(f"Finished {name}", file=sys.stderr))
+
+    lines = format_report(results)
+
+    status = 0
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        lines += ['', f"Saved baseline to {args.baseline}"]
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        lines.append('')
+        if regressions:
+            lines.append(f"{len(regressions)} regressions against {args.baseline} "
+                         f"(tolerance {args.tolerance:.0%}):")
+            lines += [f"  {line}" for line in regressions]
+            status = 1
+        else:
+            lines.append(f"No regressions against {args.baseline}")
+    else:
+        lines += ['', f"No baseline at {args.baseline} (run with --save-baseline)"]
+
+    report = '\n'.join(lines)
+    print(report)
+    with open(args.output, 'w') as f:
+        f.write(report + '\n')
+    sys.exit(status)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+from collections import deque
+from utils.indicator_engine import SymbolIndicators
+
+# Candle timeframes built from the tick stream: name -> seconds
+TIMEFRAMES = {
+    '1s': 1,
+    '15s': 15,
+    '1m': 60,
+    '5m': 300
+}
+
+# Snapshot keys with each timeframe's trend (+1 up, -1 down, 0 unknown)
+TREND_FIELDS = [f'trend_{name}' for name in TIMEFRAMES]
+
+# Closed candles needed before a timeframe reports a trend (the slow EMA)
+TREND_WARMUP = 20
+
+
+class Candle:
+    """One OHLC bar"""
+    __slots__ = ('open_time', 'open', 'high', 'low', 'close', 'ticks')
+
+    def __init__(self, open_time, price):
+        self.open_time = open_time
+        self.open = self.high = self.low = self.close = price
+        self.ticks = 1
+
+    def update(self, price):
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.ticks += 1
+
+    def to_dict(self):
+        return {
+            'open_time': self.open_time,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'ticks': self.ticks
+        }
+
+
+class CandleSeries:
+    """Candles of one symbol and timeframe, with indicators on closed bars
+
+    A tick either extends the forming candle or, once its epoch reaches the
+    next bucket, closes it: the close goes into RSI(4/14), EMA(5/10/20) and
+    20-bar Bollinger state, all O(1). Buckets without ticks are skipped
+    rather than filled with flat bars, as Deriv does.
+    """
+    def __init__(self, seconds, history=100):
+        self.seconds = seconds
+        self.current = None
+        self.closed = deque(maxlen=history)
+        self.indicators = SymbolIndicators()
+
+    def update(self, epoch, price):
+        """Feed one tick; returns the candle it closed, if any"""
+        open_time = epoch - epoch % self.seconds
+        current = self.current
+        if current is not None and open_time == current.open_time:
+            current.update(price)
+            return None
+        if current is not None and open_time < current.open_time:
+            return None  # Late tick for a candle already closed
+
+        self.current = Candle(open_time, price)
+        if current is not None:
+            self.close(current)
+        return current
+
+    def merge(self, candle):
+        """Apply a candle from the server; returns the candle it closed, if any"""
+        current = self.current
+        if current is not None and candle.open_time < current.open_time:
+            return None
+
+        self.current = candle
+        if current is not None and candle.open_time > current.open_time:
+            self.close(current)
+            return current
+        return None
+
+    def close(self, candle):
+        self.closed.append(candle)
+        self.indicators.update(candle.close)
+
+    @property
+    def trend(self):
+        """+1 when the closed-bar EMA(5) is above EMA(20), -1 below, 0 early"""
+        if self.indicators.count < TREND_WARMUP:
+            return 0
+        fast = self.indicators.ema[5].value
+        slow = self.indicators.ema[20].value
+        return (fast > slow) - (fast < slow)
+
+    def values(self):
+        values = self.indicators.values()
+        values['trend'] = self.trend
+        values['bars'] = self.indicators.count
+        return values
+
+
+class CandleAggregator:
+    """Streaming multi-timeframe candles and indicators for every symbol
+
+    update() is called once per tick and costs O(1) per timeframe. The
+    flat trend_<timeframe> fields merged into every indicator snapshot are
+    updated in place when a candle closes; the full per-timeframe indicator
+    values are only built when asked for, once per closed candle.
+    """
+    def __init__(self, timeframes=None, history=100):
+        self.timeframes = dict(timeframes or TIMEFRAMES)
+        self.history = history
+        self.series = {}  # symbol -> [(timeframe, trend field, CandleSeries)]
+        self.trends = {}  # symbol -> {'trend_<timeframe>': trend}
+        self.values = {}  # symbol -> {timeframe: indicator values}, None when stale
+        self.by_seconds = {seconds: name for name, seconds in self.timeframes.items()}
+
+    def symbol_series(self, symbol):
+        series = self.series.get(symbol)
+        if series is None:
+            series = self.series[symbol] = [
+                (name, f'trend_{name}', CandleSeries(seconds, self.history))
+                for name, seconds in self.timeframes.items()
+            ]
+            self.trends[symbol] = {field: 0 for _, field, _ in series}
+            self.values[symbol] = None
+        return series
+
+    def update(self, symbol, epoch, price):
+        """Feed one tick; returns True when any timeframe closed a candle"""
+        closed = False
+        for name, field, series in self.symbol_series(symbol):
+            if series.update(epoch, price) is not None:
+                self.trends[symbol][field] = series.trend
+                closed = True
+        if closed:
+            self.values[symbol] = None
+        return closed
+
+    def add_candle(self, symbol, granularity, candle):
+        """Merge a server candle; False if no timeframe has that granularity"""
+        name = self.by_seconds.get(granularity)
+        if name is None:
+            return False
+        for series_name, field, series in self.symbol_series(symbol):
+            if series_name == name and series.merge(candle) is not None:
+                self.trends[symbol][field] = series.trend
+                self.values[symbol] = None
+        return True
+
+    def get_series(self, symbol, timeframe):
+        for name, _, series in self.series.get(symbol, ()):
+            if name == timeframe:
+                return series
+        return None
+
+    def indicators(self, symbol):
+        """{timeframe: closed-candle indicator values} for a symbol"""
+        if symbol not in self.series:
+            return {}
+        values = self.values[symbol]
+        if values is None:
+            values = self.values[symbol] = {
+                name: series.values() for name, _, series in self.series[symbol]
+            }
+        return values
+
+    def trend_fields(self, symbol):
+        """{'trend_<timeframe>': trend} for a symbol (live dict, copy to keep)"""
+        trends = self.trends.get(symbol)
+        if trends is None:
+            return {f'trend_{name}': 0 for name in self.timeframes}
+        return trends
+
+    def candles(self, symbol, timeframe, count=None):
+        """The last `count` candles (oldest first, the forming one last), as dicts"""
+        series = self.get_series(symbol, timeframe)
+        if series is None:
+            return []
+        candles = list(series.closed)
+        if series.current is not None:
+            candles.append(series.current)
+        if count is not None:
+            candles = candles[-count:]
+        return [candle.to_dict() for candle in candles]
+
+    def reset(self, symbol=None):
+        """Forget candles for one symbol or all of them"""
+        if symbol is None:
+            self.series.clear()
+            self.trends.clear()
+            self.values.clear()
+        else:
+            self.series.pop(symbol, None)
+            self.trends.pop(symbol, None)
+            self.values.pop(symbol, None)
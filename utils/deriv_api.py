@@ -1,196 +1,608 @@
 import websocket
 import json
+import socket
 import threading
 import time
-from datetime import datetime
-import pandas as pd
+import itertools
+import random
+from concurrent.futures import Future
 import numpy as np
+from utils.tick_buffer import TickBuffer
+from utils.candle_aggregator import Candle, CandleAggregator
+from utils.indicator_engine import IndicatorEngine
+from utils.account_state import AccountState
+from utils.latency import LatencyTracker
+from utils.symbol_registry import SymbolRegistry
+from utils.digit_stats import DigitStats, get_pip_size
+
+# Deriv contract types for the directions the bots trade
+CONTRACT_TYPES = {
+    'RISE': 'CALL',
+    'FALL': 'PUT'
+}
+
+class DerivAPIError(Exception):
+    """Error response (or lost connection) for a Deriv API request"""
+    def __init__(self, message, code=None, response=None):
+        super().__init__(message)
+        self.code = code
+        self.response = response
+
+DEFAULT_ENDPOINT = "wss://ws.derivws.com/websockets/v3"
+
+# Markets the bots scan (unless discovered from active_symbols)
+DEFAULT_SYMBOLS = ['V75', 'V100', 'V50', 'V25', 'V10']
+
+# Messages that update the cached account state
+ACCOUNT_MESSAGES = {'authorize', 'balance', 'buy', 'proposal_open_contract'}
 
 class DerivAPI:
-    def __init__(self, app_id, api_token=None):
+    def __init__(self, app_id, api_token=None, tick_capacity=1000, parity_check=False,
+                 symbols=None, endpoint=None, archive=None, ping_interval=15,
+                 ping_timeout=10, reconnect_max_delay=60, markets=None):
         self.app_id = app_id
         self.api_token = api_token
+        self.endpoint = endpoint or DEFAULT_ENDPOINT
+        self.symbols = list(symbols or DEFAULT_SYMBOLS)
+        # With markets set, every open symbol of those markets is scanned
+        # (looked up with active_symbols on each connect)
+        self.registry = SymbolRegistry(markets)
         self.ws = None
         self.connected = False
+        self.tick_capacity = tick_capacity
         self.tick_data = {}
-        self.candle_data = {}
+        self.archive = archive  # Optional TickArchive recording every tick
+        self.indicator_engine = IndicatorEngine(parity_check=parity_check)
+        self.digit_stats = {}
+        self.indicators = {}
+        self.indicator_listeners = []
+        # 1s/15s/1m/5m candles and their indicators, built from the ticks
+        self.candle_data = CandleAggregator()
         self.subscribers = []
         
+        # Balance and open contracts, kept current by the account streams
+        self.account = AccountState()
+        
+        # Tick-to-decision latency per pipeline stage
+        self.latency = LatencyTracker()
+        
+        # Outbound requests awaiting a response, keyed by req_id
+        self.req_ids = itertools.count(1)
+        self.pending_requests = {}
+        self.pending_lock = threading.Lock()
+        
+        # Connection supervision: reconnect with exponential backoff, and
+        # ping when the socket goes quiet so dead connections are dropped
+        # within ping_interval + ping_timeout seconds
+        self.should_run = False
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.reconnect_min_delay = 1
+        self.reconnect_max_delay = reconnect_max_delay
+        self.reconnect_delay = self.reconnect_min_delay
+        self.reconnects = 0
+        self.last_message_time = time.monotonic()
+        
     def connect(self):
-        """Connect to Deriv WebSocket API"""
+        """Connect to Deriv WebSocket API (reconnects until disconnect())"""
         websocket.enableTrace(False)
-        self.ws = websocket.WebSocketApp(
-            f"wss://ws.derivws.com/websockets/v3?app_id={self.app_id}",
-            on_open=self.on_open,
-            on_message=self.on_message,
-            on_error=self.on_error,
-            on_close=self.on_close
-        )
-        
-        wst = threading.Thread(target=self.ws.run_forever)
+        self.should_run = True
+        
+        wst = threading.Thread(target=self.run_supervised)
         wst.daemon = True
         wst.start()
         
+        heartbeat = threading.Thread(target=self.heartbeat_loop)
+        heartbeat.daemon = True
+        heartbeat.start()
+        
+    def run_supervised(self):
+        """Keep a connection open, reconnecting with exponential backoff"""
+        while self.should_run:
+            self.ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self.on_open,
+                on_message=self.on_message,
+                on_error=self.on_error,
+                on_close=self.on_close
+            )
+            self.ws.run_forever()
+            
+            if self.should_run:
+                self.wait_before_reconnect()
+                
+    def wait_before_reconnect(self):
+        """Sleep for the current backoff delay (with jitter) and double it"""
+        delay = self.reconnect_delay * random.uniform(0.8, 1.2)
+        print(f"Reconnecting to Deriv in {delay:.1f}s")
+        time.sleep(delay)
+        self.reconnect_delay = min(self.reconnect_delay * 2, self.reconnect_max_delay)
+        self.reconnects += 1
+        
+    def disconnect(self):
+        """Close the connection and stop reconnecting"""
+        self.should_run = False
+        self.drop_connection()
+        
+    def drop_connection(self):
+        """Close the socket; the supervisor reconnects if still running"""
+        sock = self.ws.sock if self.ws is not None else None
+        if sock is not None and sock.sock is not None:
+            # Shutting the raw socket down wakes the reader thread at once,
+            # which then runs on_close; close() alone waits for its select
+            try:
+                sock.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            
+    def heartbeat_loop(self):
+        """Ping when no message arrived for ping_interval; drop dead sockets"""
+        while self.should_run:
+            time.sleep(self.ping_interval / 2)
+            if not self.connected:
+                continue
+            if time.monotonic() - self.last_message_time < self.ping_interval:
+                continue
+                
+            try:
+                self.request({"ping": 1}, timeout=self.ping_timeout)
+            except Exception as e:
+                print(f"Heartbeat failed ({e!r}), dropping connection")
+                self.drop_connection()
+                
+
+    @property
+    def url(self):
+        """WebSocket URL including the app_id"""
+        separator = '&' if '?' in self.endpoint else '?'
+        return f"{self.endpoint}{separator}app_id={self.app_id}"
+        
     def on_open(self, ws):
         print("Connected to Deriv")
         self.connected = True
+        self.reconnect_delay = self.reconnect_min_delay
+        self.last_message_time = time.monotonic()
         
-        # Authorize if token provided
+        # Authorize if token provided, then stream balance and contracts
         if self.api_token:
-            self.authorize(self.api_token)
+            self.authorize(self.api_token).add_done_callback(self.on_authorized)
+            
+        # Load recent history (backfilling any gap since the last stored
+        # tick) and re-subscribe to all needed markets
+        if self.registry.markets:
+            self.load_symbols()
+        else:
+            self.subscribe_with_history()
+            
+    def on_authorized(self, future):
+        """Start the account streams once authorize succeeded (reader thread)"""
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Authorization failed ({e}), not streaming balance or contracts")
+            return
+            
+        self.subscribe_account()
+        
+    def load_symbols(self):
+        """Refresh the symbol list from active_symbols, then subscribe"""
+        future = self.send_request(self.registry.request())
+        future.add_done_callback(self.on_active_symbols)
+        return future
+        
+    def on_active_symbols(self, future):
+        """Apply an active_symbols response (reader thread)"""
+        try:
+            symbols = self.registry.load(future.result()['active_symbols'])
+            if symbols:
+                self.symbols = symbols
+            print(f"Scanning {len(self.symbols)} symbols")
+        except Exception as e:
+            print(f"Active symbols failed ({e}), keeping {len(self.symbols)} known symbols")
             
-        # Subscribe to all needed markets
-        self.subscribe_all()
+        self.subscribe_with_history()
         
     def on_message(self, ws, message):
         """Handle incoming messages"""
-        data = json.loads(message)
+        received = time.perf_counter_ns()
+        self.handle_message(json.loads(message), received)
+        
+    def handle_message(self, data, received=None):
+        """Dispatch a parsed message (`received` is its perf_counter_ns arrival)"""
+        self.last_message_time = time.monotonic()
         
+        # Resolve the request this message answers
+        req_id = data.get('req_id')
+        if req_id is not None:
+            self.resolve_request(req_id, data)
+            
         # Handle ticks
         if 'tick' in data:
-            self.process_tick(data['tick'])
+            self.latency.record('parse', received)
+            self.process_tick(data['tick'], received)
             
-        # Handle candles
-        elif 'candle' in data:
-            self.process_candle(data['candle'])
+        # Handle candles (ohlc is the candle stream of ticks_history)
+        elif 'candle' in data or 'ohlc' in data:
+            self.process_candle(data.get('candle') or data['ohlc'])
+            
+        # Keep the cached account state current
+        elif data.get('msg_type') in ACCOUNT_MESSAGES:
+            self.account.update(data)
             
         # Notify subscribers
+        self.notify_subscribers(data)
+        
+    def add_subscriber(self, subscriber):
+        """Register subscriber(data), called for every incoming message"""
+        self.subscribers.append(subscriber)
+        
+    def notify_subscribers(self, data):
+        """Call every subscriber with a message"""
         for subscriber in self.subscribers:
             subscriber(data)
             
-    def process_tick(self, tick):
+    def process_tick(self, tick, received=None):
         """Process tick data and calculate indicators"""
         symbol = tick['symbol']
         price = float(tick['quote'])
         epoch = tick['epoch']
         
-        # Store tick
-        if symbol not in self.tick_data:
-            self.tick_data[symbol] = []
+        buffer = self.tick_data.get(symbol)
+        if buffer is None:
+            pip_size = get_pip_size(symbol, tick, listed=self.registry.pip_size(symbol))
+            buffer = self.get_buffer(symbol, pip_size)
+        elif tick.get('pip_size') is not None:
+            # The tick's own pip size wins over a guessed one (warm start)
+            self.set_pip_size(symbol, int(tick['pip_size']))
+            
+        # Ticks already stored (e.g. delivered by a history load) are skipped
+        if buffer.count and epoch <= buffer.last_epoch:
+            return
+            
+        if received is not None:
+            self.latency.count_tick(symbol, received)
+            
+        streaming = self.store_tick(symbol, epoch, price, received=received)
+        self.publish_indicators(symbol, epoch, streaming, received)
+        
+    def process_candle(self, candle):
+        """Merge a candle sent by Deriv into the tick-built candles"""
+        try:
+            symbol = candle['symbol']
+            granularity = int(candle['granularity'])
+            open_time = int(candle['open_time'])
+            bar = Candle(open_time, float(candle['open']))
+            bar.high = float(candle['high'])
+            bar.low = float(candle['low'])
+            bar.close = float(candle['close'])
+            bar.ticks = 0
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Candle error: {e}")
+            return
             
-        self.tick_data[symbol].append({
-            'price': price,
-            'epoch': epoch,
-            'time': datetime.fromtimestamp(epoch)
-        })
+        self.candle_data.add_candle(symbol, granularity, bar)
         
-        # Keep last 1000 ticks
-        self.tick_data[symbol] = self.tick_data[symbol][-1000:]
+    def get_candles(self, symbol, timeframe, count=None):
+        """Recent candles of a symbol ('1s', '15s', '1m' or '5m'), oldest first"""
+        return self.candle_data.candles(symbol, timeframe, count)
         
-        # Calculate real-time indicators
-        self.calculate_indicators(symbol)
+    def get_timeframe_indicators(self, symbol):
+        """Closed-candle RSI/EMA/Bollinger and trend per timeframe"""
+        return self.candle_data.indicators(symbol)
         
-    def calculate_indicators(self, symbol):
-        """Calculate RSI, EMA, and other indicators"""
-        ticks = self.tick_data[symbol]
-        if len(ticks) < 20:
+    def get_buffer(self, symbol, pip_size):
+        """Tick buffer for a symbol, created on first use"""
+        buffer = self.tick_data.get(symbol)
+        if buffer is None:
+            buffer = self.tick_data[symbol] = TickBuffer(self.tick_capacity, pip_size)
+            self.digit_stats[symbol] = DigitStats(pip_size)
+        return buffer
+        
+    def set_pip_size(self, symbol, pip_size):
+        """Apply an authoritative pip size, rebuilding the digit stats if it changed"""
+        buffer = self.tick_data[symbol]
+        if buffer.pip_size == pip_size:
             return
             
-        prices = [t['price'] for t in ticks]
+        buffer.pip_size = pip_size
+        stats = self.digit_stats[symbol] = DigitStats(pip_size)
+        stats.load(buffer.prices())
         
-        # Calculate RSI(14)
-        rsi_14 = self.calculate_rsi(prices, 14)
+    def store_tick(self, symbol, epoch, price, archive=True, received=None):
+        """Append a tick and update digit/indicator state, returns indicators"""
+        # Store tick (ring buffer keeps the last tick_capacity ticks)
+        buffer = self.tick_data[symbol]
+        buffer.append(epoch, price)
         
-        # Calculate RSI(4)
-        rsi_4 = self.calculate_rsi(prices, 4)
+        # Queue for the on-disk archive (written in batches off this thread)
+        if archive and self.archive is not None:
+            self.archive.append(symbol, epoch, price)
+            
+        # Update rolling last-digit statistics and the candles
+        self.digit_stats[symbol].update(price)
+        self.candle_data.update(symbol, epoch, price)
+        self.latency.record('store', received)
         
-        # Calculate EMAs
-        ema_5 = self.calculate_ema(prices, 5)
-        ema_10 = self.calculate_ema(prices, 10)
-        ema_20 = self.calculate_ema(prices, 20)
+        # Update streaming indicators in O(1)
+        return self.indicator_engine.update(symbol, price, buffer.prices())
         
-        # Calculate digit dominance
-        last_50_prices = prices[-50:]
-        last_50_digits = [int(str(p)[-1]) for p in last_50_prices]
-        high_digits = sum(1 for d in last_50_digits if d >= 5)
-        low_digits = 50 - high_digits
-        digit_dominance = (high_digits / 50) * 100
+    def publish_indicators(self, symbol, epoch, streaming, received=None):
+        """Build this tick's indicator snapshot once and publish it"""
+        snapshot = self.calculate_indicators(symbol, streaming)
+        if snapshot is None:
+            return
+            
+        snapshot['symbol'] = symbol
+        snapshot['epoch'] = epoch
+        # Arrival stamp, so later stages can time themselves from the tick
+        snapshot['received_ns'] = received
+        self.indicators[symbol] = snapshot
+        self.latency.record('indicators', received)
         
-        # Calculate streak
-        streak = self.calculate_streak(last_50_digits)
+        for listener in self.indicator_listeners:
+            listener(symbol, snapshot)
+            
+    def load_history(self, symbol, epochs, prices, pip_size=None, archive=True):
+        """Merge a block of past ticks (oldest first) into the symbol's state
         
-        return {
-            'rsi_14': rsi_14,
-            'rsi_4': rsi_4,
-            'ema_5': ema_5,
-            'ema_10': ema_10,
-            'ema_20': ema_20,
-            'digit_dominance': digit_dominance,
-            'streak': streak
-        }
+        Only ticks newer than the last stored one are applied, so overlapping
+        history is never stored twice. One snapshot is published at the end.
+        An explicit pip_size (from a ticks_history response) replaces a
+        guessed one. Returns the number of ticks added.
+        """
+        if pip_size is None:
+            pip_size = get_pip_size(symbol, prices=prices, listed=self.registry.pip_size(symbol))
+            buffer = self.get_buffer(symbol, pip_size)
+        else:
+            buffer = self.get_buffer(symbol, int(pip_size))
+            self.set_pip_size(symbol, int(pip_size))
         
-    def calculate_rsi(self, prices, period):
-        """Calculate RSI"""
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
+        epochs = np.asarray(epochs, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        if buffer.count:
+            newer = epochs > buffer.last_epoch
+            epochs, prices = epochs[newer], prices[newer]
+        if not len(epochs):
+            return 0
+            
+        streaming = None
+        for epoch, price in zip(epochs.tolist(), prices.tolist()):
+            streaming = self.store_tick(symbol, epoch, price, archive)
+            
+        self.publish_indicators(symbol, int(epochs[-1]), streaming)
+        return len(epochs)
         
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
+    def warm_start(self):
+        """Fill buffers and indicator state from the local tick archive"""
+        if self.archive is None:
+            return
+            
+        # Before active_symbols is known, restore whatever was scanned last
+        symbols = self.archive.symbols() if self.registry.markets else self.symbols
+        for symbol in symbols:
+            epochs, prices = self.archive.last(symbol, self.tick_capacity)
+            if len(epochs):
+                added = self.load_history(symbol, epochs, prices, archive=False)
+                print(f"Warm start: {added} archived ticks for {symbol}")
+                
+    def subscribe_with_history(self, symbols=None):
+        """Fetch recent history and subscribe to ticks in one request per symbol
         
-        if avg_loss == 0:
-            return 100
+        All requests are pipelined at once. Each asks for the ticks after the
+        last stored one (or a full buffer's worth) with subscribe=1, so the
+        history arrives before the first streamed tick.
+        """
+        futures = []
+        for symbol in symbols or self.symbols:
+            request = {
+                "ticks_history": symbol,
+                "end": "latest",
+                "count": self.tick_capacity,
+                "style": "ticks",
+                "subscribe": 1
+            }
+            buffer = self.tick_data.get(symbol)
+            if buffer is not None and buffer.count:
+                request["start"] = buffer.last_epoch + 1
+                
+            future = self.send_request(request)
+            future.add_done_callback(lambda f, symbol=symbol: self.on_history(symbol, f))
+            futures.append(future)
             
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return futures
         
-    def calculate_ema(self, prices, period):
-        """Calculate EMA"""
-        if len(prices) < period:
-            return prices[-1] if prices else 0
+    def on_history(self, symbol, future):
+        """Apply a ticks_history response (reader thread)"""
+        try:
+            response = future.result()
+            history = response['history']
+            added = self.load_history(symbol, history['times'], history['prices'],
+                                      response.get('pip_size', self.registry.pip_size(symbol)))
+            print(f"Loaded {added} history ticks for {symbol}")
+        except Exception as e:
+            print(f"History for {symbol} failed: {e}")
             
-        multiplier = 2 / (period + 1)
-        ema = prices[0]
+    def add_indicator_listener(self, listener):
+        """Register listener(symbol, snapshot), called once per new snapshot"""
+        self.indicator_listeners.append(listener)
+        
+    def get_indicators(self, symbol):
+        """Latest indicator snapshot for a symbol (None until 20 ticks)"""
+        return self.indicators.get(symbol)
         
-        for price in prices[1:]:
-            ema = (price - ema) * multiplier + ema
+    def calculate_indicators(self, symbol, streaming=None):
+        """Calculate RSI, EMA, and other indicators"""
+        ticks = self.tick_data[symbol]
+        if len(ticks) < 20:
+            return
+            
+        # RSI, EMAs, momentum and Bollinger come from the streaming engine
+        if streaming is None:
+            streaming = self.indicator_engine.get(symbol)
             
-        return ema
+        # Digit dominance, parity streak and histogram are kept incrementally
+        digits = self.digit_stats[symbol]
         
-    def calculate_streak(self, digits):
-        """Calculate consecutive same parity digits"""
-        if not digits:
-            return 0
+        return {
+            'rsi_14': streaming['rsi_14'],
+            'rsi_4': streaming['rsi_4'],
+            'ema_5': streaming['ema_5'],
+            'ema_10': streaming['ema_10'],
+            'ema_20': streaming['ema_20'],
+            'digit_dominance': digits.dominance,
+            'digit_streak': digits.streak,
+            'digit_histogram': digits.histogram.tolist(),
+            'last_digit': digits.last_digit,
+            'even_dominance': digits.even_dominance,
+            'momentum': streaming['momentum'],
+            'bollinger': streaming['bollinger'],
+            # Closed-candle trend per timeframe (trend_1s ... trend_5m)
+            **self.candle_data.trend_fields(symbol)
+        }
+        
+    def send_request(self, request):
+        """Send a request tagged with a new req_id and return a Future
+        
+        The future resolves with the response message, or raises
+        DerivAPIError if Deriv answers with an error or the connection drops.
+        """
+        req_id = next(self.req_ids)
+        future = Future()
+        
+        with self.pending_lock:
+            self.pending_requests[req_id] = future
             
-        streak = 1
-        last_parity = digits[-1] % 2
+        try:
+            self.send_message(dict(request, req_id=req_id))
+        except Exception as e:
+            with self.pending_lock:
+                self.pending_requests.pop(req_id, None)
+            future.set_exception(DerivAPIError(f"Send failed: {e}"))
+            
+        return future
+        
+    def send_message(self, message):
+        """Write one message to the socket"""
+        self.ws.send(json.dumps(message))
+        
+    def request(self, request, timeout=10):
+        """Send a request and wait for its response"""
+        return self.send_request(request).result(timeout=timeout)
         
-        for digit in reversed(digits[:-1]):
-            if digit % 2 == last_parity:
-                streak += 1
-            else:
-                break
+    def resolve_request(self, req_id, data):
+        """Complete the pending future for req_id (reader thread)"""
+        with self.pending_lock:
+            future = self.pending_requests.pop(req_id, None)
+            
+        # Subscription streams repeat the req_id; only the first message
+        # answers the request
+        if future is None or future.done():
+            return
+            
+        if 'error' in data:
+            error = data['error']
+            future.set_exception(DerivAPIError(
+                error.get('message', 'Unknown error'),
+                error.get('code'),
+                data
+            ))
+        else:
+            future.set_result(data)
+            
+    def fail_pending_requests(self, reason):
+        """Fail every outstanding request (e.g. on disconnect)"""
+        with self.pending_lock:
+            pending = list(self.pending_requests.values())
+            self.pending_requests.clear()
+            
+        for future in pending:
+            if not future.done():
+                future.set_exception(DerivAPIError(reason))
                 
-        return streak
+    def authorize(self, api_token):
+        """Authorize the connection"""
+        return self.send_request({"authorize": api_token})
+        
+    def subscribe_account(self):
+        """Stream balance changes and updates of every open contract"""
+        return [
+            self.send_request({"balance": 1, "subscribe": 1}),
+            self.send_request({"proposal_open_contract": 1, "subscribe": 1})
+        ]
+        
+    def get_balance(self):
+        """Last balance reported by Deriv (no network call)"""
+        return self.account.balance
         
     def subscribe_ticks(self, symbols):
         """Subscribe to tick streams"""
+        futures = []
         for symbol in symbols:
             subscribe_msg = {
                 "ticks": symbol,
                 "subscribe": 1
             }
-            self.ws.send(json.dumps(subscribe_msg))
+            futures.append(self.send_request(subscribe_msg))
             
-    def buy_contract(self, symbol, amount, contract_type, duration, duration_unit='t'):
-        """Place a buy contract"""
+        return futures
+        
+    def subscribe_all(self):
+        """Subscribe to every market the bots scan"""
+        return self.subscribe_ticks(self.symbols)
+        
+    def buy_contract(self, symbol, amount, contract_type, duration, duration_unit='t',
+                     barrier=None):
+        """Place a buy contract
+        
+        Sends a proposal and, as soon as it is answered, buys it at the
+        quoted price. `barrier` is the digit of DIGITOVER/DIGITUNDER
+        contracts. Returns a Future resolving to the buy response.
+        """
         proposal = {
             "proposal": 1,
             "amount": amount,
             "basis": "stake",
-            "contract_type": contract_type,
+            "contract_type": CONTRACT_TYPES.get(contract_type, contract_type),
             "currency": "USD",
             "duration": duration,
             "duration_unit": duration_unit,
             "symbol": symbol
         }
+        if barrier is not None:
+            proposal["barrier"] = str(barrier)
+            
+        result = Future()
         
-        self.ws.send(json.dumps(proposal))
+        def on_proposal(proposal_future):
+            # Runs on the reader thread: only sends, never waits
+            try:
+                quote = proposal_future.result()['proposal']
+                buy = self.send_request({
+                    "buy": quote['id'],
+                    "price": quote['ask_price']
+                })
+            except Exception as e:
+                result.set_exception(e)
+                return
+                
+            buy.add_done_callback(lambda f: self.chain_future(f, result))
+            
+        self.send_request(proposal).add_done_callback(on_proposal)
+        return result
         
+    def chain_future(self, source, target):
+        """Copy the outcome of one future into another"""
+        if target.done():
+            return
+        if source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+            
     def on_error(self, ws, error):
         print(f"Error: {error}")
         
     def on_close(self, ws, close_status_code, close_msg):
         print("Disconnected from Deriv")
         self.connected = False
+        self.fail_pending_requests("Connection closed")
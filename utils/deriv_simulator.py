@@ -0,0 +1,522 @@
+"""Local stand-in for the Deriv WebSocket API
+
+Speaks the subset of the protocol the app uses (authorize, active_symbols,
+ticks subscriptions, forget/forget_all, proposal/buy, ticks_history, balance
+and proposal_open_contract streams) so DerivAPI, BotManager and the Socket.IO
+push path can run and be load-tested offline. Bought contracts are settled
+on the simulated ticks (rise/fall and digit contracts).
+Ticks are synthetic random walks in the style of the volatility indices, or
+replayed from a CSV file of `symbol,epoch,quote` rows.
+
+    python -m utils.deriv_simulator --port 8765 --rate 2000 --symbols 50
+
+then point the app at it with DERIV_WS_URL=ws://localhost:8765.
+"""
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+import websockets
+
+# Annualised volatility of each index (V75 -> 75%)
+DEFAULT_SYMBOLS = {
+    'V75': 0.75,
+    'V100': 1.00,
+    'V50': 0.50,
+    'V25': 0.25,
+    'V10': 0.10
+}
+
+# Contract types the simulator can settle
+CONTRACT_TYPES = {'CALL', 'PUT', 'DIGITOVER', 'DIGITUNDER', 'DIGITEVEN', 'DIGITODD'}
+
+# Each simulated tick stands for this many seconds of index time
+TICK_SECONDS = 2
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+class SimulatedSymbol:
+    """Random-walk price series for one synthetic index"""
+    def __init__(self, symbol, volatility, price=1000.0, pip_size=2, epoch=None,
+                 history_size=5000, rng=None):
+        self.symbol = symbol
+        self.pip_size = pip_size
+        self.price = price
+        self.epoch = int(epoch or time.time())
+        self.step = volatility * math.sqrt(TICK_SECONDS / SECONDS_PER_YEAR)
+        self.history = deque(maxlen=history_size)
+        self.rng = rng or random.Random()
+
+    def next_tick(self):
+        """Advance one tick (epoch moves by one second per tick)"""
+        self.price *= math.exp(self.step * self.rng.gauss(0, 1))
+        self.epoch += 1
+        quote = round(self.price, self.pip_size)
+        self.history.append((self.epoch, quote))
+        return self.epoch, quote
+
+    def record(self, epoch, quote):
+        """Store a replayed tick"""
+        self.epoch = epoch
+        self.price = quote
+        self.history.append((epoch, quote))
+
+
+class DerivSimulator:
+    """WebSocket server emulating the Deriv API for local testing"""
+    def __init__(self, host='localhost', port=8765, symbols=None, rate=10,
+                 replay_file=None, balance=10000.0, payout_ratio=0.95, seed=None):
+        self.host = host
+        self.port = port
+        self.rate = rate  # Total ticks per second across all symbols
+        self.replay_file = replay_file
+        self.balance = balance
+        self.payout_ratio = payout_ratio
+        self.rng = random.Random(seed)
+
+        symbols = symbols or DEFAULT_SYMBOLS
+        self.symbols = {
+            name: SimulatedSymbol(
+                name, volatility,
+                price=self.rng.uniform(1000, 20000),
+                rng=self.rng
+            )
+            for name, volatility in symbols.items()
+        }
+
+        # symbol -> {connection: (subscription id, req_id)}
+        self.subscribers = {name: {} for name in self.symbols}
+        # stream ('balance' / 'proposal_open_contract') -> {connection: (subscription id, req_id)}
+        self.account_subscribers = {'balance': {}, 'proposal_open_contract': {}}
+        self.proposals = {}  # proposal id -> proposal request
+        self.contracts = {}  # contract id -> open contract
+        self.ids = itertools.count(1)
+        self.ticks_sent = 0
+        self.server = None
+
+    async def serve(self):
+        """Run the server and the tick generator until cancelled"""
+        async with websockets.serve(self.handler, self.host, self.port) as server:
+            self.server = server
+            print(f"Deriv simulator listening on ws://{self.host}:{self.port}")
+            if self.replay_file:
+                await self.replay_ticks()
+            else:
+                await self.generate_ticks()
+
+    def start_in_thread(self):
+        """Run the simulator on its own event loop in a daemon thread"""
+        thread = threading.Thread(target=lambda: asyncio.run(self.serve()))
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    async def handler(self, ws):
+        """Serve one client connection"""
+        try:
+            async for message in ws:
+                request = json.loads(message)
+                response = self.handle_request(ws, request)
+                if response is not None:
+                    if 'req_id' in request:
+                        response['req_id'] = request['req_id']
+                    await ws.send(json.dumps(response))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for connections in self.subscribers.values():
+                connections.pop(ws, None)
+            for connections in self.account_subscribers.values():
+                connections.pop(ws, None)
+
+    def handle_request(self, ws, request):
+        """Build the response for one request"""
+        if 'authorize' in request:
+            return {
+                'msg_type': 'authorize',
+                'authorize': {
+                    'loginid': 'VRTC0000001',
+                    'balance': self.balance,
+                    'currency': 'USD',
+                    'is_virtual': 1
+                },
+                'echo_req': request
+            }
+
+        if 'active_symbols' in request:
+            return {
+                'msg_type': 'active_symbols',
+                'active_symbols': [self.symbol_body(sim) for sim in self.symbols.values()],
+                'echo_req': request
+            }
+
+        if 'ticks' in request:
+            symbol = request['ticks']
+            if symbol not in self.symbols:
+                return self.error(request, 'InvalidSymbol', f'Symbol {symbol} is invalid.')
+
+            sub_id = f"sub-{next(self.ids)}"
+            if request.get('subscribe'):
+                self.subscribers[symbol][ws] = (sub_id, request.get('req_id'))
+
+            sim = self.symbols[symbol]
+            epoch, quote = sim.history[-1] if sim.history else sim.next_tick()
+            return {
+                'msg_type': 'tick',
+                'tick': self.tick_body(sim, epoch, quote, sub_id),
+                'subscription': {'id': sub_id},
+                'echo_req': request
+            }
+
+        if 'forget_all' in request:
+            streams = list(self.subscribers.values()) + list(self.account_subscribers.values())
+            forgotten = [connections.pop(ws)[0] for connections in streams if ws in connections]
+            return {'msg_type': 'forget_all', 'forget_all': forgotten, 'echo_req': request}
+
+        if 'forget' in request:
+            found = 0
+            for connections in list(self.subscribers.values()) + list(self.account_subscribers.values()):
+                entry = connections.get(ws)
+                if entry and entry[0] == request['forget']:
+                    connections.pop(ws)
+                    found = 1
+            return {'msg_type': 'forget', 'forget': found, 'echo_req': request}
+
+        if 'ticks_history' in request:
+            response = self.ticks_history(request)
+            symbol = request['ticks_history']
+            if request.get('subscribe') and 'error' not in response:
+                sub_id = f"sub-{next(self.ids)}"
+                self.subscribers[symbol][ws] = (sub_id, request.get('req_id'))
+                response['subscription'] = {'id': sub_id}
+            return response
+
+        if 'proposal_open_contract' in request:
+            return self.open_contracts(ws, request)
+
+        if 'balance' in request:
+            response = {
+                'msg_type': 'balance',
+                'balance': self.balance_body(),
+                'echo_req': request
+            }
+            if request.get('subscribe'):
+                sub_id = f"sub-{next(self.ids)}"
+                self.account_subscribers['balance'][ws] = (sub_id, request.get('req_id'))
+                response['balance']['id'] = sub_id
+                response['subscription'] = {'id': sub_id}
+            return response
+
+        if 'proposal' in request:
+            amount = float(request.get('amount', 0))
+            sim = self.symbols.get(request.get('symbol'))
+            if sim is None:
+                return self.error(request, 'InvalidSymbol', f"Symbol {request.get('symbol')} is invalid.")
+            if request.get('contract_type') not in CONTRACT_TYPES:
+                return self.error(request, 'InvalidContractType',
+                                  f"Contract type {request.get('contract_type')} is not offered.")
+
+            proposal_id = f"prop-{next(self.ids)}"
+            self.proposals[proposal_id] = request
+            return {
+                'msg_type': 'proposal',
+                'proposal': {
+                    'id': proposal_id,
+                    'ask_price': amount,
+                    'payout': round(amount * (1 + self.payout_ratio), 2),
+                    'spot': sim.price
+                },
+                'echo_req': request
+            }
+
+        if 'buy' in request:
+            proposal = self.proposals.pop(request['buy'], None)
+            if proposal is None:
+                return self.error(request, 'InvalidContractProposal', 'Proposal not found or expired.')
+
+            price = float(request.get('price', 0))
+            if price > self.balance:
+                return self.error(request, 'InsufficientBalance', 'Your account balance is insufficient.')
+            self.balance -= price
+
+            contract_id = next(self.ids)
+            contract = self.contracts[contract_id] = {
+                'ws': ws,
+                'contract_id': contract_id,
+                'underlying': proposal['symbol'],
+                'contract_type': proposal['contract_type'],
+                'barrier': proposal.get('barrier'),
+                'buy_price': price,
+                'payout': round(price * (1 + self.payout_ratio), 2),
+                'ticks_left': int(proposal.get('duration', 5)),
+                'entry_spot': None,
+                'purchase_time': int(time.time())
+            }
+            # Buying changes the balance and opens a contract
+            asyncio.get_running_loop().create_task(self.push_account(contract))
+            return {
+                'msg_type': 'buy',
+                'buy': {
+                    'contract_id': contract_id,
+                    'transaction_id': next(self.ids),
+                    'buy_price': price,
+                    'payout': contract['payout'],
+                    'balance_after': round(self.balance, 2),
+                    'start_time': contract['purchase_time'],
+                    'longcode': f"Simulated contract {request['buy']}"
+                },
+                'echo_req': request
+            }
+
+        if 'ping' in request:
+            return {'msg_type': 'ping', 'ping': 'pong', 'echo_req': request}
+
+        return self.error(request, 'UnrecognisedRequest', 'Unrecognised request.')
+
+    def open_contracts(self, ws, request):
+        """Answer proposal_open_contract for one contract or all open ones"""
+        response = {'msg_type': 'proposal_open_contract', 'echo_req': request}
+        if request.get('subscribe'):
+            sub_id = f"sub-{next(self.ids)}"
+            self.account_subscribers['proposal_open_contract'][ws] = (sub_id, request.get('req_id'))
+            response['subscription'] = {'id': sub_id}
+
+        contract = self.contracts.get(request.get('contract_id'))
+        if contract is None:
+            # Deriv acknowledges an all-contracts subscription with an empty update
+            owned = [c for c in self.contracts.values() if c['ws'] is ws]
+            contract = owned[0] if owned else None
+        response['proposal_open_contract'] = self.contract_body(contract) if contract else {}
+        return response
+
+    def balance_body(self):
+        return {'balance': round(self.balance, 2), 'currency': 'USD', 'loginid': 'VRTC0000001'}
+
+    def contract_body(self, contract, exit_spot=None, won=None):
+        body = {key: value for key, value in contract.items() if key not in ('ws', 'ticks_left')}
+        body.update({
+            'currency': 'USD',
+            'is_sold': int(won is not None),
+            'status': 'open' if won is None else ('won' if won else 'lost'),
+            'profit': 0.0 if won is None else round(
+                (contract['payout'] if won else 0.0) - contract['buy_price'], 2)
+        })
+        if exit_spot is not None:
+            body['exit_tick'] = exit_spot
+        return body
+
+    async def push_account(self, contract, exit_spot=None, won=None):
+        """Send contract and balance updates to the owning connection"""
+        ws = contract['ws']
+        messages = []
+
+        entry = self.account_subscribers['proposal_open_contract'].get(ws)
+        if entry:
+            messages.append((entry, {
+                'msg_type': 'proposal_open_contract',
+                'proposal_open_contract': self.contract_body(contract, exit_spot, won),
+                'echo_req': {'proposal_open_contract': 1, 'subscribe': 1}
+            }))
+
+        # A losing contract doesn't move the balance again at settlement
+        entry = self.account_subscribers['balance'].get(ws)
+        if entry and won is not False:
+            messages.append((entry, {
+                'msg_type': 'balance',
+                'balance': self.balance_body(),
+                'echo_req': {'balance': 1, 'subscribe': 1}
+            }))
+
+        for (sub_id, req_id), message in messages:
+            message['subscription'] = {'id': sub_id}
+            if req_id is not None:
+                message['req_id'] = req_id
+            try:
+                await ws.send(json.dumps(message))
+            except websockets.ConnectionClosed:
+                pass
+
+    async def advance_contracts(self, sim, quote):
+        """Move contracts on this symbol one tick forward, settling expired ones"""
+        for contract_id, contract in list(self.contracts.items()):
+            if contract['underlying'] != sim.symbol:
+                continue
+            # The first tick after purchase is the entry spot
+            if contract['entry_spot'] is None:
+                contract['entry_spot'] = quote
+                continue
+            contract['ticks_left'] -= 1
+            if contract['ticks_left'] > 0:
+                continue
+
+            won = self.contract_won(contract, quote, sim.pip_size)
+            if won:
+                self.balance += contract['payout']
+            del self.contracts[contract_id]
+            await self.push_account(contract, quote, won)
+
+    def contract_won(self, contract, exit_spot, pip_size):
+        contract_type = contract['contract_type']
+        if contract_type == 'CALL':
+            return exit_spot > contract['entry_spot']
+        if contract_type == 'PUT':
+            return exit_spot < contract['entry_spot']
+
+        digit = int(round(exit_spot * 10 ** pip_size)) % 10
+        barrier = int(contract['barrier'] or 0)
+        if contract_type == 'DIGITOVER':
+            return digit > barrier
+        if contract_type == 'DIGITUNDER':
+            return digit < barrier
+        if contract_type == 'DIGITEVEN':
+            return digit % 2 == 0
+        return digit % 2 == 1
+
+    def ticks_history(self, request):
+        """Answer a ticks_history request from the stored history"""
+        symbol = request['ticks_history']
+        if symbol not in self.symbols:
+            return self.error(request, 'InvalidSymbol', f'Symbol {symbol} is invalid.')
+
+        history = list(self.symbols[symbol].history)
+        start = int(request.get('start', 0) or 0)
+        end = request.get('end', 'latest')
+        end = math.inf if end == 'latest' else int(end)
+        history = [t for t in history if start <= t[0] <= end]
+
+        count = int(request.get('count', 5000))
+        history = history[-count:]
+
+        return {
+            'msg_type': 'history',
+            'history': {
+                'times': [t[0] for t in history],
+                'prices': [t[1] for t in history]
+            },
+            'pip_size': self.symbols[symbol].pip_size,
+            'echo_req': request
+        }
+
+    def error(self, request, code, message):
+        return {
+            'msg_type': next(iter(request), 'error'),
+            'error': {'code': code, 'message': message},
+            'echo_req': request
+        }
+
+    def symbol_body(self, sim):
+        """active_symbols entry (every simulated index is a continuous one)"""
+        return {
+            'symbol': sim.symbol,
+            'display_name': f'Simulated {sim.symbol} Index',
+            'market': 'synthetic_index',
+            'submarket': 'random_index',
+            'pip': 10 ** -sim.pip_size,
+            'display_decimals': sim.pip_size,
+            'exchange_is_open': 1,
+            'is_trading_suspended': 0
+        }
+
+    def tick_body(self, sim, epoch, quote, sub_id):
+        return {
+            'symbol': sim.symbol,
+            'epoch': epoch,
+            'quote': quote,
+            'pip_size': sim.pip_size,
+            'id': sub_id
+        }
+
+    async def publish(self, sim, epoch, quote):
+        """Send one tick to every connection subscribed to its symbol"""
+        for ws, (sub_id, req_id) in list(self.subscribers[sim.symbol].items()):
+            message = {
+                'msg_type': 'tick',
+                'tick': self.tick_body(sim, epoch, quote, sub_id),
+                'subscription': {'id': sub_id},
+                'echo_req': {'ticks': sim.symbol, 'subscribe': 1}
+            }
+            if req_id is not None:
+                message['req_id'] = req_id
+            try:
+                await ws.send(json.dumps(message))
+            except websockets.ConnectionClosed:
+                self.subscribers[sim.symbol].pop(ws, None)
+        self.ticks_sent += 1
+
+        if self.contracts:
+            await self.advance_contracts(sim, quote)
+
+    async def generate_ticks(self):
+        """Emit random-walk ticks at `rate` ticks/sec spread over all symbols"""
+        symbols = list(self.symbols.values())
+        interval = 1 / self.rate
+        started = time.monotonic()
+        emitted = 0
+
+        while True:
+            # Emit every tick that is due, then sleep until the next one
+            due = int((time.monotonic() - started) / interval)
+            while emitted < due:
+                sim = symbols[emitted % len(symbols)]
+                epoch, quote = sim.next_tick()
+                await self.publish(sim, epoch, quote)
+                emitted += 1
+            await asyncio.sleep(max(0.0, started + (emitted + 1) * interval - time.monotonic()))
+
+    async def replay_ticks(self):
+        """Replay `symbol,epoch,quote` rows at `rate` ticks/sec"""
+        with open(self.replay_file, newline='') as f:
+            rows = [row for row in csv.reader(f) if row and not row[0].startswith('#')]
+
+        if rows and rows[0][0] == 'symbol':
+            rows = rows[1:]
+
+        interval = 1 / self.rate
+        started = time.monotonic()
+        for i, (symbol, epoch, quote) in enumerate(rows):
+            sim = self.symbols.get(symbol)
+            if sim is None:
+                sim = self.symbols[symbol] = SimulatedSymbol(symbol, 0.0, rng=self.rng)
+                self.subscribers[symbol] = {}
+            sim.record(int(epoch), float(quote))
+            await self.publish(sim, int(epoch), float(quote))
+
+            delay = started + (i + 1) * interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        print(f"Replay finished after {len(rows)} ticks")
+        await asyncio.Future()  # Keep serving history/proposals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Deriv WebSocket simulator')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--rate', type=float, default=10,
+                        help='total ticks per second across all symbols')
+    parser.add_argument('--symbols', type=int, default=0,
+                        help='number of extra synthetic symbols (SIM1, SIM2, ...)')
+    parser.add_argument('--replay', help='CSV file of symbol,epoch,quote rows')
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    symbols = dict(DEFAULT_SYMBOLS)
+    for i in range(1, args.symbols + 1):
+        symbols[f'SIM{i}'] = random.Random(i).choice([0.1, 0.25, 0.5, 0.75, 1.0])
+
+    simulator = DerivSimulator(args.host, args.port, symbols, args.rate,
+                               replay_file=args.replay, seed=args.seed)
+    try:
+        asyncio.run(simulator.serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+import math
+from decimal import Decimal
+import numpy as np
+
+# Decimal places quoted per symbol; ticks carry their own `pip_size`, which
+# always takes precedence over this table
+DEFAULT_PIP_SIZES = {
+    'R_10': 3, 'V10': 3,
+    'R_25': 3, 'V25': 3,
+    'R_50': 4, 'V50': 4,
+    'R_75': 4, 'V75': 4,
+    'R_100': 2, 'V100': 2
+}
+
+def pip_size_from_pip(pip):
+    """Decimal places from an active_symbols `pip` value (0.01 -> 2, 1e-05 -> 5)"""
+    return max(0, round(-math.log10(float(pip))))
+
+def pip_size_from_quote(quote):
+    """Decimal places of a quote as sent by Deriv
+
+    A raw string keeps its trailing zeros ('1234.50' -> 2). A number has
+    lost them, so it only gives the smallest decimal count that represents
+    it (1234.50 -> 1); get_pip_size prefers every listed source to that.
+    """
+    if isinstance(quote, str):
+        return max(0, -Decimal(quote).as_tuple().exponent)
+    return infer_pip_size([quote])
+
+def infer_pip_size(prices, max_decimals=6):
+    """Smallest decimal count that represents every price exactly"""
+    prices = np.asarray(prices, dtype=np.float64)
+    for decimals in range(max_decimals + 1):
+        scaled = prices * 10 ** decimals
+        if np.all(np.abs(scaled - np.rint(scaled)) < 1e-6):
+            return decimals
+    return max_decimals
+
+def get_pip_size(symbol, tick=None, prices=None, listed=None):
+    """Pip size for a symbol, most authoritative source first
+
+    The tick's pip_size, then `listed` (from active_symbols), a quote sent
+    as a string, the defaults table, and last inference from numeric
+    prices, which can only under-estimate (trailing zeros are lost).
+    """
+    if tick is not None and tick.get('pip_size') is not None:
+        return int(tick['pip_size'])
+    if listed is not None:
+        return int(listed)
+    if tick is not None and isinstance(tick.get('quote'), str):
+        return pip_size_from_quote(tick['quote'])
+    if symbol in DEFAULT_PIP_SIZES:
+        return DEFAULT_PIP_SIZES[symbol]
+    if prices is None and tick is not None and 'quote' in tick:
+        prices = [tick['quote']]
+    if prices is not None and len(prices):
+        return infer_pip_size(prices)
+    return 2
+
+def last_digits(prices, pip_size):
+    """Last quoted digit of every price, using integer arithmetic"""
+    scaled = np.rint(np.asarray(prices, dtype=np.float64) * 10 ** pip_size)
+    return scaled.astype(np.int64) % 10
+
+def last_digit(price, pip_size):
+    """Last quoted digit of a single price"""
+    return int(round(price * 10 ** pip_size)) % 10
+
+
+class DigitStats:
+    """Rolling last-digit statistics for one symbol, O(1) per tick
+
+    Keeps a 0-9 histogram, high (5-9) and even counts over the last
+    `window` digits, plus the current same-parity streak.
+    """
+    def __init__(self, pip_size, window=50, streak_window=10):
+        self.pip_size = pip_size
+        self.scale = 10 ** pip_size
+        self.window = window
+        self.streak_window = streak_window
+        self.reset()
+
+    def reset(self):
+        """Forget all digits"""
+        self.digits = np.zeros(self.window, dtype=np.int8)
+        self.pos = 0
+        self.count = 0
+        self.histogram = np.zeros(10, dtype=np.int64)
+        self.high_count = 0
+        self.even_count = 0
+        self.parity_streak = 0
+        self.last_digit = None
+
+    def update(self, price):
+        """Add one price and return its last digit"""
+        digit = int(round(price * self.scale)) % 10
+
+        # Evict the digit leaving the window
+        if self.count == self.window:
+            old = int(self.digits[self.pos])
+            self.histogram[old] -= 1
+            if old >= 5:
+                self.high_count -= 1
+            if old % 2 == 0:
+                self.even_count -= 1
+        else:
+            self.count += 1
+
+        self.digits[self.pos] = digit
+        self.pos = (self.pos + 1) % self.window
+        self.histogram[digit] += 1
+        if digit >= 5:
+            self.high_count += 1
+        if digit % 2 == 0:
+            self.even_count += 1
+
+        # Same-parity streak
+        if self.last_digit is not None and digit % 2 == self.last_digit % 2:
+            self.parity_streak += 1
+        else:
+            self.parity_streak = 1
+        self.last_digit = digit
+
+        return digit
+
+    def load(self, prices):
+        """Reset from a price history (oldest first), vectorized"""
+        self.reset()
+        if not len(prices):
+            return
+
+        digits = last_digits(prices, self.pip_size)
+
+        # Parity streak over the whole history
+        parity = digits % 2
+        changes = np.flatnonzero(parity != parity[-1])
+        self.parity_streak = len(digits) - (int(changes[-1]) + 1 if len(changes) else 0)
+        self.last_digit = int(digits[-1])
+
+        recent = digits[-self.window:]
+        self.count = len(recent)
+        self.digits[:self.count] = recent
+        self.pos = self.count % self.window
+        self.histogram = np.bincount(recent, minlength=10).astype(np.int64)
+        self.high_count = int(self.histogram[5:].sum())
+        self.even_count = int(self.histogram[::2].sum())
+
+    @property
+    def low_count(self):
+        return self.count - self.high_count
+
+    @property
+    def dominance(self):
+        """High digit (5-9) percentage over the window"""
+        if not self.count:
+            return 50.0
+        return (self.high_count / self.count) * 100
+
+    @property
+    def even_dominance(self):
+        """Even digit percentage over the window"""
+        if not self.count:
+            return 50.0
+        return (self.even_count / self.count) * 100
+
+    @property
+    def streak(self):
+        """Same-parity streak, capped at streak_window like the batch version"""
+        return min(self.parity_streak, self.streak_window)
+
+    def frequencies(self):
+        """Share of each digit 0-9 over the window"""
+        if not self.count:
+            return [0.0] * 10
+        return (self.histogram / self.count).tolist()
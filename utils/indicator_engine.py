@@ -0,0 +1,288 @@
+import math
+
+# Batch reference for parity checks, built once on first use (imported late:
+# score_calculator reaches this module through the rule engine)
+_batch_calculator = None
+
+
+def batch_calculator():
+    global _batch_calculator
+    if _batch_calculator is None:
+        from strategies.score_calculator import ScoreCalculator
+        _batch_calculator = ScoreCalculator()
+    return _batch_calculator
+
+
+class StreamingEMA:
+    """EMA seeded with the first price, updated in O(1)"""
+    def __init__(self, period):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.count = 0
+        self.ema = 0.0
+        self.last_price = 0.0
+
+    def update(self, price):
+        if self.count == 0:
+            self.ema = price
+        else:
+            self.ema = (price - self.ema) * self.multiplier + self.ema
+        self.count += 1
+        self.last_price = price
+
+    @property
+    def value(self):
+        # Same as the batch version: raw price until we have `period` ticks
+        if self.count < self.period:
+            return self.last_price
+        return self.ema
+
+
+class StreamingRSI:
+    """Simple-average RSI over the last `period` price changes, O(1) per tick"""
+    def __init__(self, period):
+        self.period = period
+        self.deltas = [0.0] * period
+        self.pos = 0
+        self.count = 0  # Number of prices seen
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        # Non-zero counts let us snap the running sums back to exactly 0.0
+        # once the last gain/loss leaves the window (avoids float residue)
+        self.gain_count = 0
+        self.loss_count = 0
+        self.last_price = None
+
+    def update(self, price):
+        if self.last_price is not None:
+            delta = price - self.last_price
+            old = self.deltas[self.pos]
+
+            # Drop the delta leaving the window
+            if self.count > self.period:
+                if old > 0:
+                    self.gain_sum -= old
+                    self.gain_count -= 1
+                elif old < 0:
+                    self.loss_sum += old
+                    self.loss_count -= 1
+
+            # Add the new delta
+            if delta > 0:
+                self.gain_sum += delta
+                self.gain_count += 1
+            elif delta < 0:
+                self.loss_sum -= delta
+                self.loss_count += 1
+
+            if not self.gain_count:
+                self.gain_sum = 0.0
+            if not self.loss_count:
+                self.loss_sum = 0.0
+
+            self.deltas[self.pos] = delta
+            self.pos = (self.pos + 1) % self.period
+
+        self.last_price = price
+        self.count += 1
+
+    @property
+    def value(self):
+        if self.count < self.period + 1:
+            return 50
+
+        if self.loss_sum <= 0:
+            return 100 if self.gain_sum > 0 else 50
+
+        rs = self.gain_sum / self.loss_sum
+        return 100 - (100 / (1 + rs))
+
+
+class RollingStats:
+    """Rolling mean/variance over the last `window` prices (population std)"""
+    def __init__(self, window=20, resync_every=1000):
+        self.window = window
+        self.values = [0.0] * window
+        self.pos = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.resync_every = resync_every
+        self.updates = 0
+
+    def update(self, price):
+        if self.count < self.window:
+            # Welford insert while the window fills up
+            self.count += 1
+            delta = price - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (price - self.mean)
+        else:
+            # Replace the oldest value in place
+            old = self.values[self.pos]
+            old_mean = self.mean
+            self.mean += (price - old) / self.window
+            self.m2 += (price - old) * (price - self.mean + old - old_mean)
+
+        self.values[self.pos] = price
+        self.pos = (self.pos + 1) % self.window
+
+        # Periodically recompute from the window to stop rounding drift
+        self.updates += 1
+        if self.updates % self.resync_every == 0:
+            self.resync()
+
+    def resync(self):
+        """Recompute mean/M2 exactly from the stored window"""
+        values = self.window_values()
+        if not values:
+            return
+        self.mean = sum(values) / len(values)
+        self.m2 = sum((v - self.mean) ** 2 for v in values)
+
+    def window_values(self):
+        """Stored prices, oldest first"""
+        if self.count < self.window:
+            return self.values[:self.count]
+        return self.values[self.pos:] + self.values[:self.pos]
+
+    def back(self, n):
+        """Price n ticks back (0 = latest)"""
+        return self.values[(self.pos - 1 - n) % self.window]
+
+    @property
+    def std(self):
+        if not self.count:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / self.count)
+
+
+class SymbolIndicators:
+    """Streaming indicator state for one symbol"""
+    def __init__(self):
+        self.count = 0
+        self.ema = {period: StreamingEMA(period) for period in (5, 10, 20)}
+        self.rsi = {period: StreamingRSI(period) for period in (4, 14)}
+        self.stats = RollingStats(20)
+
+    def update(self, price):
+        """Feed one tick, O(1)"""
+        self.count += 1
+        for ema in self.ema.values():
+            ema.update(price)
+        for rsi in self.rsi.values():
+            rsi.update(price)
+        self.stats.update(price)
+
+    def momentum(self):
+        """5-tick momentum"""
+        if self.count < 5:
+            return 0
+        return self.stats.back(0) - self.stats.back(4)
+
+    def bollinger(self):
+        """Bollinger Bands position"""
+        if self.count < 20:
+            return {'position': 0.5, 'upper': 0, 'lower': 0}
+
+        sma = self.stats.mean
+        std = self.stats.std
+        upper = sma + 2 * std
+        lower = sma - 2 * std
+        current = self.stats.back(0)
+
+        # Position relative to bands (0 at lower, 1 at upper)
+        if upper - lower > 0:
+            position = (current - lower) / (upper - lower)
+        else:
+            position = 0.5
+
+        return {
+            'position': position,
+            'upper': upper,
+            'lower': lower,
+            'current': current
+        }
+
+    def values(self):
+        return {
+            'rsi_14': self.rsi[14].value,
+            'rsi_4': self.rsi[4].value,
+            'ema_5': self.ema[5].value,
+            'ema_10': self.ema[10].value,
+            'ema_20': self.ema[20].value,
+            'momentum': self.momentum(),
+            'bollinger': self.bollinger()
+        }
+
+
+class IndicatorEngine:
+    """Per-symbol streaming RSI(4/14), EMA(5/10/20) and 20-tick Bollinger
+
+    With parity_check enabled every update is compared against the batch
+    ScoreCalculator functions over the same price window.
+    """
+    def __init__(self, parity_check=False, tolerance=1e-6):
+        self.states = {}
+        self.parity_check = parity_check
+        self.tolerance = tolerance
+        self.parity_failures = 0
+
+    def update(self, symbol, price, prices=None):
+        """Feed one tick for a symbol and return its indicator values
+
+        `prices` is the symbol's tick window (oldest first, including this
+        tick) and is only used by the parity check.
+        """
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = SymbolIndicators()
+
+        state.update(price)
+        values = state.values()
+
+        if self.parity_check and prices is not None:
+            self.check_parity(symbol, values, prices)
+
+        return values
+
+    def get(self, symbol):
+        """Current indicator values for a symbol (None if never updated)"""
+        state = self.states.get(symbol)
+        return state.values() if state else None
+
+    def reset(self, symbol=None):
+        """Forget streaming state for one symbol or all of them"""
+        if symbol is None:
+            self.states.clear()
+        else:
+            self.states.pop(symbol, None)
+
+    def check_parity(self, symbol, values, prices):
+        """Compare streaming values with the batch implementation"""
+        batch = batch_calculator()
+        prices = list(prices)
+
+        # The batch EMA is seeded from the oldest buffered tick, so it only
+        # matches exactly while the buffer still holds the full history
+        expected = {
+            'rsi_14': batch.calculate_rsi(prices, 14),
+            'rsi_4': batch.calculate_rsi(prices, 4),
+            'momentum': batch.calculate_momentum(prices),
+            'bollinger': batch.calculate_bollinger(prices)['position']
+        }
+        if len(prices) == self.states[symbol].count:
+            for period in (5, 10, 20):
+                expected[f'ema_{period}'] = batch.calculate_ema(prices, period)
+
+        mismatches = []
+        for key, want in expected.items():
+            got = values[key]['position'] if key == 'bollinger' else values[key]
+            if abs(got - want) > self.tolerance * max(1.0, abs(want)):
+                mismatches.append(f"{key}: streaming={got} batch={want}")
+
+        if mismatches:
+            self.parity_failures += 1
+            print(f"Indicator parity mismatch for {symbol}: {'; '.join(mismatches)}")
+
+        return not mismatches
@@ -0,0 +1,128 @@
+import time
+
+# Sub-buckets per power of two: values are kept to within ~1/16 (6%)
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+# Largest tracked value, in microseconds (larger ones land in the last bucket)
+MAX_VALUE_US = 60_000_000
+
+# Tick pipeline stages, each timed from the moment the message arrived
+STAGES = ['parse', 'store', 'indicators', 'scoring', 'decision', 'order_send']
+
+QUANTILES = [0.5, 0.9, 0.99, 0.999]
+
+
+def bucket_index(value):
+    """Log-linear bucket of a non-negative integer (HDR histogram layout)"""
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    if shift <= 0:
+        return value
+    return shift * SUB_BUCKET_HALF + (value >> shift)
+
+
+def bucket_upper(index):
+    """Largest value that maps to a bucket"""
+    if index < 2 * SUB_BUCKET_HALF:
+        return index
+    shift = index // SUB_BUCKET_HALF - 1
+    return ((index - shift * SUB_BUCKET_HALF) << shift) + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram in microseconds
+
+    Counts live in one preallocated list of log-linear buckets (a few
+    hundred ints, whatever the number of samples), so recording is an
+    index computation and an increment.
+    """
+    def __init__(self, max_value=MAX_VALUE_US):
+        self.max_index = bucket_index(max_value)
+        self.counts = [0] * (self.max_index + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        index = bucket_index(value)
+        self.counts[index if index < self.max_index else self.max_index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-quantile (0 if empty)"""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(bucket_upper(index), self.max)
+        return self.max
+
+    def reset(self):
+        self.counts = [0] * (self.max_index + 1)
+        self.count = self.total = self.max = 0
+
+
+class LatencyTracker:
+    """Tick-to-decision latency per stage, plus tick counts/rates per symbol
+
+    Each stage records now - received, where `received` is the
+    perf_counter_ns() stamp taken when the tick's message arrived.
+    """
+    def __init__(self, stages=STAGES, rate_alpha=0.1):
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+        self.ticks = {}  # symbol -> count
+        self.tick_times = {}  # symbol -> last arrival (perf_counter_ns)
+        self.tick_intervals = {}  # symbol -> smoothed seconds between ticks
+        self.rate_alpha = rate_alpha
+
+    def record(self, stage, received):
+        """Record the time since `received` for a stage"""
+        if received is not None:
+            self.histograms[stage].record((time.perf_counter_ns() - received) // 1000)
+
+    def count_tick(self, symbol, received):
+        """Count a tick and update the symbol's smoothed tick rate"""
+        self.ticks[symbol] = self.ticks.get(symbol, 0) + 1
+        last = self.tick_times.get(symbol)
+        self.tick_times[symbol] = received
+        if last is not None:
+            interval = (received - last) / 1e9
+            previous = self.tick_intervals.get(symbol)
+            self.tick_intervals[symbol] = interval if previous is None else \
+                previous + self.rate_alpha * (interval - previous)
+
+    def tick_rate(self, symbol):
+        """Smoothed ticks per second for a symbol"""
+        interval = self.tick_intervals.get(symbol)
+        return 1.0 / interval if interval else 0.0
+
+    def prometheus(self, prefix='deriv'):
+        """Prometheus text lines for the latency summaries and tick counters"""
+        lines = [
+            f'# HELP {prefix}_tick_latency_seconds Time from tick arrival to each pipeline stage',
+            f'# TYPE {prefix}_tick_latency_seconds summary'
+        ]
+        for stage, histogram in self.histograms.items():
+            for q in QUANTILES:
+                lines.append(f'{prefix}_tick_latency_seconds{{stage="{stage}",quantile="{q}"}} '
+                             f'{histogram.percentile(q) / 1e6:.6f}')
+            lines.append(f'{prefix}_tick_latency_seconds_sum{{stage="{stage}"}} {histogram.total / 1e6:.6f}')
+            lines.append(f'{prefix}_tick_latency_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+        lines += [
+            f'# HELP {prefix}_ticks_total Ticks received per symbol',
+            f'# TYPE {prefix}_ticks_total counter'
+        ]
+        lines += [f'{prefix}_ticks_total{{symbol="{s}"}} {n}' for s, n in sorted(self.ticks.items())]
+
+        lines += [
+            f'# HELP {prefix}_tick_rate Smoothed ticks per second per symbol',
+            f'# TYPE {prefix}_tick_rate gauge'
+        ]
+        lines += [f'{prefix}_tick_rate{{symbol="{s}"}} {self.tick_rate(s):.3f}' for s in sorted(self.ticks)]
+        return lines
@@ -0,0 +1,248 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    time TEXT NOT NULL,
+    day TEXT NOT NULL,
+    bot_id INTEGER,
+    symbol TEXT,
+    direction TEXT,
+    stake REAL,
+    contract_id TEXT,
+    buy_price REAL,
+    payout REAL,
+    pnl REAL,
+    status TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_day ON trades (day);
+CREATE INDEX IF NOT EXISTS trades_contract ON trades (contract_id);
+"""
+
+INSERT_TRADE = """
+INSERT INTO trades (time, day, bot_id, symbol, direction, stake, contract_id,
+                    buy_price, payout, pnl, status, data)
+VALUES (:time, :day, :bot_id, :symbol, :direction, :stake, :contract_id,
+        :buy_price, :payout, :pnl, :status, :data)
+"""
+
+SETTLE_TRADE = "UPDATE trades SET pnl = :pnl, status = 'settled' WHERE contract_id = :contract_id"
+
+
+def sqlite_path(database_url):
+    """Database file for a sqlite:/// URL (other backends fall back to trading.db)"""
+    if database_url.startswith('sqlite:///'):
+        return database_url[len('sqlite:///'):] or ':memory:'
+    print(f"Trade journal only supports SQLite, using trading.db instead of {database_url.split(':')[0]}")
+    return 'trading.db'
+
+
+SECONDS_PER_DAY = 86400
+
+
+def utc_day(moment=None):
+    """UTC date string used to bucket daily PnL (trading hours are UTC)"""
+    moment = moment or datetime.now(timezone.utc)
+    return moment.strftime('%Y-%m-%d')
+
+
+class DailyTotals:
+    """Running PnL aggregate for one UTC day"""
+    __slots__ = ('day', 'ends', 'pnl', 'trades', 'wins', 'losses', 'staked')
+
+    def __init__(self, day, pnl=0.0, trades=0, wins=0, losses=0, staked=0.0):
+        self.day = day
+        # Unix time of the next UTC midnight, so rollover is one comparison
+        self.ends = (int(time.time()) // SECONDS_PER_DAY + 1) * SECONDS_PER_DAY
+        self.pnl = pnl
+        self.trades = trades
+        self.wins = wins
+        self.losses = losses
+        self.staked = staked
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class TradeLogger:
+    """Trade journal backed by SQLite in WAL mode
+
+    log_trade() and settle_trade() only update the in-memory daily totals
+    and append to a queue; a writer thread flushes the queue in one
+    transaction every flush_interval seconds (or as soon as batch_size
+    records are waiting). Daily stop-loss/profit-target checks read
+    today_pnl(), which is O(1) and never touches the database.
+
+    Orders that were rejected or whose buy failed are journaled with
+    status 'failed' and left out of the daily totals.
+    """
+    def __init__(self, database_url='sqlite:///trading.db', flush_interval=0.5, batch_size=500):
+        self.path = sqlite_path(database_url)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue = deque()
+        self.lock = threading.Lock()  # Guards the daily totals
+        self.db_lock = threading.Lock()  # Serializes use of the connection
+        self.wakeup = threading.Event()
+        self.running = True
+        self.records_written = 0
+
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+
+        # Restore today's totals so a restart keeps counting toward the limits
+        self.totals = self.load_totals(utc_day())
+
+        self.writer = threading.Thread(target=self.writer_loop)
+        self.writer.daemon = True
+        self.writer.start()
+        atexit.register(self.close)
+
+    def load_totals(self, day):
+        with self.db_lock:
+            row = self.db.execute(
+                "SELECT COALESCE(SUM(pnl), 0), COUNT(*), "
+                "COALESCE(SUM(pnl > 0), 0), COALESCE(SUM(pnl < 0), 0), "
+                "COALESCE(SUM(stake), 0) FROM trades WHERE day = ? AND COALESCE(status, '') != 'failed'",
+                (day,)
+            ).fetchone()
+        return DailyTotals(day, *row)
+
+    def current_totals(self):
+        """Today's totals, rolling over at UTC midnight (caller holds lock)"""
+        if time.time() >= self.totals.ends:
+            self.totals = DailyTotals(utc_day())
+        return self.totals
+
+    def log_trade(self, trade):
+        """Record a trade without blocking on the database"""
+        result = trade.get('result') or {}
+        moment = trade.get('time') or datetime.now(timezone.utc)
+        if isinstance(moment, str):
+            moment = datetime.fromisoformat(moment)
+        pnl = trade.get('pnl')
+        failed = result.get('success') is False
+        if failed:
+            status = 'failed'
+        elif pnl is not None:
+            status = 'settled'
+        else:
+            status = trade.get('status', 'open')
+
+        record = {
+            'time': moment.isoformat(),
+            'day': utc_day(moment),
+            'bot_id': trade.get('bot_id'),
+            'symbol': trade.get('symbol') or trade.get('market'),
+            'direction': result.get('direction'),
+            'stake': trade.get('stake'),
+            'contract_id': str(result['contract_id']) if result.get('contract_id') else None,
+            'buy_price': result.get('buy_price'),
+            'payout': result.get('payout'),
+            'pnl': pnl,
+            'status': status,
+            'data': trade  # Serialized by the writer thread
+        }
+
+        with self.lock:
+            totals = self.current_totals()
+            # Only trades that were placed count toward the day
+            if record['day'] == totals.day and not failed:
+                totals.trades += 1
+                totals.staked += record['stake'] or 0
+                if pnl is not None:
+                    self.add_pnl(totals, pnl)
+
+        self.enqueue((INSERT_TRADE, record))
+
+    def settle_trade(self, contract_id, pnl):
+        """Record the profit/loss of a finished contract"""
+        with self.lock:
+            self.add_pnl(self.current_totals(), pnl)
+        self.enqueue((SETTLE_TRADE, {'contract_id': str(contract_id), 'pnl': pnl}))
+
+    def add_pnl(self, totals, pnl):
+        totals.pnl += pnl
+        if pnl > 0:
+            totals.wins += 1
+        elif pnl < 0:
+            totals.losses += 1
+
+    def enqueue(self, item):
+        self.queue.append(item)
+        if len(self.queue) >= self.batch_size:
+            self.wakeup.set()
+
+    def today_pnl(self):
+        """Realized PnL for the current UTC day (O(1))"""
+        totals = self.totals
+        return totals.pnl if time.time() < totals.ends else 0.0
+
+    def today_stats(self):
+        """Copy of the current day's totals"""
+        with self.lock:
+            return self.current_totals().as_dict()
+
+    def writer_loop(self):
+        while self.running:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Trade journal error: {e}")
+
+    def flush(self):
+        """Write every queued record in a single transaction"""
+        with self.db_lock:
+            batch = [self.queue.popleft() for _ in range(len(self.queue))]
+            if not batch:
+                return
+
+            for _, params in batch:
+                if isinstance(params.get('data'), dict):
+                    params['data'] = json.dumps(params['data'], default=str)
+
+            with self.db:
+                # Consecutive statements of the same kind go through executemany
+                start = 0
+                for i in range(1, len(batch) + 1):
+                    if i == len(batch) or batch[i][0] is not batch[start][0]:
+                        self.db.executemany(batch[start][0], [params for _, params in batch[start:i]])
+                        start = i
+            self.records_written += len(batch)
+
+    def get_today_trades(self):
+        """Today's trades from the database (includes queued ones)"""
+        return self.get_trades(utc_day())
+
+    def get_trades(self, day):
+        self.flush()
+        with self.db_lock:
+            rows = self.db.execute(
+                "SELECT time, bot_id, symbol, direction, stake, contract_id, buy_price, "
+                "payout, pnl, status FROM trades WHERE day = ? ORDER BY id",
+                (day,)
+            ).fetchall()
+        keys = ('time', 'bot_id', 'symbol', 'direction', 'stake', 'contract_id',
+                'buy_price', 'payout', 'pnl', 'status')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self):
+        """Flush pending records and close the database"""
+        if not self.running:
+            return
+        self.running = False
+        self.wakeup.set()
+        self.flush()
+        with self.db_lock:
+            self.db.close()
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from queue import Queue, Full
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens/sec up to `capacity`"""
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` are available, then take them; returns seconds waited"""
+        if tokens > self.capacity:
+            # The bucket never holds that many: waiting would never end
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of {self.capacity}")
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class OrderJob:
+    __slots__ = ('fn', 'args', 'bot_id', 'symbol', 'account', 'future', 'submitted')
+
+    def __init__(self, fn, args, bot_id, symbol, account):
+        self.fn = fn
+        self.args = args
+        self.bot_id = bot_id
+        self.symbol = symbol
+        self.account = account
+        self.future = Future()
+        self.submitted = time.monotonic()
+
+
+class OrderQueue:
+    """Order execution off the scanner thread
+
+    submit() never blocks: it applies the in-flight caps (orders queued
+    or executing per bot and per symbol), enqueues the job and returns a
+    Future. A pool of workers runs the jobs, each first taking
+    `request_cost` tokens from its account's bucket so the Deriv
+    per-connection request rate is respected (an order is a proposal
+    plus a buy).
+    """
+    def __init__(self, workers=4, rate=5, burst=10, max_per_bot=2, max_per_symbol=1,
+                 max_queued=100, request_cost=2, samples=1000):
+        if burst < request_cost:
+            raise ValueError(f"burst ({burst}) must be at least request_cost ({request_cost}), "
+                             f"or no order could ever take its tokens")
+        self.rate = rate
+        self.burst = burst
+        self.request_cost = request_cost
+        self.max_per_bot = max_per_bot
+        self.max_per_symbol = max_per_symbol
+        self.queue = Queue(max_queued)
+        self.buckets = {}  # account -> TokenBucket
+        self.lock = threading.Lock()
+        self.in_flight_bot = {}
+        self.in_flight_symbol = {}
+        self.in_flight = 0
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_times = deque(maxlen=samples)  # Seconds from submit to start
+        self.throttle_times = deque(maxlen=samples)  # Seconds spent waiting for tokens
+
+        self.running = True
+        self.workers = []
+        for i in range(workers):
+            worker = threading.Thread(target=self.worker_loop, name=f"order-worker-{i}")
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+
+    def bucket(self, account):
+        bucket = self.buckets.get(account)
+        if bucket is None:
+            with self.lock:
+                bucket = self.buckets.setdefault(account, TokenBucket(self.rate, self.burst))
+        return bucket
+
+    def submit(self, fn, bot_id, symbol, *args, account='default'):
+        """Queue fn(*args) as an order; returns a Future of its result"""
+        job = OrderJob(fn, args, bot_id, symbol, account)
+
+        with self.lock:
+            reason = None
+            if self.in_flight_bot.get(bot_id, 0) >= self.max_per_bot:
+                reason = f'Bot {bot_id} already has {self.max_per_bot} orders in flight'
+            elif self.in_flight_symbol.get(symbol, 0) >= self.max_per_symbol:
+                reason = f'{symbol} already has {self.max_per_symbol} orders in flight'
+            else:
+                try:
+                    self.queue.put_nowait(job)
+                except Full:
+                    reason = 'Order queue is full'
+
+            if reason:
+                self.rejected += 1
+                job.future.set_result({'success': False, 'reason': reason})
+                return job.future
+
+            self.in_flight_bot[bot_id] = self.in_flight_bot.get(bot_id, 0) + 1
+            self.in_flight_symbol[symbol] = self.in_flight_symbol.get(symbol, 0) + 1
+            self.in_flight += 1
+            self.submitted += 1
+
+        return job.future
+
+    def worker_loop(self):
+        while self.running:
+            job = self.queue.get()
+            if job is None:
+                break
+
+            self.throttle_times.append(self.bucket(job.account).acquire(self.request_cost))
+            self.wait_times.append(time.monotonic() - job.submitted)
+
+            try:
+                result = job.fn(*job.args)
+            except Exception as e:
+                job.future.set_exception(e)
+                self.failed += 1
+            else:
+                job.future.set_result(result)
+                self.completed += 1
+            finally:
+                with self.lock:
+                    self.in_flight_bot[job.bot_id] -= 1
+                    self.in_flight_symbol[job.symbol] -= 1
+                    self.in_flight -= 1
+
+    def stop(self):
+        self.running = False
+        for _ in self.workers:
+            self.queue.put(None)
+
+    def metrics(self):
+        """Queue depth, in-flight counts and wait-time statistics"""
+        waits = sorted(self.wait_times)
+
+        def percentile(p):
+            return waits[min(len(waits) - 1, int(p * len(waits)))] if waits else 0.0
+
+        return {
+            'queue_depth': self.queue.qsize(),
+            'in_flight': self.in_flight,
+            'in_flight_by_bot': dict(self.in_flight_bot),
+            'in_flight_by_symbol': dict(self.in_flight_symbol),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'wait_p50': percentile(0.5),
+            'wait_p99': percentile(0.99),
+            'wait_max': waits[-1] if waits else 0.0,
+            'throttle_total': sum(self.throttle_times)
+        }
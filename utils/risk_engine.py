@@ -0,0 +1,179 @@
+import itertools
+import threading
+import time
+
+SECONDS_PER_DAY = 86400
+
+
+def next_utc_midnight():
+    return (int(time.time()) // SECONDS_PER_DAY + 1) * SECONDS_PER_DAY
+
+
+class RiskEngine:
+    """In-memory account risk: balance, open exposure and daily PnL
+
+    Writers (balance updates, reservations, settlements) take a lock and
+    recompute the derived limits; check_trade() only reads plain floats
+    and dicts, so it takes no lock and can run on every decision.
+    reserve() repeats the check under the lock and books the exposure
+    before the order is sent, so concurrent decisions can't overshoot.
+
+    Limits follow Config: MAX_STAKE_PERCENT per trade, MAX_SYMBOL_EXPOSURE
+    and MAX_BOT_EXPOSURE of open stakes, and DAILY_STOP_LOSS /
+    DAILY_PROFIT_TARGET as fractions of the balance at the start of the
+    UTC day. Open stakes count as potential losses against the stop loss.
+    """
+    def __init__(self, config, balance=None, daily_pnl=0.0):
+        self.max_stake_percent = config.MAX_STAKE_PERCENT
+        self.max_symbol_percent = config.MAX_SYMBOL_EXPOSURE
+        self.max_bot_percent = config.MAX_BOT_EXPOSURE
+        self.stop_loss_percent = config.DAILY_STOP_LOSS
+        self.profit_target_percent = config.DAILY_PROFIT_TARGET
+
+        self.lock = threading.RLock()  # check_trade may roll the day under it
+        self.tickets = itertools.count(1)
+        self.positions = {}  # ticket or contract_id -> (bot_id, symbol, stake)
+        self.settled = set()  # Contract ids already counted today
+        self.symbol_exposure = {}
+        self.bot_exposure = {}
+        self.open_exposure = 0.0
+
+        self.balance = None
+        self.day_start_balance = None
+        self.daily_pnl = daily_pnl
+        self.day_ends = next_utc_midnight()
+
+        # Derived limits, recomputed by writers
+        self.max_stake = 0.0
+        self.max_symbol_exposure = 0.0
+        self.max_bot_exposure = 0.0
+        self.loss_floor = 0.0
+        self.profit_ceiling = 0.0
+        self.halted = 'Balance unknown'
+
+        if balance is not None:
+            self.update_balance(balance)
+
+    def recompute(self):
+        """Refresh derived limits (caller holds the lock)"""
+        if self.balance is None:
+            self.halted = 'Balance unknown'
+            return
+
+        base = self.day_start_balance
+        self.max_stake = self.balance * self.max_stake_percent
+        self.max_symbol_exposure = self.balance * self.max_symbol_percent
+        self.max_bot_exposure = self.balance * self.max_bot_percent
+        self.loss_floor = -base * self.stop_loss_percent
+        self.profit_ceiling = base * self.profit_target_percent
+
+        if self.daily_pnl <= self.loss_floor:
+            self.halted = 'Daily stop loss reached'
+        elif self.daily_pnl >= self.profit_ceiling:
+            self.halted = 'Daily profit target reached'
+        else:
+            self.halted = None
+
+    def roll_day(self):
+        """Start a new UTC day: reset PnL and re-base the daily limits"""
+        with self.lock:
+            if time.time() < self.day_ends:
+                return
+            self.day_ends = next_utc_midnight()
+            self.daily_pnl = 0.0
+            self.settled.clear()
+            self.day_start_balance = self.balance
+            self.recompute()
+
+    def update_balance(self, balance):
+        with self.lock:
+            self.balance = float(balance)
+            if self.day_start_balance is None:
+                self.day_start_balance = self.balance
+            self.recompute()
+
+    def check_trade(self, bot_id, symbol, stake):
+        """None if the trade is allowed, otherwise the reason (lock-free)"""
+        if time.time() >= self.day_ends:
+            self.roll_day()
+        if self.halted:
+            return self.halted
+        if stake <= 0:
+            return 'Invalid stake'
+        if stake > self.max_stake:
+            return f'Stake exceeds {self.max_stake_percent:.0%} (${self.max_stake:.2f})'
+        if self.symbol_exposure.get(symbol, 0.0) + stake > self.max_symbol_exposure:
+            return f'Open exposure limit reached for {symbol}'
+        if self.bot_exposure.get(bot_id, 0.0) + stake > self.max_bot_exposure:
+            return f'Open exposure limit reached for bot {bot_id}'
+        if self.daily_pnl - self.open_exposure - stake < self.loss_floor:
+            return 'Trade could breach the daily stop loss'
+        return None
+
+    def limits_reached(self):
+        """True when trading is halted for the day (or the balance is unknown)"""
+        if time.time() >= self.day_ends:
+            self.roll_day()
+        return self.halted is not None
+
+    def reserve(self, bot_id, symbol, stake):
+        """Book exposure for an order about to be sent: (ticket, reason)"""
+        with self.lock:
+            reason = self.check_trade(bot_id, symbol, stake)
+            if reason:
+                return None, reason
+            ticket = f"ticket-{next(self.tickets)}"
+            self.add_position(ticket, bot_id, symbol, stake)
+            return ticket, None
+
+    def confirm(self, ticket, contract_id):
+        """Key a reserved position by its contract id once bought"""
+        with self.lock:
+            position = self.positions.pop(ticket, None)
+            if position is not None:
+                self.positions[str(contract_id)] = position
+
+    def release(self, ticket):
+        """Drop a reservation whose order failed"""
+        with self.lock:
+            self.remove_position(ticket)
+
+    def settle(self, contract_id, pnl):
+        """Close a contract: free its exposure and add its PnL to the day"""
+        contract_id = str(contract_id)
+        with self.lock:
+            if contract_id in self.settled:
+                return False
+            self.settled.add(contract_id)
+            self.remove_position(contract_id)
+            self.daily_pnl += pnl
+            self.recompute()
+            return True
+
+    def add_position(self, key, bot_id, symbol, stake):
+        self.positions[key] = (bot_id, symbol, stake)
+        self.symbol_exposure[symbol] = self.symbol_exposure.get(symbol, 0.0) + stake
+        self.bot_exposure[bot_id] = self.bot_exposure.get(bot_id, 0.0) + stake
+        self.open_exposure += stake
+
+    def remove_position(self, key):
+        position = self.positions.pop(key, None)
+        if position is None:
+            return
+        bot_id, symbol, stake = position
+        self.symbol_exposure[symbol] -= stake
+        self.bot_exposure[bot_id] -= stake
+        self.open_exposure -= stake
+
+    def status(self):
+        """Snapshot for the dashboard"""
+        return {
+            'balance': self.balance,
+            'daily_pnl': self.daily_pnl,
+            'open_exposure': self.open_exposure,
+            'open_positions': len(self.positions),
+            'max_stake': self.max_stake,
+            'halted': self.halted,
+            'symbol_exposure': dict(self.symbol_exposure),
+            'bot_exposure': dict(self.bot_exposure)
+        }
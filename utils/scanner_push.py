@@ -0,0 +1,159 @@
+import json
+import threading
+import time
+
+
+class ScannerPush:
+    """Delta-compressed scanner/signal push to Socket.IO clients
+
+    The scanner thread reports scores with update_scores() and the signal
+    engine reports upsert_signal()/remove_signal(); only cells whose
+    rounded score changed bump the version. Every change records the
+    version it happened at, so the delta for a client is simply "cells and
+    signals changed after the version it last saw".
+
+    A push loop wakes max_rate times a second and sends each due client
+    the changes since its version. Clients that last saw the same version
+    share one pre-serialized JSON payload. A client asking for a lower
+    rate is simply due less often, and its updates coalesce in between.
+    """
+    def __init__(self, socketio, max_rate=2.0, event='scanner_delta', tombstone_limit=1000):
+        self.socketio = socketio
+        self.max_rate = max_rate
+        self.event = event
+        self.lock = threading.Lock()
+        self.version = 0
+        self.cells = {}  # (bot_id, symbol) -> (score, version)
+        self.signals = {}  # signal id -> (signal, version)
+        self.removed = {}  # signal id -> version it was removed at
+        self.tombstone_limit = tombstone_limit
+        self.oldest_delta = 0  # Deltas from before this version need a full snapshot
+        self.clients = {}  # sid -> {'version', 'interval', 'next'}
+        self.payloads_built = 0
+        self.messages_sent = 0
+        self.running = False
+
+    def update_scores(self, symbol, scores):
+        """Scanner listener: record changed bot scores for a symbol"""
+        with self.lock:
+            version = self.version + 1
+            changed = False
+            for bot_id, score in scores.items():
+                # Integer keys are bot scores, the rest are indicators
+                if not isinstance(bot_id, int):
+                    continue
+                score = int(round(score))
+                key = (bot_id, symbol)
+                cell = self.cells.get(key)
+                if cell is None or cell[0] != score:
+                    self.cells[key] = (score, version)
+                    changed = True
+            if changed:
+                self.version = version
+
+    def upsert_signal(self, signal):
+        """Record a new or changed signal (a dict with an 'id')"""
+        with self.lock:
+            entry = self.signals.get(signal['id'])
+            if entry is not None and entry[0] == signal:
+                return
+            self.version += 1
+            self.signals[signal['id']] = (signal, self.version)
+            self.removed.pop(signal['id'], None)
+
+    def remove_signal(self, signal_id):
+        """Record that a signal is gone (expired or executed)"""
+        with self.lock:
+            if self.signals.pop(signal_id, None) is None:
+                return
+            self.version += 1
+            self.removed[signal_id] = self.version
+            self.prune_tombstones()
+
+    def prune_tombstones(self):
+        """Bound the removed-signal log (caller holds the lock)"""
+        # Insertion order is removal order, so the oldest come first
+        while len(self.removed) > self.tombstone_limit:
+            signal_id = next(iter(self.removed))
+            self.oldest_delta = max(self.oldest_delta, self.removed.pop(signal_id))
+
+    def matrix(self):
+        """Full scanner matrix {bot_id: {symbol: score}} and its version"""
+        with self.lock:
+            return self.version, self.cells_since(0)
+
+    def active_signals(self):
+        with self.lock:
+            return [signal for signal, _ in self.signals.values()]
+
+    def cells_since(self, base):
+        scanner = {}
+        for (bot_id, symbol), (score, version) in self.cells.items():
+            if version > base:
+                scanner.setdefault(bot_id, {})[symbol] = score
+        return scanner
+
+    def build_payload(self, base):
+        """Serialized changes after `base` (caller holds the lock)"""
+        full = base < self.oldest_delta
+        if full:
+            base = 0
+        self.payloads_built += 1
+        return json.dumps({
+            'version': self.version,
+            'base': base,
+            'full': full or base == 0,
+            'scanner': self.cells_since(base),
+            'signals': [signal for signal, version in self.signals.values() if version > base],
+            'removed': [s for s, version in self.removed.items() if version > base]
+        })
+
+    def add_client(self, sid, version=0, max_rate=None):
+        """Start pushing to a client that has seen `version`"""
+        rate = min(max_rate or self.max_rate, self.max_rate)
+        with self.lock:
+            self.clients[sid] = {
+                'version': min(int(version), self.version),
+                'interval': 1.0 / rate,
+                'next': 0.0
+            }
+
+    def remove_client(self, sid):
+        with self.lock:
+            self.clients.pop(sid, None)
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self.socketio.start_background_task(self.push_loop)
+
+    def stop(self):
+        self.running = False
+
+    def push_loop(self):
+        while self.running:
+            try:
+                self.push_due()
+            except Exception as e:
+                print(f"Scanner push error: {e}")
+            self.socketio.sleep(1.0 / self.max_rate)
+
+    def push_due(self):
+        """Send pending changes to every client whose interval has elapsed"""
+        now = time.monotonic()
+        sends = []
+        with self.lock:
+            payloads = {}
+            for sid, client in self.clients.items():
+                if client['version'] >= self.version or now < client['next']:
+                    continue
+                base = client['version']
+                if base not in payloads:
+                    payloads[base] = self.build_payload(base)
+                sends.append((sid, payloads[base]))
+                client['version'] = self.version
+                client['next'] = now + client['interval']
+
+        for sid, payload in sends:
+            self.socketio.emit(self.event, payload, to=sid)
+        self.messages_sent += len(sends)
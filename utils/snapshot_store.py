@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+
+
+class Snapshot:
+    """One pre-serialized response body and its (unquoted) ETag"""
+    __slots__ = ('key', 'body', 'etag')
+
+    def __init__(self, key, body, etag):
+        self.key = key
+        self.body = body
+        self.etag = etag
+
+
+class SnapshotStore:
+    """Serialized JSON snapshots rebuilt only when their inputs change
+
+    Each snapshot is registered with a key function returning the
+    versions of its inputs (e.g. the scanner and account versions) and a
+    build function returning the data. get() compares the key, which is
+    a few integer reads, and only calls build() and json.dumps() after an
+    input changed; every other request gets the cached bytes and ETag.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sources = {}  # name -> (key_fn, build_fn)
+        self.snapshots = {}
+        self.builds = 0
+        # ETags from a previous process must never match this one's
+        self.boot_id = os.urandom(4).hex()
+
+    def register(self, name, key_fn, build_fn):
+        self.sources[name] = (key_fn, build_fn)
+
+    def get(self, name):
+        """Current Snapshot for name, rebuilding it if an input changed"""
+        key_fn, build_fn = self.sources[name]
+        key = key_fn()
+        snapshot = self.snapshots.get(name)
+        if snapshot is not None and snapshot.key == key:
+            return snapshot
+
+        with self.lock:
+            # Another request may have rebuilt it while we waited
+            snapshot = self.snapshots.get(name)
+            if snapshot is not None and snapshot.key == key:
+                return snapshot
+
+            body = json.dumps(build_fn()).encode()
+            self.builds += 1
+            etag = f'{self.boot_id}-{name}-{self.builds}'
+            snapshot = self.snapshots[name] = Snapshot(key, body, etag)
+            return snapshot
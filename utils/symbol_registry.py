@@ -0,0 +1,73 @@
+from utils.digit_stats import pip_size_from_pip
+
+# Deriv's synthetic indices: volatility (including the 1s indices),
+# crash/boom, jump, step and range break
+SYNTHETIC_MARKET = 'synthetic_index'
+
+
+class SymbolInfo:
+    """One market as listed by active_symbols"""
+    __slots__ = ('symbol', 'display_name', 'market', 'submarket', 'pip_size', 'tradable')
+
+    def __init__(self, symbol, display_name, market, submarket, pip_size, tradable):
+        self.symbol = symbol
+        self.display_name = display_name
+        self.market = market
+        self.submarket = submarket
+        self.pip_size = pip_size
+        self.tradable = tradable
+
+
+class SymbolRegistry:
+    """Markets to scan, loaded from Deriv's active_symbols
+
+    Keeps every listed symbol of the configured markets (optionally only
+    some submarkets, e.g. 'crash_index'); names() returns the ones open
+    for trading, in Deriv's order.
+    """
+    def __init__(self, markets=(SYNTHETIC_MARKET,), submarkets=None):
+        self.markets = set(markets or ())
+        self.submarkets = set(submarkets) if submarkets else None
+        self.symbols = {}  # symbol -> SymbolInfo
+        self.version = 0
+
+    def request(self):
+        return {"active_symbols": "brief", "product_type": "basic"}
+
+    def load(self, active_symbols):
+        """Replace the registry with an active_symbols list; returns names()"""
+        symbols = {}
+        for entry in active_symbols:
+            if self.markets and entry.get('market') not in self.markets:
+                continue
+            if self.submarkets is not None and entry.get('submarket') not in self.submarkets:
+                continue
+
+            decimals = entry.get('display_decimals')
+            if decimals is None and entry.get('pip') is not None:
+                decimals = pip_size_from_pip(entry['pip'])
+
+            symbols[entry['symbol']] = SymbolInfo(
+                entry['symbol'],
+                entry.get('display_name', entry['symbol']),
+                entry.get('market'),
+                entry.get('submarket'),
+                decimals,
+                bool(entry.get('exchange_is_open', 1)) and not entry.get('is_trading_suspended', 0)
+            )
+
+        self.symbols = symbols
+        self.version += 1
+        return self.names()
+
+    def names(self):
+        """Symbols currently open for trading"""
+        return [symbol for symbol, info in self.symbols.items() if info.tradable]
+
+    def get(self, symbol):
+        return self.symbols.get(symbol)
+
+    def pip_size(self, symbol):
+        """Decimal places listed for a symbol (None if unknown)"""
+        info = self.symbols.get(symbol)
+        return info.pip_size if info is not None else None
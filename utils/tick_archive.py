@@ -0,0 +1,161 @@
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+import numpy as np
+
+# One fixed-width record per tick
+TICK_RECORD = np.dtype([('epoch', '<i8'), ('price', '<f8')])
+SECONDS_PER_DAY = 86400
+
+
+def day_name(day_number):
+    """File stem for a UTC day number (epoch // 86400)"""
+    return datetime.fromtimestamp(day_number * SECONDS_PER_DAY, timezone.utc).strftime('%Y-%m-%d')
+
+
+class TickArchive:
+    """Append-only on-disk tick store: <root>/<symbol>/<YYYY-MM-DD>.ticks
+
+    The tick thread only appends to an in-memory deque; a writer thread
+    flushes batches to disk. Reads memory-map the day files and return
+    zero-copy structured arrays with `epoch` and `price` fields.
+    """
+    def __init__(self, root, flush_interval=1.0, writable=True):
+        self.root = root
+        self.flush_interval = flush_interval
+        self.queue = deque()
+        self.files = {}  # (symbol, day number) -> open file
+        self.lock = threading.Lock()
+        self.running = writable
+        self.records_written = 0
+
+        # Readers (backtests, dashboards) don't need the writer thread
+        if writable:
+            os.makedirs(root, exist_ok=True)
+            self.writer = threading.Thread(target=self.writer_loop)
+            self.writer.daemon = True
+            self.writer.start()
+            atexit.register(self.close)
+
+    def append(self, symbol, epoch, price):
+        """Queue a tick for writing (O(1), safe from the tick thread)"""
+        self.queue.append((symbol, epoch, price))
+
+    def writer_loop(self):
+        while self.running:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Tick archive error: {e}")
+
+    def flush(self):
+        """Write every queued tick, one batch per symbol/day file"""
+        with self.lock:
+            batches = {}
+            for _ in range(len(self.queue)):
+                symbol, epoch, price = self.queue.popleft()
+                batches.setdefault((symbol, epoch // SECONDS_PER_DAY), []).append((epoch, price))
+
+            for (symbol, day), records in batches.items():
+                f = self.open_file(symbol, day)
+                f.write(np.array(records, dtype=TICK_RECORD).tobytes())
+                f.flush()
+                self.records_written += len(records)
+
+            self.close_old_files()
+
+    def open_file(self, symbol, day):
+        f = self.files.get((symbol, day))
+        if f is None:
+            directory = os.path.join(self.root, symbol)
+            os.makedirs(directory, exist_ok=True)
+            f = self.files[(symbol, day)] = open(
+                os.path.join(directory, f"{day_name(day)}.ticks"), 'ab'
+            )
+        return f
+
+    def close_old_files(self):
+        """Keep only the newest day open per symbol"""
+        newest = {}
+        for symbol, day in self.files:
+            newest[symbol] = max(day, newest.get(symbol, day))
+        for key in [k for k in self.files if k[1] < newest[k[0]]]:
+            self.files.pop(key).close()
+
+    def close(self):
+        """Flush pending ticks and close files"""
+        self.running = False
+        self.flush()
+        with self.lock:
+            for f in self.files.values():
+                f.close()
+            self.files.clear()
+
+    def symbols(self):
+        """Symbols with archived ticks"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d for d in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, d)))
+
+    def days(self, symbol):
+        """Archived day stems for a symbol, oldest first"""
+        directory = os.path.join(self.root, symbol)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(f[:-6] for f in os.listdir(directory) if f.endswith('.ticks'))
+
+    def read_day(self, symbol, day):
+        """Memory-mapped records of one day file (zero-copy, read-only)"""
+        path = os.path.join(self.root, symbol, f"{day}.ticks")
+        # Ignore a trailing partial record from an interrupted write
+        count = os.path.getsize(path) // TICK_RECORD.itemsize
+        if not count:
+            return np.empty(0, dtype=TICK_RECORD)
+        return np.memmap(path, dtype=TICK_RECORD, mode='r', shape=(count,))
+
+    def iter_range(self, symbol, start=None, end=None):
+        """Zero-copy record slices covering epochs [start, end], per day"""
+        first = day_name(start // SECONDS_PER_DAY) if start is not None else None
+        last = day_name(end // SECONDS_PER_DAY) if end is not None else None
+
+        for day in self.days(symbol):
+            if (first and day < first) or (last and day > last):
+                continue
+            records = self.read_day(symbol, day)
+            epochs = records['epoch']
+            lo = np.searchsorted(epochs, start, 'left') if start is not None else 0
+            hi = np.searchsorted(epochs, end, 'right') if end is not None else len(records)
+            if hi > lo:
+                yield records[lo:hi]
+
+    def load(self, symbol, start=None, end=None):
+        """(epochs, prices) for [start, end]; zero-copy when it spans one day"""
+        parts = list(self.iter_range(symbol, start, end))
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        records = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        return records['epoch'], records['price']
+
+    def last(self, symbol, n):
+        """The most recent n archived ticks as (epochs, prices) copies"""
+        if n <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        parts = []
+        remaining = n
+        for day in reversed(self.days(symbol)):
+            records = self.read_day(symbol, day)
+            parts.append(records[-remaining:])
+            remaining -= len(parts[-1])
+            if remaining <= 0:
+                break
+
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        records = np.concatenate(parts[::-1])
+        return records['epoch'].copy(), records['price'].copy()
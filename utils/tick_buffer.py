@@ -0,0 +1,71 @@
+import numpy as np
+
+class TickBuffer:
+    """Fixed-size ring buffer of (epoch, price) ticks for one symbol"""
+    def __init__(self, capacity=1000, pip_size=None):
+        self.capacity = capacity
+        self.pip_size = pip_size  # Decimal places quoted for the symbol
+
+        # Every tick is written twice (at i and i + capacity) so the last N
+        # ticks are always one contiguous slice and can be returned as a view
+        self._prices = np.zeros(2 * capacity, dtype=np.float64)
+        self._epochs = np.zeros(2 * capacity, dtype=np.int64)
+        self.head = 0  # Next write position in [0, capacity)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, epoch, price):
+        """Store a tick in O(1)"""
+        i = self.head
+        j = i + self.capacity
+        self._prices[i] = self._prices[j] = price
+        self._epochs[i] = self._epochs[j] = epoch
+
+        self.head = i + 1 if i + 1 < self.capacity else 0
+        if self.count < self.capacity:
+            self.count += 1
+
+    def clear(self):
+        """Drop all stored ticks"""
+        self.head = 0
+        self.count = 0
+
+    def _window(self, n):
+        """Slice bounds of the last n ticks"""
+        if n is None or n > self.count:
+            n = self.count
+        end = self.head + self.capacity
+        return end - n, end
+
+    def prices(self, n=None):
+        """Zero-copy view of the last n prices (valid until the next append)"""
+        start, end = self._window(n)
+        view = self._prices[start:end]
+        view.flags.writeable = False
+        return view
+
+    def epochs(self, n=None):
+        """Zero-copy view of the last n epochs (valid until the next append)"""
+        start, end = self._window(n)
+        view = self._epochs[start:end]
+        view.flags.writeable = False
+        return view
+
+    def snapshot(self, n=None):
+        """Contiguous copies of the last n (epochs, prices)"""
+        start, end = self._window(n)
+        return self._epochs[start:end].copy(), self._prices[start:end].copy()
+
+    @property
+    def last_price(self):
+        if not self.count:
+            return None
+        return float(self._prices[self.head + self.capacity - 1])
+
+    @property
+    def last_epoch(self):
+        if not self.count:
+            return None
+        return int(self._epochs[self.head + self.capacity - 1])